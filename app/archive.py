@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import email
+import email.policy
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QObject, QStandardPaths, QUrl, Signal
+from PySide6.QtWebEngineCore import (
+    QWebEngineDownloadRequest, QWebEnginePage, QWebEngineUrlRequestJob, QWebEngineUrlScheme,
+    QWebEngineUrlSchemeHandler
+)
+
+from app.session import write_atomic
+
+
+logger = logging.getLogger(__name__)
+
+SCHEME = "gbarchive"
+
+_FOLD = re.compile(r"\r?\n[ \t]+")
+
+
+def register_archive_scheme() -> None:
+    # Has to run before the QApplication exists. A local scheme is one Chromium will load MHTML from.
+    scheme = QWebEngineUrlScheme(SCHEME.encode("ascii"))
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Path)
+    scheme.setFlags(QWebEngineUrlScheme.Flag.LocalScheme)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+def archive_url(page_id: str) -> QUrl:
+    return QUrl(f"{SCHEME}:{page_id}")
+
+
+def default_archive_dir() -> str:
+    base = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    if not base:
+        base = str(Path.home() / ".gbrowser")
+    return os.path.join(base, "archive")
+
+
+class ArchiveStore:
+    # Pages are manifests of MIME parts; part bodies live once each under objects/, keyed by sha256.
+
+    COMPRESS_LEVEL = 6
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.objects_dir = os.path.join(directory, "objects")
+        self.pages_dir = os.path.join(directory, "pages")
+        self.incoming_dir = os.path.join(directory, "incoming")
+        self._lock = threading.Lock()
+        self._manifests: dict[str, dict] = {}
+        # Object digest -> number of manifest parts that use it; an object goes when this reaches zero.
+        self._refs: dict[str, int] = {}
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest + ".z")
+
+    def load(self) -> list[dict]:
+        manifests = {}
+        try:
+            entries = list(Path(self.pages_dir).glob("*.json"))
+        except OSError:
+            entries = []
+        for path in entries:
+            try:
+                manifest = json.loads(path.read_text(encoding="utf-8"))
+                manifests[manifest["id"]] = manifest
+            except (OSError, ValueError, KeyError):
+                logger.warning("Skipping unreadable archive manifest %s", path)
+        refs: dict[str, int] = {}
+        for m in manifests.values():
+            for p in m["parts"]:
+                refs[p["hash"]] = refs.get(p["hash"], 0) + 1
+        with self._lock:
+            self._manifests = manifests
+            self._refs = refs
+        # Leftovers from saves that never finished, and objects no manifest refers to any more.
+        for path in Path(self.incoming_dir).glob("*"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        for path in Path(self.objects_dir).glob("*/*.z"):
+            if path.stem not in refs:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        return [self.summary(m) for m in manifests.values()]
+
+    def manifest(self, page_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._manifests.get(page_id)
+
+    @staticmethod
+    def summary(manifest: dict) -> dict:
+        return {
+            "id": manifest["id"],
+            "url": manifest["url"],
+            "title": manifest["title"],
+            "saved": manifest["saved"],
+            "size": sum(p["size"] for p in manifest["parts"]),
+        }
+
+    def add_mhtml(self, path: str, url: str, title: str) -> dict:
+        with open(path, "rb") as f:
+            message = email.message_from_binary_file(f, policy=email.policy.compat32)
+        if not message.is_multipart():
+            raise ValueError("not an MHTML archive")
+
+        parts = []
+        for part in message.walk():
+            if part.is_multipart():
+                continue
+            body = part.get_payload(decode=True) or b""
+            digest = hashlib.sha256(body).hexdigest()
+            target = self.object_path(digest)
+            if not os.path.exists(target):
+                write_atomic(target, zlib.compress(body, self.COMPRESS_LEVEL))
+            headers = [[k, _FOLD.sub(" ", v)] for k, v in part.items() if k.lower() != "content-transfer-encoding"]
+            parts.append({"headers": headers, "hash": digest, "size": len(body)})
+
+        manifest = {
+            "id": uuid.uuid4().hex[:16],
+            "url": url,
+            "title": title or url,
+            "saved": time.time(),
+            "headers": [[k, _FOLD.sub(" ", v)] for k, v in message.items()
+                        if k.lower() not in ("content-type", "mime-version")],
+            "type": message.get_param("type") or "text/html",
+            "parts": parts,
+        }
+        write_atomic(os.path.join(self.pages_dir, manifest["id"] + ".json"),
+                     json.dumps(manifest, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            self._manifests[manifest["id"]] = manifest
+            for p in parts:
+                self._refs[p["hash"]] = self._refs.get(p["hash"], 0) + 1
+        return self.summary(manifest)
+
+    def assemble(self, page_id: str) -> Optional[bytes]:
+        manifest = self.manifest(page_id)
+        if manifest is None:
+            return None
+        boundary = "----=_GBrowserArchive_" + page_id
+        out = [f"{k}: {v}\r\n".encode("utf-8") for k, v in manifest["headers"]]
+        out.append(b"MIME-Version: 1.0\r\n")
+        out.append(f'Content-Type: multipart/related; type="{manifest["type"]}"; boundary="{boundary}"\r\n\r\n'
+                   .encode("utf-8"))
+        for part in manifest["parts"]:
+            with open(self.object_path(part["hash"]), "rb") as f:
+                body = zlib.decompress(f.read())
+            out.append(f"--{boundary}\r\n".encode("ascii"))
+            out.extend(f"{k}: {v}\r\n".encode("utf-8") for k, v in part["headers"])
+            out.append(b"Content-Transfer-Encoding: binary\r\n\r\n")
+            out.append(body)
+            out.append(b"\r\n")
+        out.append(f"--{boundary}--\r\n".encode("ascii"))
+        return b"".join(out)
+
+    def delete(self, page_id: str) -> None:
+        dead = []
+        with self._lock:
+            manifest = self._manifests.pop(page_id, None)
+            for p in manifest["parts"] if manifest is not None else ():
+                count = self._refs.get(p["hash"], 0) - 1
+                if count > 0:
+                    self._refs[p["hash"]] = count
+                else:
+                    self._refs.pop(p["hash"], None)
+                    dead.append(p["hash"])
+        try:
+            os.unlink(os.path.join(self.pages_dir, page_id + ".json"))
+        except OSError:
+            pass
+        for digest in dead:
+            try:
+                os.unlink(self.object_path(digest))
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            manifests = list(self._manifests.values())
+        logical = 0
+        unique: dict[str, int] = {}
+        for m in manifests:
+            for p in m["parts"]:
+                logical += p["size"]
+                unique[p["hash"]] = p["size"]
+        stored = 0
+        for digest in unique:
+            try:
+                stored += os.path.getsize(self.object_path(digest))
+            except OSError:
+                pass
+        unique_bytes = sum(unique.values())
+        return {
+            "pages": len(manifests),
+            "logical_bytes": logical,
+            "unique_bytes": unique_bytes,
+            "stored_bytes": stored,
+            "dedup_ratio": logical / unique_bytes if unique_bytes else 1.0,
+            "compression_ratio": unique_bytes / stored if stored else 1.0,
+        }
+
+
+class ArchiveSchemeHandler(QWebEngineUrlSchemeHandler):
+    # Pages are read and decompressed on the archive worker; the job is answered once they are ready.
+
+    def __init__(self, archive: OfflineArchive) -> None:
+        super().__init__(archive)
+        self._archive = archive
+        self._jobs: dict[int, QWebEngineUrlRequestJob] = {}
+        self._next_token = 0
+        archive._assembled.connect(self._on_assembled)
+
+    def requestStarted(self, job: QWebEngineUrlRequestJob) -> None:
+        self._next_token += 1
+        token = self._next_token
+        self._jobs[token] = job
+        # A navigation away cancels the request and deletes the job before the page is ready.
+        job.destroyed.connect(lambda *_, t=token: self._jobs.pop(t, None))
+        self._archive._submit(("assemble", token, job.requestUrl().path().strip("/")))
+
+    def _on_assembled(self, token: int, data: Optional[bytes], failed: bool) -> None:
+        job = self._jobs.pop(token, None)
+        if job is None:
+            return
+        if failed:
+            job.fail(QWebEngineUrlRequestJob.Error.RequestFailed)
+            return
+        if data is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        buffer = QBuffer(job)
+        buffer.setData(QByteArray(data))
+        buffer.open(QIODevice.ReadOnly)
+        job.reply(QByteArray(b"multipart/related"), buffer)
+
+
+class OfflineArchive(QObject):
+
+    page_saved = Signal(dict)
+    pages_changed = Signal()
+    stats_ready = Signal(dict)
+    _loaded = Signal(list)
+    _ingested = Signal(dict)
+    _removed = Signal(str)
+    _assembled = Signal(int, object, bool)
+
+    def __init__(self, directory: Optional[str] = None, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.store = ArchiveStore(directory or default_archive_dir())
+        self.scheme_handler = ArchiveSchemeHandler(self)
+        self._pages: dict[str, dict] = {}
+        # Temp MHTML path -> (url, title) for saves this archive started.
+        self._expected: dict[str, tuple[str, str]] = {}
+
+        self._jobs: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._loaded.connect(self._on_loaded)
+        self._ingested.connect(self._on_ingested)
+        self._removed.connect(self._on_removed)
+
+    def load(self) -> None:
+        self._submit(("load",))
+
+    def pages(self) -> list[dict]:
+        return sorted(self._pages.values(), key=lambda p: p["saved"], reverse=True)
+
+    def request_stats(self) -> None:
+        self._submit(("stats",))
+
+    def save_page(self, page: Optional[QWebEnginePage]) -> bool:
+        if page is None or page.url().scheme() not in ("http", "https", "file"):
+            return False
+        os.makedirs(self.store.incoming_dir, exist_ok=True)
+        path = os.path.normpath(os.path.join(self.store.incoming_dir, uuid.uuid4().hex + ".mhtml"))
+        self._expected[path] = (page.url().toString(), page.title())
+        page.save(path, QWebEngineDownloadRequest.SavePageFormat.MimeHtmlSaveFormat)
+        return True
+
+    def claim(self, download: QWebEngineDownloadRequest) -> bool:
+        # page.save() surfaces as a profile download; ours are recognised by their target path.
+        if not download.isSavePageDownload():
+            return False
+        path = os.path.normpath(os.path.join(download.downloadDirectory(), download.downloadFileName()))
+        if path not in self._expected:
+            return False
+        download.isFinishedChanged.connect(lambda d=download, p=path: self._on_save_finished(d, p))
+        download.accept()
+        return True
+
+    def delete(self, page_id: str) -> None:
+        self._submit(("delete", page_id))
+
+    def _on_save_finished(self, download: QWebEngineDownloadRequest, path: str) -> None:
+        if not download.isFinished():
+            return
+        url, title = self._expected.pop(path, ("", ""))
+        if download.state() == QWebEngineDownloadRequest.DownloadState.DownloadCompleted:
+            self._submit(("ingest", path, url, title))
+        else:
+            logger.warning("Saving %s for offline failed", url)
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def _on_loaded(self, summaries: list) -> None:
+        self._pages = {s["id"]: s for s in summaries}
+        self.pages_changed.emit()
+
+    def _on_ingested(self, summary: dict) -> None:
+        self._pages[summary["id"]] = summary
+        self.page_saved.emit(summary)
+        self.pages_changed.emit()
+
+    def _on_removed(self, page_id: str) -> None:
+        self._pages.pop(page_id, None)
+        self.pages_changed.emit()
+
+    def _submit(self, job: tuple) -> None:
+        self._jobs.put(job)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="offline-archive", daemon=True)
+            self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            job = self._jobs.get()
+            try:
+                if job[0] == "load":
+                    self._loaded.emit(self.store.load())
+                elif job[0] == "ingest":
+                    path = job[1]
+                    try:
+                        start = time.perf_counter()
+                        summary = self.store.add_mhtml(path, job[2], job[3])
+                        logger.info("Archived %s (%d bytes) in %.0f ms", job[2], summary["size"],
+                                    (time.perf_counter() - start) * 1000)
+                        self._ingested.emit(summary)
+                    finally:
+                        try:
+                            os.unlink(path)
+                        except OSError:
+                            pass
+                elif job[0] == "delete":
+                    self.store.delete(job[1])
+                    self._removed.emit(job[1])
+                elif job[0] == "stats":
+                    self.stats_ready.emit(self.store.stats())
+                elif job[0] == "assemble":
+                    try:
+                        self._assembled.emit(job[1], self.store.assemble(job[2]), False)
+                    except Exception:
+                        logger.exception("Failed to read archived page %s", job[2])
+                        self._assembled.emit(job[1], None, True)
+            except Exception:
+                logger.exception("Offline archive job %s failed", job[0])
+
+
+__all__ = [
+    "OfflineArchive", "ArchiveStore", "ArchiveSchemeHandler", "register_archive_scheme", "archive_url",
+    "default_archive_dir", "SCHEME",
+]
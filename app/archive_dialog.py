@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+from PySide6.QtCore import Qt, QUrl, Signal
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QLabel,
+    QHeaderView, QAbstractItemView, QWidget
+)
+
+from app.archive import OfflineArchive, archive_url
+
+
+def _format_size(n: int) -> str:
+    if n >= 1024 * 1024:
+        return f"{n / (1024 * 1024):.1f} MB"
+    return f"{max(1, n // 1024)} KB"
+
+
+class ArchiveDialog(QDialog):
+
+    open_url_requested = Signal(QUrl)
+
+    HEADERS = ("Saved", "Title", "Size")
+
+    def __init__(self, archive: OfflineArchive, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Offline pages")
+        self.resize(760, 480)
+        self._archive = archive
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 12, 12, 12)
+        layout.setSpacing(8)
+
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setShowGrid(False)
+        self.table.verticalHeader().hide()
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        layout.addWidget(self.table, 1)
+
+        self.stats_lbl = QLabel("")
+        layout.addWidget(self.stats_lbl)
+
+        row = QHBoxLayout()
+        self.open_btn = QPushButton("Open")
+        self.delete_btn = QPushButton("Delete")
+        self.close_btn = QPushButton("Close")
+        row.addWidget(self.open_btn)
+        row.addWidget(self.delete_btn)
+        row.addStretch(1)
+        row.addWidget(self.close_btn)
+        layout.addLayout(row)
+
+        self.open_btn.clicked.connect(self._open_selected)
+        self.delete_btn.clicked.connect(self._delete_selected)
+        self.close_btn.clicked.connect(self.accept)
+        self.table.doubleClicked.connect(lambda _: self._open_selected())
+        archive.pages_changed.connect(self._reload)
+        archive.stats_ready.connect(self.set_stats)
+        self._reload()
+
+    def _reload(self) -> None:
+        pages = self._archive.pages()
+        self.table.setRowCount(len(pages))
+        for row, page in enumerate(pages):
+            saved = QTableWidgetItem(time.strftime("%Y-%m-%d %H:%M", time.localtime(page["saved"])))
+            saved.setData(Qt.UserRole, page["id"])
+            title = QTableWidgetItem(page["title"])
+            title.setToolTip(page["url"])
+            self.table.setItem(row, 0, saved)
+            self.table.setItem(row, 1, title)
+            self.table.setItem(row, 2, QTableWidgetItem(_format_size(page["size"])))
+        self._archive.request_stats()
+
+    def set_stats(self, stats: dict) -> None:
+        self.stats_lbl.setText(
+            f"{stats['pages']} pages, {_format_size(stats['stored_bytes'])} on disk "
+            f"({_format_size(stats['logical_bytes'])} before deduplication and compression), "
+            f"dedup {stats['dedup_ratio']:.2f}x, compression {stats['compression_ratio']:.2f}x"
+        )
+
+    def _selected_id(self) -> Optional[str]:
+        row = self.table.currentRow()
+        item = self.table.item(row, 0) if row >= 0 else None
+        return item.data(Qt.UserRole) if item is not None else None
+
+    def _open_selected(self) -> None:
+        page_id = self._selected_id()
+        if page_id:
+            self.open_url_requested.emit(archive_url(page_id))
+            self.accept()
+
+    def _delete_selected(self) -> None:
+        page_id = self._selected_id()
+        if page_id:
+            self._archive.delete(page_id)
+
+
+__all__ = ["ArchiveDialog"]
@@ -1,57 +1,40 @@
 from __future__ import annotations
 
-import os
-from pathlib import Path
+from typing import Callable, Optional
 
 from PySide6.QtCore import Qt, QUrl, Signal
-from PySide6.QtWidgets import (
-    QMenu, QAction, QFileDialog, QDialog, QVBoxLayout, QTextEdit, QMessageBox
-)
+from PySide6.QtGui import QAction, QGuiApplication
+from PySide6.QtWidgets import QMenu
 from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtWebEngineCore import QWebEngineDownloadItem, QWebEngineProfile
-from PySide6.QtCore import QStandardPaths
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
+
+from app.session import serialize_history, restore_history
 
 
 class BrowserView(QWebEngineView):
 
     new_tab_requested = Signal(QUrl)
-    download_requested = Signal(object)
+    link_hovered = Signal(str)
+    save_page_requested = Signal(object)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, profile: Optional[QWebEngineProfile] = None):
         super().__init__(parent)
+        self.create_window_handler: Optional[Callable[[QWebEnginePage.WebWindowType], QWebEngineView]] = None
 
-        s = self.settings()
-        try:
-            s.setAttribute(s.JavascriptEnabled, True)
-            s.setAttribute(s.LocalStorageEnabled, True)
-            s.setAttribute(s.PluginsEnabled, False)
-        except Exception:
-            pass
+        # History of the page replaced by adopt_page(), restored when going back past the adopted page.
+        # Going back saves the adopted page's history in turn, so forward() can return to it from the
+        # entry where the swap happened.
+        self._previous_history: Optional[str] = None
+        self._next_history: Optional[str] = None
+        self._swap_url = QUrl()
 
-        profile: QWebEngineProfile = self.page().profile()
-        profile.downloadRequested.connect(self._on_download_requested)
+        if profile is not None:
+            self.setPage(QWebEnginePage(profile, self))
+        self.page().linkHovered.connect(self.link_hovered)
 
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self._on_context_menu)
 
-    def _on_download_requested(self, download: QWebEngineDownloadItem) -> None:
-        suggested_name = download.path() or download.suggestedFileName()
-        downloads_dir = QStandardPaths.writableLocation(QStandardPaths.DownloadLocation)
-        if not downloads_dir:
-            downloads_dir = str(Path.home() / "Downloads")
-        target = os.path.join(downloads_dir, suggested_name)
-
-        base, ext = os.path.splitext(target)
-        i = 1
-        while os.path.exists(target):
-            target = f"{base} ({i}){ext}"
-            i += 1
-
-        download.setPath(target)
-        download.accept()
-
-        self.download_requested.emit(download)
-
     def _on_context_menu(self, pos) -> None:
         menu = QMenu(self)
 
@@ -61,9 +44,11 @@ class BrowserView(QWebEngineView):
         open_new_tab_act = QAction("Open in New Tab", self)
         copy_link_act = QAction("Copy Link", self)
         view_source_act = QAction("View Page Source", self)
+        save_offline_act = QAction("Save Page for Offline", self)
+        save_offline_act.setEnabled(self.url().scheme() in ("http", "https", "file"))
 
-        back_act.setEnabled(self.history().canGoBack())
-        forward_act.setEnabled(self.history().canGoForward())
+        back_act.setEnabled(self.can_go_back())
+        forward_act.setEnabled(self.can_go_forward())
 
         menu.addAction(back_act)
         menu.addAction(forward_act)
@@ -73,6 +58,7 @@ class BrowserView(QWebEngineView):
         menu.addAction(copy_link_act)
         menu.addSeparator()
         menu.addAction(view_source_act)
+        menu.addAction(save_offline_act)
 
         action = menu.exec(self.mapToGlobal(pos))
         if action is None:
@@ -85,44 +71,81 @@ class BrowserView(QWebEngineView):
         elif action == reload_act:
             self.reload()
         elif action == open_new_tab_act:
-            data = self.page().contextMenuData()
-            url = data.linkUrl() if data and not data.linkUrl().isEmpty() else self.url()
-            self.new_tab_requested.emit(url)
+            if not self._context_link().isEmpty():
+                # Goes through createWindow(), so the link is loaded once in the adopted tab.
+                self.triggerPageAction(QWebEnginePage.WebAction.OpenLinkInNewTab)
+            else:
+                self.new_tab_requested.emit(self.url())
         elif action == copy_link_act:
-            data = self.page().contextMenuData()
-            url = data.linkUrl() if data and not data.linkUrl().isEmpty() else self.url()
-            cb = self.page().profile().clipboard() if hasattr(self.page().profile(), 'clipboard') else None
-            # fallback: use Qt clipboard
-            from PySide6.QtGui import QGuiApplication
+            link = self._context_link()
+            url = link if not link.isEmpty() else self.url()
             QGuiApplication.clipboard().setText(url.toString())
         elif action == view_source_act:
             self.view_source_dialog()
+        elif action == save_offline_act:
+            self.save_page_requested.emit(self.page())
 
-    def view_source_dialog(self) -> None:
-        dlg = QDialog(self)
-        dlg.setWindowTitle("Page Source")
-        dlg.setAttribute(Qt.WA_DeleteOnClose)
-        dlg.resize(800, 600)
-        layout = QVBoxLayout(dlg)
-        te = QTextEdit(dlg)
-        te.setReadOnly(True)
-        layout.addWidget(te)
+    def can_go_back(self) -> bool:
+        return self.history().canGoBack() or self._previous_history is not None
 
-        def _set_html(html: str) -> None:
-            te.setPlainText(html)
+    def can_go_forward(self) -> bool:
+        return self.history().canGoForward() or self._can_return_forward()
 
-        self.page().toHtml(_set_html)
-        dlg.exec()
+    def _can_return_forward(self) -> bool:
+        # A new navigation from the swap entry replaces the forward stack, adopted page included.
+        return self._next_history is not None and self.url() == self._swap_url
 
-    def createWindow(self, _type):
-        new_view = BrowserView(self.parent())
+    def back(self) -> None:
+        if not self.history().canGoBack() and self._previous_history is not None:
+            history, self._previous_history = self._previous_history, None
+            self._next_history = serialize_history(self.history())
+            restore_history(self.history(), history)
+            return
+        super().back()
+
+    def forward(self) -> None:
+        if not self.history().canGoForward() and self._can_return_forward():
+            history, self._next_history = self._next_history, None
+            self._previous_history = serialize_history(self.history())
+            restore_history(self.history(), history)
+            return
+        super().forward()
+
+    def adopt_page(self, page: QWebEnginePage) -> None:
+        # Swaps in a page that was loaded off-screen; the old page's history stays reachable via back().
+        old = self.page()
+        self._next_history = None
+        if old.url().isValid() and not old.url().isEmpty() and old.url().toString() != "about:blank":
+            self._previous_history = serialize_history(old.history())
+            self._swap_url = QUrl(old.url())
+        page.setParent(self)
+        page.linkHovered.connect(self.link_hovered)
+        self.setPage(page)
+        if old is not None and old is not page:
+            old.deleteLater()
+
+    def _context_link(self) -> QUrl:
+        request = self.lastContextMenuRequest()
+        return request.linkUrl() if request is not None else QUrl()
 
-        def _on_url_changed(u: QUrl) -> None:
-            if not u.isEmpty():
-                self.new_tab_requested.emit(u)
+    def view_source_dialog(self) -> None:
+        from app.source_viewer import SourceViewerDialog
+        dlg = SourceViewerDialog(self.title(), self)
+        dlg.show()
 
-        new_view.urlChanged.connect(_on_url_changed)
-        return new_view
+        def _deliver(html: str) -> None:
+            try:
+                dlg.set_html(html)
+            except RuntimeError:
+                # The dialog was closed before the page answered.
+                pass
+
+        self.page().toHtml(_deliver)
+
+    def createWindow(self, _type):
+        if self.create_window_handler is None:
+            return None
+        return self.create_window_handler(_type)
 
     def open_url(self, url: str | QUrl) -> None:
         q = QUrl(url) if isinstance(url, str) else url
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional
+
+from PySide6.QtCore import QObject, QStandardPaths, QTimer, Signal
+from PySide6.QtWebEngineCore import QWebEngineUrlRequestInfo, QWebEngineUrlRequestInterceptor
+
+from app.filters import (
+    FilterIndex, host_suffixes, is_third_party,
+    TYPE_OTHER, TYPE_SCRIPT, TYPE_IMAGE, TYPE_STYLESHEET, TYPE_OBJECT, TYPE_SUBDOCUMENT,
+    TYPE_XMLHTTPREQUEST, TYPE_FONT, TYPE_MEDIA, TYPE_PING, TYPE_WEBSOCKET,
+)
+from app.session import write_atomic
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LISTS = {
+    "easylist.txt": "https://easylist.to/easylist/easylist.txt",
+    "easyprivacy.txt": "https://easylist.to/easylist/easyprivacy.txt",
+}
+
+_RT = QWebEngineUrlRequestInfo.ResourceType
+RESOURCE_TYPES: dict = {}
+for _name, _bit in (
+    ("ResourceTypeSubFrame", TYPE_SUBDOCUMENT),
+    ("ResourceTypeStylesheet", TYPE_STYLESHEET),
+    ("ResourceTypeScript", TYPE_SCRIPT),
+    ("ResourceTypeImage", TYPE_IMAGE),
+    ("ResourceTypeFontResource", TYPE_FONT),
+    ("ResourceTypeSubResource", TYPE_OTHER),
+    ("ResourceTypeObject", TYPE_OBJECT),
+    ("ResourceTypeMedia", TYPE_MEDIA),
+    ("ResourceTypeWorker", TYPE_SCRIPT),
+    ("ResourceTypeSharedWorker", TYPE_SCRIPT),
+    ("ResourceTypePrefetch", TYPE_OTHER),
+    ("ResourceTypeFavicon", TYPE_IMAGE),
+    ("ResourceTypeXhr", TYPE_XMLHTTPREQUEST),
+    ("ResourceTypePing", TYPE_PING),
+    ("ResourceTypeServiceWorker", TYPE_SCRIPT),
+    ("ResourceTypeCspReport", TYPE_PING),
+    ("ResourceTypePluginResource", TYPE_OBJECT),
+    ("ResourceTypeWebSocket", TYPE_WEBSOCKET),
+):
+    _value = getattr(_RT, _name, None)
+    if _value is not None:
+        RESOURCE_TYPES[_value] = _bit
+_MAIN_FRAME = getattr(_RT, "ResourceTypeMainFrame", None)
+
+
+def default_filters_dir() -> str:
+    base = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    if not base:
+        base = str(Path.home() / ".gbrowser")
+    return os.path.join(base, "filters")
+
+
+def _page_key(url: str) -> str:
+    hash_at = url.find("#")
+    return url if hash_at < 0 else url[:hash_at]
+
+
+class RequestInterceptor(QWebEngineUrlRequestInterceptor):
+
+    def __init__(self, blocker: "ContentBlocker") -> None:
+        super().__init__(blocker)
+        self._blocker = blocker
+
+    def interceptRequest(self, info: QWebEngineUrlRequestInfo) -> None:
+        try:
+            if self._blocker.check(info):
+                info.block(True)
+        except Exception:
+            logger.exception("Content blocker failed on %s", info.requestUrl().toString())
+
+
+class ContentBlocker(QObject):
+
+    index_ready = Signal(int)
+    blocked_changed = Signal()
+
+    UPDATE_AFTER_S = 4 * 24 * 3600
+    MAX_PAGES = 512
+    NOTIFY_MS = 250
+
+    def __init__(self, filters_dir: Optional[str] = None, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.filters_dir = filters_dir or default_filters_dir()
+        self.cache_path = os.path.join(self.filters_dir, "compiled.idx")
+        self.enabled = True
+        self._index: Optional[FilterIndex] = None
+        self._allowlist: frozenset[str] = frozenset()
+        # Blocked-request counts per top-level document, so each tab reads the count of the page it shows.
+        self._blocked: OrderedDict[str, int] = OrderedDict()
+        self.total_blocked = 0
+
+        self._notify = QTimer(self)
+        self._notify.setSingleShot(True)
+        self._notify.setInterval(self.NOTIFY_MS)
+        self._notify.timeout.connect(self.blocked_changed)
+        self.index_ready.connect(lambda count: logger.info("Content blocker loaded %d rules", count))
+
+        self.interceptor = RequestInterceptor(self)
+
+    def load(self) -> None:
+        threading.Thread(target=self._load_worker, name="content-blocker-load", daemon=True).start()
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enabled = enabled
+
+    def set_allowlist(self, hosts: Iterable[str]) -> None:
+        self._allowlist = frozenset(h.strip().lower() for h in hosts if h and h.strip())
+
+    def allowlist(self) -> list[str]:
+        return sorted(self._allowlist)
+
+    def is_allowlisted(self, host: str) -> bool:
+        host = host.lower()
+        return any(suffix in self._allowlist for suffix in host_suffixes(host))
+
+    def set_site_allowed(self, host: str, allowed: bool) -> None:
+        host = host.lower()
+        hosts = set(self._allowlist)
+        if allowed:
+            hosts.add(host)
+        else:
+            hosts.difference_update(host_suffixes(host))
+        self._allowlist = frozenset(hosts)
+
+    def blocked_count(self, page_url: str) -> int:
+        return self._blocked.get(_page_key(page_url), 0)
+
+    def rule_count(self) -> int:
+        return self._index.rule_count if self._index is not None else 0
+
+    def check(self, info: QWebEngineUrlRequestInfo) -> bool:
+        resource = info.resourceType()
+        if resource == _MAIN_FRAME:
+            # A new document starts its own count.
+            self._blocked.pop(_page_key(info.requestUrl().toString()), None)
+            return False
+        index = self._index
+        if index is None or not self.enabled:
+            return False
+        first_party = info.firstPartyUrl()
+        site = first_party.host().lower()
+        if site and self._allowlist and self.is_allowlisted(site):
+            return False
+        url = info.requestUrl()
+        host = url.host().lower()
+        if not host:
+            return False
+        url_text = url.toString()
+        blocked = index.should_block(
+            url_text, host, site or host, RESOURCE_TYPES.get(resource, TYPE_OTHER), is_third_party(host, site or host)
+        )
+        if blocked:
+            if index.document_allow and index.page_allowed(first_party.toString(), site):
+                return False
+            self._count(first_party.toString())
+        return blocked
+
+    def _count(self, page_url: str) -> None:
+        key = _page_key(page_url)
+        self._blocked[key] = self._blocked.pop(key, 0) + 1
+        if len(self._blocked) > self.MAX_PAGES:
+            self._blocked.popitem(last=False)
+        self.total_blocked += 1
+        if not self._notify.isActive():
+            self._notify.start()
+
+    def _list_files(self) -> list[Path]:
+        directory = Path(self.filters_dir)
+        try:
+            return sorted(p for p in directory.iterdir() if p.suffix == ".txt" and p.is_file())
+        except OSError:
+            return []
+
+    def _download_defaults(self, files: list[Path]) -> None:
+        present = {p.name: p for p in files}
+        now = time.time()
+        for name, url in DEFAULT_LISTS.items():
+            path = present.get(name)
+            try:
+                if path is not None and now - path.stat().st_mtime < self.UPDATE_AFTER_S:
+                    continue
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    payload = response.read()
+                write_atomic(os.path.join(self.filters_dir, name), payload)
+                logger.info("Downloaded filter list %s", url)
+            except Exception as e:
+                logger.warning("Could not download filter list %s: %s", url, e)
+
+    def _cache_key(self, files: list[Path]) -> str:
+        h = hashlib.sha1(str(FilterIndex.VERSION).encode("ascii"))
+        for path in files:
+            st = path.stat()
+            h.update(f"{path.name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+        return h.hexdigest()
+
+    def _load_worker(self) -> None:
+        try:
+            os.makedirs(self.filters_dir, exist_ok=True)
+            files = self._list_files()
+            if not files or any(p.name in DEFAULT_LISTS for p in files):
+                self._download_defaults(files)
+                files = self._list_files()
+            key = self._cache_key(files)
+
+            index = None
+            try:
+                with open(self.cache_path, "rb") as f:
+                    cached = pickle.load(f)
+                if cached.get("key") == key:
+                    index = FilterIndex.from_state(cached.get("index"))
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+                pass
+
+            if index is None:
+                start = time.perf_counter()
+                lines: list[str] = []
+                for path in files:
+                    lines.extend(path.read_text(encoding="utf-8", errors="replace").splitlines())
+                index = FilterIndex.compile(lines)
+                logger.info("Compiled %d filter rules in %.2f s", index.rule_count, time.perf_counter() - start)
+                payload = pickle.dumps({"key": key, "index": index.state()}, protocol=pickle.HIGHEST_PROTOCOL)
+                write_atomic(self.cache_path, payload)
+
+            # Swapping the reference is atomic; requests in flight finish against the old index.
+            self._index = index
+            self.index_ready.emit(index.rule_count)
+        except Exception:
+            logger.exception("Failed to load content filters")
+
+
+__all__ = ["ContentBlocker", "RequestInterceptor", "default_filters_dir", "DEFAULT_LISTS"]
@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+from PySide6.QtCore import QObject, QStandardPaths, QTimer, Signal
+from PySide6.QtWebEngineCore import QWebEngineDownloadRequest
+
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "Queued"
+ACTIVE = "Downloading"
+PAUSED = "Paused"
+COMPLETED = "Completed"
+CANCELLED = "Cancelled"
+FAILED = "Failed"
+
+FINISHED_STATES = (COMPLETED, CANCELLED, FAILED)
+
+
+def default_download_dir() -> str:
+    path = QStandardPaths.writableLocation(QStandardPaths.DownloadLocation)
+    return path or str(Path.home() / "Downloads")
+
+
+def allocate_name(directory: str, suggested: str, reserved: Iterable[str] = ()) -> str:
+    # One listing of the directory instead of an exists() call per candidate name.
+    name = os.path.basename(suggested or "").strip() or "download"
+    try:
+        with os.scandir(directory) as it:
+            taken = {entry.name.casefold() for entry in it}
+    except OSError:
+        taken = set()
+    taken.update(n.casefold() for n in reserved)
+
+    base, ext = os.path.splitext(name)
+    candidate = name
+    i = 1
+    while candidate.casefold() in taken:
+        candidate = f"{base} ({i}){ext}"
+        i += 1
+    return candidate
+
+
+def format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+@dataclass
+class DownloadItem:
+    download_id: int
+    request: QWebEngineDownloadRequest
+    path: str
+    state: str = QUEUED
+    received: int = 0
+    total: int = -1
+    speed: float = 0.0
+    limit_kbps: int = 0
+    throttled: bool = False
+    error: str = ""
+    started: float = field(default_factory=time.time)
+    _last_bytes: int = 0
+    _allowance: float = 0.0
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def directory(self) -> str:
+        return os.path.dirname(self.path)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def progress(self) -> int:
+        if self.state == COMPLETED:
+            return 100
+        if self.total <= 0:
+            return -1
+        return min(100, int(self.received * 100 / self.total))
+
+
+class DownloadManager(QObject):
+
+    download_added = Signal(int)
+    download_removed = Signal(int)
+    download_finished = Signal(int)
+    # Ids of the downloads that changed since the last frame, at most once per FRAME_MS.
+    downloads_changed = Signal(object)
+
+    TICK_MS = 250
+    FRAME_MS = 100
+    BURST_SECONDS = 1.0
+
+    def __init__(self, directory: Optional[str] = None, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.directory = directory or default_download_dir()
+        self.max_concurrent = 3
+        self.global_limit_kbps = 0
+
+        self._items: dict[int, DownloadItem] = {}
+        self._queue: deque[int] = deque()
+        self._dirty: set[int] = set()
+        self._next_id = 1
+        self._global_allowance = 0.0
+        self._last_tick = time.monotonic()
+
+        # Progress reaches every panel as one batch per frame rather than per received chunk.
+        self._frame = QTimer(self)
+        self._frame.setSingleShot(True)
+        self._frame.setInterval(self.FRAME_MS)
+        self._frame.timeout.connect(self._emit_changed)
+
+        # Drives throttling and speed sampling; only runs while something is downloading.
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.TICK_MS)
+        self._timer.timeout.connect(self._tick)
+
+    def add(self, request: QWebEngineDownloadRequest) -> int:
+        directory = self.directory
+        os.makedirs(directory, exist_ok=True)
+        suggested = request.downloadFileName() or request.suggestedFileName()
+        reserved = [i.name for i in self._items.values() if not i.finished and i.directory == directory]
+        name = allocate_name(directory, suggested, reserved)
+
+        request.setDownloadDirectory(directory)
+        request.setDownloadFileName(name)
+        request.accept()
+
+        did = self._next_id
+        self._next_id += 1
+        item = DownloadItem(did, request, os.path.join(directory, name))
+        item.total = request.totalBytes()
+        self._items[did] = item
+
+        request.receivedBytesChanged.connect(lambda: self._on_progress(did))
+        request.totalBytesChanged.connect(lambda: self._on_progress(did))
+        request.stateChanged.connect(lambda _state: self._on_state_changed(did))
+        request.isPausedChanged.connect(lambda: self._on_state_changed(did))
+
+        if self._active_count() >= self.max_concurrent:
+            # Accepted so the request is not dropped, but held paused until a slot frees up.
+            self._queue.append(did)
+        else:
+            item.state = ACTIVE
+        self._enforce(item)
+        self._mark_dirty(did)
+        self.download_added.emit(did)
+        self._ensure_timer()
+        return did
+
+    def items(self) -> list[DownloadItem]:
+        return list(self._items.values())
+
+    def item(self, download_id: int) -> Optional[DownloadItem]:
+        return self._items.get(download_id)
+
+    def _mark_dirty(self, download_id: int) -> None:
+        self._dirty.add(download_id)
+        if not self._frame.isActive():
+            self._frame.start()
+
+    def _emit_changed(self) -> None:
+        dirty, self._dirty = self._dirty, set()
+        if dirty:
+            self.downloads_changed.emit(dirty)
+
+    def pause(self, download_id: int) -> None:
+        item = self._items.get(download_id)
+        if item is None or item.state not in (ACTIVE, QUEUED):
+            return
+        was_active = item.state == ACTIVE
+        self._unqueue(download_id)
+        item.state = PAUSED
+        item.speed = 0.0
+        self._enforce(item)
+        self._mark_dirty(download_id)
+        if was_active:
+            self._start_next()
+
+    def resume(self, download_id: int) -> None:
+        item = self._items.get(download_id)
+        if item is None or item.state not in (PAUSED, FAILED):
+            return
+        item.error = ""
+        if self._active_count() >= self.max_concurrent:
+            item.state = QUEUED
+            self._queue.append(download_id)
+        else:
+            item.state = ACTIVE
+        if item.request.state() == QWebEngineDownloadRequest.DownloadState.DownloadInterrupted:
+            item.request.resume()
+        self._enforce(item)
+        self._mark_dirty(download_id)
+        self._ensure_timer()
+
+    def cancel(self, download_id: int) -> None:
+        item = self._items.get(download_id)
+        if item is None or item.finished:
+            return
+        self._unqueue(download_id)
+        item.request.cancel()
+
+    def remove(self, download_id: int) -> None:
+        item = self._items.get(download_id)
+        if item is None or not item.finished:
+            return
+        del self._items[download_id]
+        self._dirty.discard(download_id)
+        self.download_removed.emit(download_id)
+
+    def clear_finished(self) -> None:
+        for did in [did for did, item in self._items.items() if item.finished]:
+            self.remove(did)
+
+    def set_limit(self, download_id: int, kbps: int) -> None:
+        item = self._items.get(download_id)
+        if item is not None:
+            item.limit_kbps = max(0, kbps)
+            item._allowance = 0.0
+            self._mark_dirty(download_id)
+
+    def set_global_limit(self, kbps: int) -> None:
+        self.global_limit_kbps = max(0, kbps)
+        self._global_allowance = 0.0
+
+    def set_max_concurrent(self, count: int) -> None:
+        self.max_concurrent = max(1, count)
+        self._start_next()
+
+    def _active_count(self) -> int:
+        return sum(1 for item in self._items.values() if item.state == ACTIVE)
+
+    def _unqueue(self, download_id: int) -> None:
+        try:
+            self._queue.remove(download_id)
+        except ValueError:
+            pass
+
+    def _start_next(self) -> None:
+        while self._queue and self._active_count() < self.max_concurrent:
+            item = self._items.get(self._queue.popleft())
+            if item is None or item.state != QUEUED:
+                continue
+            item.state = ACTIVE
+            self._enforce(item)
+            self._mark_dirty(item.download_id)
+        self._ensure_timer()
+
+    def _enforce(self, item: DownloadItem) -> None:
+        request = item.request
+        if request.state() != QWebEngineDownloadRequest.DownloadState.DownloadInProgress:
+            return
+        hold = item.state in (QUEUED, PAUSED) or item.throttled
+        if hold and not request.isPaused():
+            request.pause()
+        elif not hold and request.isPaused():
+            request.resume()
+
+    def _on_progress(self, download_id: int) -> None:
+        # Runs for every chunk Chromium reports; just record numbers, the panel repaints on its own clock.
+        item = self._items.get(download_id)
+        if item is not None:
+            item.received = item.request.receivedBytes()
+            item.total = item.request.totalBytes()
+            self._mark_dirty(download_id)
+
+    def _on_state_changed(self, download_id: int) -> None:
+        item = self._items.get(download_id)
+        if item is None or item.finished:
+            return
+        request = item.request
+        state = request.state()
+        DownloadState = QWebEngineDownloadRequest.DownloadState
+        if state == DownloadState.DownloadCompleted:
+            item.state = COMPLETED
+            item.received = request.receivedBytes()
+        elif state == DownloadState.DownloadCancelled:
+            item.state = CANCELLED
+        elif state == DownloadState.DownloadInterrupted:
+            item.state = FAILED
+            item.error = request.interruptReasonString()
+        else:
+            self._enforce(item)
+            return
+        item.speed = 0.0
+        item.throttled = False
+        self._unqueue(download_id)
+        self._mark_dirty(download_id)
+        self.download_finished.emit(download_id)
+        self._start_next()
+
+    def _ensure_timer(self) -> None:
+        if not self._timer.isActive() and any(i.state == ACTIVE for i in self._items.values()):
+            self._last_tick = time.monotonic()
+            self._timer.start()
+
+    def _tick(self) -> None:
+        now = time.monotonic()
+        dt = max(1e-3, now - self._last_tick)
+        self._last_tick = now
+
+        active = [item for item in self._items.values() if item.state == ACTIVE]
+        if not active:
+            self._timer.stop()
+            return
+
+        # Token buckets refill at the cap; a download that overdraws its bucket is paused until it
+        # refills. Chromium has no rate control of its own, so the cap is met by duty-cycling.
+        global_cap = self.global_limit_kbps * 1024
+        if global_cap:
+            self._global_allowance = min(global_cap * self.BURST_SECONDS, self._global_allowance + global_cap * dt)
+        for item in active:
+            delta = max(0, item.received - item._last_bytes)
+            item._last_bytes = item.received
+            item.speed = item.speed * 0.6 + (delta / dt) * 0.4
+            if global_cap:
+                self._global_allowance -= delta
+            cap = item.limit_kbps * 1024
+            if cap:
+                item._allowance = min(cap * self.BURST_SECONDS, item._allowance + cap * dt) - delta
+            self._mark_dirty(item.download_id)
+
+        global_blocked = bool(global_cap) and self._global_allowance < 0
+        for item in active:
+            throttled = global_blocked or (item.limit_kbps > 0 and item._allowance < 0)
+            if throttled != item.throttled:
+                item.throttled = throttled
+                self._enforce(item)
+
+
+__all__ = [
+    "DownloadManager", "DownloadItem", "allocate_name", "default_download_dir", "format_bytes",
+    "QUEUED", "ACTIVE", "PAUSED", "COMPLETED", "CANCELLED", "FAILED",
+]
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from PySide6.QtCore import Qt, QUrl, QModelIndex, QAbstractTableModel
+from PySide6.QtGui import QDesktopServices
+from PySide6.QtWidgets import (
+    QApplication, QDialog, QVBoxLayout, QHBoxLayout, QTableView, QPushButton, QLabel, QSpinBox,
+    QHeaderView, QAbstractItemView, QStyle, QStyledItemDelegate, QStyleOptionProgressBar, QWidget
+)
+
+from app.downloads import DownloadManager, DownloadItem, ACTIVE, QUEUED, PAUSED, FAILED, format_bytes
+
+
+class DownloadsModel(QAbstractTableModel):
+
+    HEADERS = ("Name", "Progress", "Speed", "Status")
+    ProgressRole = Qt.UserRole + 1
+
+    def __init__(self, manager: DownloadManager, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._manager = manager
+        self._ids: list[int] = [item.download_id for item in manager.items()]
+        manager.download_added.connect(self._on_added)
+        manager.download_removed.connect(self._on_removed)
+
+    def item(self, row: int) -> Optional[DownloadItem]:
+        if 0 <= row < len(self._ids):
+            return self._manager.item(self._ids[row])
+        return None
+
+    def row_of(self, download_id: int) -> int:
+        try:
+            return self._ids.index(download_id)
+        except ValueError:
+            return -1
+
+    def refresh(self, download_ids: set[int]) -> None:
+        # One dataChanged per frame covering every row that moved since the last one.
+        rows = [r for r in (self.row_of(did) for did in download_ids) if r >= 0]
+        if rows:
+            self.dataChanged.emit(self.index(min(rows), 0), self.index(max(rows), len(self.HEADERS) - 1))
+
+    def _on_added(self, download_id: int) -> None:
+        row = len(self._ids)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._ids.append(download_id)
+        self.endInsertRows()
+
+    def _on_removed(self, download_id: int) -> None:
+        row = self.row_of(download_id)
+        if row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._ids[row]
+            self.endRemoveRows()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole) -> Any:
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        item = self.item(index.row()) if index.isValid() else None
+        if item is None:
+            return None
+        col = index.column()
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return item.name
+            if col == 1:
+                if item.total > 0:
+                    return f"{format_bytes(item.received)} of {format_bytes(item.total)}"
+                return format_bytes(item.received)
+            if col == 2:
+                return f"{format_bytes(item.speed)}/s" if item.state == ACTIVE and item.speed else ""
+            status = item.state
+            if item.state == ACTIVE and item.limit_kbps:
+                status += f" (≤ {item.limit_kbps} KB/s)"
+            if item.error:
+                status += f": {item.error}"
+            return status
+        if role == self.ProgressRole and col == 1:
+            return item.progress()
+        if role == Qt.ToolTipRole:
+            return item.path
+        return None
+
+
+class _ProgressDelegate(QStyledItemDelegate):
+
+    def paint(self, painter, option, index: QModelIndex) -> None:
+        progress = index.data(DownloadsModel.ProgressRole)
+        if progress is None:
+            return super().paint(painter, option, index)
+        bar = QStyleOptionProgressBar()
+        bar.rect = option.rect.adjusted(2, 3, -2, -3)
+        bar.minimum = 0
+        bar.maximum = 100 if progress >= 0 else 0
+        bar.progress = max(0, progress)
+        bar.text = index.data(Qt.DisplayRole) or ""
+        bar.textVisible = True
+        bar.state = option.state
+        style = option.widget.style() if option.widget is not None else QApplication.style()
+        style.drawControl(QStyle.CE_ProgressBar, bar, painter)
+
+
+class DownloadsPanel(QDialog):
+
+    def __init__(self, manager: DownloadManager, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Downloads")
+        self.resize(780, 360)
+        self._manager = manager
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 12, 12, 12)
+        layout.setSpacing(8)
+
+        self.model = DownloadsModel(manager, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setItemDelegateForColumn(1, _ProgressDelegate(self.table))
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setShowGrid(False)
+        self.table.verticalHeader().hide()
+        self.table.verticalHeader().setDefaultSectionSize(26)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.Fixed)
+        header.resizeSection(1, 220)
+        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)
+        layout.addWidget(self.table, 1)
+
+        row = QHBoxLayout()
+        self.pause_btn = QPushButton("Pause")
+        self.resume_btn = QPushButton("Resume")
+        self.cancel_btn = QPushButton("Cancel")
+        self.open_btn = QPushButton("Show in folder")
+        self.clear_btn = QPushButton("Clear finished")
+        limit_lbl = QLabel("Speed limit:")
+        self.limit_spin = QSpinBox()
+        self.limit_spin.setRange(0, 1024 * 1024)
+        self.limit_spin.setSingleStep(100)
+        self.limit_spin.setSuffix(" KB/s")
+        self.limit_spin.setSpecialValueText("Unlimited")
+        for w in (self.pause_btn, self.resume_btn, self.cancel_btn, self.open_btn):
+            row.addWidget(w)
+        row.addStretch(1)
+        row.addWidget(limit_lbl)
+        row.addWidget(self.limit_spin)
+        row.addWidget(self.clear_btn)
+        layout.addLayout(row)
+
+        # The manager batches progress per frame; every open panel gets the same batch.
+        manager.downloads_changed.connect(self._on_changed)
+
+        self.pause_btn.clicked.connect(lambda: self._with_selected(manager.pause))
+        self.resume_btn.clicked.connect(lambda: self._with_selected(manager.resume))
+        self.cancel_btn.clicked.connect(lambda: self._with_selected(manager.cancel))
+        self.open_btn.clicked.connect(self._open_folder)
+        self.clear_btn.clicked.connect(manager.clear_finished)
+        self.limit_spin.editingFinished.connect(
+            lambda: self._with_selected(lambda did: manager.set_limit(did, self.limit_spin.value()))
+        )
+        self.table.selectionModel().currentRowChanged.connect(lambda *_: self._update_controls())
+        self.table.doubleClicked.connect(lambda _: self._open_folder())
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self.model.refresh({item.download_id for item in self._manager.items()})
+        self._update_controls()
+
+    def _selected(self) -> Optional[DownloadItem]:
+        return self.model.item(self.table.currentIndex().row())
+
+    def _with_selected(self, action) -> None:
+        item = self._selected()
+        if item is not None:
+            action(item.download_id)
+            self._update_controls()
+
+    def _on_changed(self, dirty: set[int]) -> None:
+        # A hidden panel catches up in showEvent.
+        if not self.isVisible():
+            return
+        self.model.refresh(dirty)
+        item = self._selected()
+        if item is not None and item.download_id in dirty:
+            self._update_controls()
+
+    def _update_controls(self) -> None:
+        item = self._selected()
+        state = item.state if item is not None else None
+        self.pause_btn.setEnabled(state in (ACTIVE, QUEUED))
+        self.resume_btn.setEnabled(state in (PAUSED, FAILED))
+        self.cancel_btn.setEnabled(item is not None and not item.finished)
+        self.open_btn.setEnabled(item is not None)
+        self.limit_spin.setEnabled(item is not None and not item.finished)
+        if item is not None and not self.limit_spin.hasFocus():
+            self.limit_spin.setValue(item.limit_kbps)
+
+    def _open_folder(self) -> None:
+        item = self._selected()
+        if item is not None:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(item.directory))
+
+
+__all__ = ["DownloadsPanel", "DownloadsModel"]
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import ctypes
-import sys
 import platform
+from abc import ABC, abstractmethod
 from ctypes import wintypes
 from typing import Optional
 
+from PySide6.QtCore import QCoreApplication, QObject, QTimer
+
 
 ACCENT_DISABLED = 0
 ACCENT_ENABLE_GRADIENT = 1
@@ -35,7 +37,6 @@ class WINDOWCOMPOSITIONATTRIBDATA(ctypes.Structure):
     ]
 
 
-
 def is_windows() -> bool:
     return platform.system().lower() == "windows"
 
@@ -55,8 +56,142 @@ def _get_set_window_composition_attribute():
         return None
 
 
+class EffectBackend(ABC):
+
+    available = False
+
+    @abstractmethod
+    def set_accent(self, hwnd: int, accent: tuple[int, int, int, int]) -> bool:
+        ...
+
+
+class NullBackend(EffectBackend):
+
+    def set_accent(self, hwnd: int, accent: tuple[int, int, int, int]) -> bool:
+        return False
+
+
+class RecordingBackend(EffectBackend):
+
+    available = True
+
+    def __init__(self, result: bool = True) -> None:
+        self.result = result
+        self.calls: list[tuple[int, tuple[int, int, int, int]]] = []
+
+    def set_accent(self, hwnd: int, accent: tuple[int, int, int, int]) -> bool:
+        self.calls.append((hwnd, accent))
+        return self.result
+
+
+class Win32Backend(EffectBackend):
+
+    def __init__(self) -> None:
+        # Resolved once; the structs are reused for every call since effects only run on the GUI thread.
+        self._func = _get_set_window_composition_attribute()
+        self.available = self._func is not None
+        self._accent = ACCENT_POLICY()
+        self._data = WINDOWCOMPOSITIONATTRIBDATA()
+        self._data.Attribute = WCA_ACCENT_POLICY
+        self._data.Data = ctypes.cast(ctypes.pointer(self._accent), ctypes.c_void_p)
+        self._data.SizeOfData = ctypes.sizeof(self._accent)
+        self._data_ref = ctypes.byref(self._data)
+
+    def set_accent(self, hwnd: int, accent: tuple[int, int, int, int]) -> bool:
+        if self._func is None:
+            return False
+        try:
+            state, flags, color, animation_id = accent
+            self._accent.AccentState = state
+            self._accent.AccentFlags = flags
+            self._accent.GradientColor = color & 0xFFFFFFFF
+            self._accent.AnimationId = animation_id
+            return bool(self._func(wintypes.HWND(hwnd), self._data_ref))
+        except Exception:
+            return False
+
+
+def default_backend() -> EffectBackend:
+    if is_windows():
+        backend = Win32Backend()
+        if backend.available:
+            return backend
+    return NullBackend()
+
+
+class WindowEffects(QObject):
+
+    FRAME_MS = 16
+
+    def __init__(self, backend: Optional[EffectBackend] = None, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._backend = backend if backend is not None else default_backend()
+        self._applied: dict[int, tuple[int, int, int, int]] = {}
+        self._pending: dict[int, tuple[int, int, int, int]] = {}
+        self.calls = 0
+        self.skipped = 0
+        self.coalesced = 0
+
+        self._frame = QTimer(self)
+        self._frame.setSingleShot(True)
+        self._frame.setInterval(self.FRAME_MS)
+        self._frame.timeout.connect(self.flush)
+
+    @property
+    def backend(self) -> EffectBackend:
+        return self._backend
+
+    def set_backend(self, backend: EffectBackend) -> None:
+        self._backend = backend
+        self._applied.clear()
+        self._pending.clear()
+        self._frame.stop()
+
+    def apply(self, hwnd: int, accent: tuple[int, int, int, int]) -> bool:
+        self._pending.pop(hwnd, None)
+        if self._applied.get(hwnd) == accent:
+            self.skipped += 1
+            return True
+        self.calls += 1
+        ok = self._backend.set_accent(hwnd, accent)
+        if ok:
+            self._applied[hwnd] = accent
+        else:
+            self._applied.pop(hwnd, None)
+        return ok
+
+    def schedule(self, hwnd: int, accent: tuple[int, int, int, int]) -> None:
+        # Slider drags fire many times per frame; only the last state per window reaches the OS.
+        if hwnd in self._pending:
+            self.coalesced += 1
+        self._pending[hwnd] = accent
+        if not self._frame.isActive():
+            self._frame.start()
+
+    def flush(self) -> None:
+        self._frame.stop()
+        pending, self._pending = self._pending, {}
+        for hwnd, accent in pending.items():
+            self.apply(hwnd, accent)
+
+    def forget(self, hwnd: int) -> None:
+        # Window handles are recycled by the OS, so a destroyed window must not leave state behind.
+        self._applied.pop(hwnd, None)
+        self._pending.pop(hwnd, None)
+
+
+_window_effects: Optional[WindowEffects] = None
+
+
+def get_window_effects() -> WindowEffects:
+    global _window_effects
+    if _window_effects is None:
+        _window_effects = WindowEffects(parent=QCoreApplication.instance())
+    return _window_effects
+
+
 def hwnd_of(widget) -> Optional[int]:
-    if not is_windows():
+    if not get_window_effects().backend.available:
         return None
     try:
         return int(widget.winId())
@@ -64,54 +199,16 @@ def hwnd_of(widget) -> Optional[int]:
         return None
 
 
+def acrylic_accent(color: int = 0x661F2937) -> tuple[int, int, int, int]:
+    return (ACCENT_ENABLE_ACRYLICBLURBEHIND, 2, color & 0xFFFFFFFF, 0)
 
-def enable_acrylic(hwnd: int, color: int = 0x661F2937) -> bool:
-    if not is_windows():
-        return False
-
-    func = _get_set_window_composition_attribute()
-    if func is None:
-        return False
 
-    try:
-        accent = ACCENT_POLICY()
-        accent.AccentState = ACCENT_ENABLE_ACRYLICBLURBEHIND
-        accent.AccentFlags = 2
-        accent.GradientColor = ctypes.c_uint32(color)
-
-        data = WINDOWCOMPOSITIONATTRIBDATA()
-        data.Attribute = WCA_ACCENT_POLICY
-        data.Data = ctypes.cast(ctypes.pointer(accent), ctypes.c_void_p)
-        data.SizeOfData = ctypes.sizeof(accent)
-
-        res = func(wintypes.HWND(hwnd), ctypes.byref(data))
-        return bool(res)
-    except Exception:
-        return False
+def enable_acrylic(hwnd: int, color: int = 0x661F2937) -> bool:
+    return get_window_effects().apply(hwnd, acrylic_accent(color))
 
 
 def remove_acrylic(hwnd: int) -> bool:
-    if not is_windows():
-        return False
-    func = _get_set_window_composition_attribute()
-    if func is None:
-        return False
-    try:
-        accent = ACCENT_POLICY()
-        accent.AccentState = ACCENT_DISABLED
-        accent.AccentFlags = 0
-        accent.GradientColor = 0
-        accent.AnimationId = 0
-
-        data = WINDOWCOMPOSITIONATTRIBDATA()
-        data.Attribute = WCA_ACCENT_POLICY
-        data.Data = ctypes.cast(ctypes.pointer(accent), ctypes.c_void_p)
-        data.SizeOfData = ctypes.sizeof(accent)
-
-        res = func(wintypes.HWND(hwnd), ctypes.byref(data))
-        return bool(res)
-    except Exception:
-        return False
+    return get_window_effects().apply(hwnd, (ACCENT_DISABLED, 0, 0, 0))
 
 
 def apply_acrylic_to_widget(widget, color: int = 0x661F2937) -> bool:
@@ -121,29 +218,20 @@ def apply_acrylic_to_widget(widget, color: int = 0x661F2937) -> bool:
     return enable_acrylic(hwnd, color)
 
 
+def schedule_acrylic_for_widget(widget, color: int = 0x661F2937) -> None:
+    hwnd = hwnd_of(widget)
+    if hwnd is not None:
+        get_window_effects().schedule(hwnd, acrylic_accent(color))
+
+
+def forget_widget(widget) -> None:
+    hwnd = hwnd_of(widget)
+    if hwnd is not None:
+        get_window_effects().forget(hwnd)
+
 
 def enable_blur_behind(hwnd: int, color: int = 0x00000000) -> bool:
-    if not is_windows():
-        return False
-    func = _get_set_window_composition_attribute()
-    if func is None:
-        return False
-    try:
-        accent = ACCENT_POLICY()
-        accent.AccentState = ACCENT_ENABLE_BLURBEHIND
-        accent.AccentFlags = 0
-        accent.GradientColor = ctypes.c_uint32(color)
-        accent.AnimationId = 0
-
-        data = WINDOWCOMPOSITIONATTRIBDATA()
-        data.Attribute = WCA_ACCENT_POLICY
-        data.Data = ctypes.cast(ctypes.pointer(accent), ctypes.c_void_p)
-        data.SizeOfData = ctypes.sizeof(accent)
-
-        res = func(wintypes.HWND(hwnd), ctypes.byref(data))
-        return bool(res)
-    except Exception:
-        return False
+    return get_window_effects().apply(hwnd, (ACCENT_ENABLE_BLURBEHIND, 0, color & 0xFFFFFFFF, 0))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import queue
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import (
+    Qt, QBuffer, QByteArray, QCoreApplication, QIODevice, QObject, QSize, QStandardPaths, QUrl, Signal
+)
+from PySide6.QtGui import QGuiApplication, QIcon, QImage, QPixmap
+
+from app.session import write_atomic
+
+
+logger = logging.getLogger(__name__)
+
+
+def default_favicons_dir() -> str:
+    base = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    if not base:
+        base = str(Path.home() / ".gbrowser")
+    return os.path.join(base, "favicons")
+
+
+def favicon_host(url: QUrl) -> str:
+    host = url.host().lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class FaviconCache(QObject):
+
+    icon_ready = Signal(str)
+    _decoded = Signal(str, QImage)
+
+    ICON_SIZE = 16
+    STORE_SIZE = 64
+    MAX_ENTRIES = 256
+
+    def __init__(self, directory: Optional[str] = None, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.directory = directory or default_favicons_dir()
+        screen = QGuiApplication.primaryScreen() if isinstance(QCoreApplication.instance(), QGuiApplication) else None
+        self._dpr = max(1.0, screen.devicePixelRatio()) if screen is not None else 1.0
+        self._pixmaps: OrderedDict[str, QPixmap] = OrderedDict()
+        # Hosts with a disk read in flight, and hosts whose file is known not to exist.
+        self._pending: set[str] = set()
+        self._missing: set[str] = set()
+
+        self._jobs: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._decoded.connect(self._on_decoded)
+
+    def path_for(self, host: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(host.encode("utf-8")).hexdigest() + ".png")
+
+    def pixmap(self, host: str) -> Optional[QPixmap]:
+        # Returns what is decoded already; a miss starts a disk read and icon_ready follows if one exists.
+        if not host:
+            return None
+        pix = self._pixmaps.get(host)
+        if pix is not None:
+            self._pixmaps.move_to_end(host)
+            return pix
+        if host not in self._pending and host not in self._missing:
+            self._pending.add(host)
+            self._submit(("load", host))
+        return None
+
+    def store(self, host: str, icon: QIcon) -> Optional[QPixmap]:
+        if not host or icon.isNull():
+            return None
+        side = int(self.ICON_SIZE * self._dpr)
+        pix = icon.pixmap(QSize(side, side))
+        if pix.isNull():
+            return None
+        pix.setDevicePixelRatio(self._dpr)
+        self._remember(host, pix)
+        self._missing.discard(host)
+        # QPixmap belongs to the GUI thread; the worker gets a QImage to encode and write.
+        image = icon.pixmap(QSize(self.STORE_SIZE, self.STORE_SIZE)).toImage()
+        self._submit(("store", host, image))
+        return pix
+
+    def _remember(self, host: str, pix: QPixmap) -> None:
+        self._pixmaps[host] = pix
+        self._pixmaps.move_to_end(host)
+        while len(self._pixmaps) > self.MAX_ENTRIES:
+            self._pixmaps.popitem(last=False)
+
+    def _on_decoded(self, host: str, image: QImage) -> None:
+        self._pending.discard(host)
+        if image.isNull():
+            if host not in self._pixmaps:
+                self._missing.add(host)
+            return
+        # A fresher icon stored while the read was in flight wins.
+        if host not in self._pixmaps:
+            pix = QPixmap.fromImage(image)
+            pix.setDevicePixelRatio(self._dpr)
+            self._remember(host, pix)
+        self.icon_ready.emit(host)
+
+    def _submit(self, job: tuple) -> None:
+        self._jobs.put(job)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="favicon-io", daemon=True)
+            self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            job = self._jobs.get()
+            try:
+                if job[0] == "load":
+                    self._decoded.emit(job[1], self._read(job[1]))
+                elif job[0] == "store":
+                    self._write(job[1], job[2])
+            except Exception:
+                logger.exception("Favicon cache job %s failed", job[0])
+
+    def _read(self, host: str) -> QImage:
+        image = QImage()
+        path = self.path_for(host)
+        if not os.path.exists(path) or not image.load(path):
+            return QImage()
+        side = int(self.ICON_SIZE * self._dpr)
+        if image.width() != side or image.height() != side:
+            image = image.scaled(side, side, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return image
+
+    def _write(self, host: str, image: QImage) -> None:
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        if not image.save(buffer, "PNG"):
+            return
+        payload = bytes(data.data())
+        path = self.path_for(host)
+        try:
+            # Same-site navigations re-announce the same icon; skip the rewrite.
+            with open(path, "rb") as f:
+                if f.read() == payload:
+                    return
+        except OSError:
+            pass
+        write_atomic(path, payload)
+
+
+_favicon_cache: Optional[FaviconCache] = None
+
+
+def get_favicon_cache(directory: Optional[str] = None) -> FaviconCache:
+    global _favicon_cache
+    if _favicon_cache is None:
+        _favicon_cache = FaviconCache(directory, QCoreApplication.instance())
+    return _favicon_cache
+
+
+__all__ = ["FaviconCache", "get_favicon_cache", "favicon_host", "default_favicons_dir"]
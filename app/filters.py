@@ -0,0 +1,407 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable, Optional
+
+
+# Resource type bits used by filter options.
+TYPE_OTHER = 1 << 0
+TYPE_SCRIPT = 1 << 1
+TYPE_IMAGE = 1 << 2
+TYPE_STYLESHEET = 1 << 3
+TYPE_OBJECT = 1 << 4
+TYPE_SUBDOCUMENT = 1 << 5
+TYPE_XMLHTTPREQUEST = 1 << 6
+TYPE_FONT = 1 << 7
+TYPE_MEDIA = 1 << 8
+TYPE_PING = 1 << 9
+TYPE_WEBSOCKET = 1 << 10
+TYPE_ALL = (1 << 11) - 1
+
+TYPE_OPTIONS = {
+    "other": TYPE_OTHER,
+    "script": TYPE_SCRIPT,
+    "image": TYPE_IMAGE,
+    "stylesheet": TYPE_STYLESHEET,
+    "object": TYPE_OBJECT,
+    "object-subrequest": TYPE_OBJECT,
+    "subdocument": TYPE_SUBDOCUMENT,
+    "xmlhttprequest": TYPE_XMLHTTPREQUEST,
+    "font": TYPE_FONT,
+    "media": TYPE_MEDIA,
+    "ping": TYPE_PING,
+    "beacon": TYPE_PING,
+    "websocket": TYPE_WEBSOCKET,
+}
+
+# Options that only matter to cosmetic filtering or popups; rules carrying them never block requests.
+_SKIP_OPTIONS = {"popup", "elemhide", "generichide", "genericblock", "specifichide", "inline-script", "inline-font"}
+
+# Rule tuple fields. Rules are plain tuples so the compiled index pickles compactly.
+R_KIND, R_PATTERN, R_TYPES, R_THIRD_PARTY, R_INCLUDE, R_EXCLUDE, R_IMPORTANT = range(7)
+
+KIND_SUBSTRING = 0
+KIND_REGEX = 1
+
+_TOKEN = re.compile(r"[a-z0-9%]+")
+
+# Public suffixes of more than one label. Sites under them are told apart one label further down,
+# so a.co.uk and b.co.uk (or foo.github.io and bar.github.io) are different parties.
+MULTI_PART_SUFFIXES = frozenset((
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "ltd.uk", "plc.uk", "me.uk", "net.uk", "sch.uk", "nhs.uk",
+    "com.au", "net.au", "org.au", "edu.au", "gov.au", "asn.au", "id.au",
+    "co.nz", "org.nz", "net.nz", "govt.nz", "ac.nz",
+    "co.jp", "ne.jp", "or.jp", "ac.jp", "go.jp", "ad.jp", "ed.jp", "gr.jp", "lg.jp",
+    "co.kr", "or.kr", "ne.kr", "go.kr", "ac.kr",
+    "com.cn", "net.cn", "org.cn", "gov.cn", "edu.cn",
+    "com.hk", "org.hk", "net.hk", "edu.hk", "gov.hk",
+    "com.tw", "org.tw", "net.tw", "edu.tw", "gov.tw",
+    "com.sg", "org.sg", "net.sg", "edu.sg", "gov.sg",
+    "co.in", "net.in", "org.in", "firm.in", "gen.in", "ind.in", "ac.in", "gov.in",
+    "co.id", "or.id", "ac.id", "go.id", "web.id",
+    "com.my", "org.my", "net.my", "edu.my", "gov.my",
+    "com.ph", "org.ph", "net.ph", "com.vn", "net.vn", "org.vn", "co.th", "in.th", "or.th", "ac.th",
+    "com.br", "net.br", "org.br", "gov.br", "edu.br", "com.ar", "org.ar", "net.ar", "gob.ar",
+    "com.mx", "org.mx", "net.mx", "gob.mx", "edu.mx", "com.co", "net.co", "org.co", "gov.co",
+    "com.pe", "org.pe", "com.ve", "com.uy", "com.ec",
+    "co.za", "org.za", "net.za", "gov.za", "ac.za", "co.ke", "or.ke", "com.ng", "org.ng", "com.eg",
+    "co.il", "org.il", "net.il", "ac.il", "gov.il", "com.tr", "org.tr", "net.tr", "gov.tr", "edu.tr",
+    "com.sa", "org.sa", "com.ua", "org.ua", "net.ua", "com.ru", "org.ru", "net.ru", "msk.ru", "spb.ru",
+    "com.pl", "net.pl", "org.pl", "co.at", "or.at", "ac.at", "gv.at", "com.es", "org.es", "nom.es",
+    "com.gr", "com.pt", "co.hu", "co.it", "com.mt", "com.cy",
+    # Hosting platforms that give every customer their own subdomain.
+    "github.io", "gitlab.io", "githubusercontent.com", "blogspot.com", "wordpress.com", "tumblr.com",
+    "herokuapp.com", "appspot.com", "firebaseapp.com", "web.app", "netlify.app", "vercel.app",
+    "pages.dev", "workers.dev", "azurewebsites.net", "cloudfront.net", "s3.amazonaws.com",
+    "fly.dev", "glitch.me", "repl.co", "surge.sh", "now.sh", "onrender.com", "readthedocs.io",
+))
+_SUFFIX_LABELS = max(s.count(".") for s in MULTI_PART_SUFFIXES) + 1
+_SEPARATOR = r"(?:[^a-z0-9_\-.%]|$)"
+
+
+def _parse_options(text: str):
+    types = 0
+    negated = 0
+    third_party = 0
+    include: set[str] = set()
+    exclude: set[str] = set()
+    important = False
+    document = False
+    for opt in text.split(","):
+        opt = opt.strip().lower()
+        if not opt:
+            continue
+        inverse = opt.startswith("~")
+        name = opt[1:] if inverse else opt
+        if name in TYPE_OPTIONS:
+            if inverse:
+                negated |= TYPE_OPTIONS[name]
+            else:
+                types |= TYPE_OPTIONS[name]
+        elif name in ("third-party", "3p"):
+            third_party = -1 if inverse else 1
+        elif name in ("first-party", "1p"):
+            third_party = 1 if inverse else -1
+        elif name.startswith("domain="):
+            for d in opt[len("domain="):].split("|"):
+                if d.startswith("~"):
+                    exclude.add(d[1:])
+                elif d:
+                    include.add(d)
+        elif name == "important":
+            important = True
+        elif name == "document":
+            document = True
+        elif name == "match-case":
+            continue
+        elif name in _SKIP_OPTIONS:
+            return None
+        else:
+            # redirect=, csp=, removeparam= and friends change requests instead of blocking them.
+            return None
+    if types == 0:
+        types = TYPE_ALL & ~negated if negated else TYPE_ALL
+    return types, third_party, frozenset(include) or None, frozenset(exclude) or None, important, document
+
+
+def _pattern_regex(pattern: str, domain_anchor: bool, start_anchor: bool, end_anchor: bool) -> str:
+    parts = []
+    for ch in pattern:
+        if ch == "*":
+            parts.append(".*")
+        elif ch == "^":
+            parts.append(_SEPARATOR)
+        else:
+            parts.append(re.escape(ch))
+    body = "".join(parts)
+    if domain_anchor:
+        body = r"^[a-z][a-z0-9+.\-]*://(?:[^/?#]*\.)?" + body
+    elif start_anchor:
+        body = "^" + body
+    if end_anchor:
+        body += "$"
+    return body
+
+
+def _rule_tokens(pattern: str, domain_anchor: bool, start_anchor: bool, end_anchor: bool) -> list[str]:
+    # A token only indexes a rule when the pattern itself pins both of its ends, so any URL the
+    # rule matches must contain it as a whole URL token.
+    tokens = []
+    for m in _TOKEN.finditer(pattern):
+        start, end = m.span()
+        if start == 0:
+            if not (domain_anchor or start_anchor):
+                continue
+        elif pattern[start - 1] == "*":
+            continue
+        if end == len(pattern):
+            if not end_anchor:
+                continue
+        elif pattern[end] == "*":
+            continue
+        tokens.append(m.group(0))
+    return tokens
+
+
+def parse_filter(line: str):
+    line = line.strip()
+    if not line or line[0] in "![" or "##" in line or "#@#" in line or "#?#" in line or "#$#" in line:
+        return None
+    exception = line.startswith("@@")
+    if exception:
+        line = line[2:]
+
+    options = (TYPE_ALL, 0, None, None, False, False)
+    dollar = line.rfind("$")
+    if dollar >= 0 and not (line.startswith("/") and line.endswith("/")):
+        options = _parse_options(line[dollar + 1:])
+        if options is None:
+            return None
+        line = line[:dollar]
+    types, third_party, include, exclude, important, document = options
+
+    if len(line) > 1 and line.startswith("/") and line.endswith("/"):
+        # Raw regular expression rules are rare and costly to match; they are not supported.
+        return None
+
+    domain_anchor = line.startswith("||")
+    if domain_anchor:
+        line = line[2:]
+    start_anchor = not domain_anchor and line.startswith("|")
+    if start_anchor:
+        line = line[1:]
+    end_anchor = line.endswith("|")
+    if end_anchor:
+        line = line[:-1]
+    pattern = line.lower()
+    while pattern.startswith("*") and not domain_anchor and not start_anchor:
+        pattern = pattern[1:]
+    while pattern.endswith("*") and not end_anchor:
+        pattern = pattern[:-1]
+    if not pattern and not (include or document):
+        return None
+
+    host = None
+    if domain_anchor:
+        m = re.fullmatch(r"([a-z0-9.\-]+)\^?", pattern)
+        if m is not None and "." in m.group(1):
+            host = m.group(1)
+
+    if host is not None:
+        # The host lookup already proves the match; the separator after it always holds.
+        kind, source = KIND_SUBSTRING, ""
+    elif not any(c in pattern for c in "*^") and not (domain_anchor or start_anchor or end_anchor):
+        kind, source = KIND_SUBSTRING, pattern
+    else:
+        kind, source = KIND_REGEX, _pattern_regex(pattern, domain_anchor, start_anchor, end_anchor)
+    rule = (kind, source, types, third_party, include, exclude, important)
+    tokens = _rule_tokens(pattern, domain_anchor, start_anchor, end_anchor)
+    return exception, document, host, rule, tokens
+
+
+def host_suffixes(host: str) -> Iterable[str]:
+    while host:
+        yield host
+        dot = host.find(".")
+        if dot < 0:
+            return
+        host = host[dot + 1:]
+
+
+def _domain_matches(domains: frozenset, host: str) -> bool:
+    for suffix in host_suffixes(host):
+        if suffix in domains:
+            return True
+    return False
+
+
+class _Bucket:
+    # One side (block or allow) of the index: hashed host rules plus token-indexed patterns.
+
+    __slots__ = ("hosts", "tokens", "generic")
+
+    def __init__(self) -> None:
+        self.hosts: dict[str, list] = {}
+        self.tokens: dict[str, list] = {}
+        self.generic: list = []
+
+    def state(self) -> tuple:
+        return self.hosts, self.tokens, self.generic
+
+    @classmethod
+    def from_state(cls, state: tuple) -> "_Bucket":
+        bucket = cls()
+        bucket.hosts, bucket.tokens, bucket.generic = state
+        return bucket
+
+
+class FilterIndex:
+
+    VERSION = 2
+
+    def __init__(self) -> None:
+        self.block = _Bucket()
+        self.allow = _Bucket()
+        self.document_allow: list = []
+        self.rule_count = 0
+        self._compiled: dict[str, re.Pattern] = {}
+
+    @classmethod
+    def compile(cls, lines: Iterable[str]) -> "FilterIndex":
+        parsed = []
+        frequency: dict[str, int] = {}
+        for line in lines:
+            result = parse_filter(line)
+            if result is None:
+                continue
+            parsed.append(result)
+            for token in result[4]:
+                frequency[token] = frequency.get(token, 0) + 1
+
+        index = cls()
+        for exception, document, host, rule, tokens in parsed:
+            index.rule_count += 1
+            if document:
+                if exception:
+                    # Host rules carry no pattern of their own, so the host travels with the rule.
+                    index.document_allow.append((host, rule))
+                continue
+            bucket = index.allow if exception else index.block
+            if host is not None:
+                bucket.hosts.setdefault(host, []).append(rule)
+            elif tokens:
+                # The rarest token keeps buckets short for the URLs that hit them.
+                token = min(tokens, key=lambda t: (frequency[t], -len(t)))
+                bucket.tokens.setdefault(token, []).append(rule)
+            else:
+                bucket.generic.append(rule)
+        return index
+
+    def state(self) -> dict:
+        return {
+            "version": self.VERSION,
+            "block": self.block.state(),
+            "allow": self.allow.state(),
+            "document_allow": self.document_allow,
+            "rule_count": self.rule_count,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> Optional["FilterIndex"]:
+        if not isinstance(state, dict) or state.get("version") != cls.VERSION:
+            return None
+        index = cls()
+        index.block = _Bucket.from_state(state["block"])
+        index.allow = _Bucket.from_state(state["allow"])
+        index.document_allow = state["document_allow"]
+        index.rule_count = state["rule_count"]
+        return index
+
+    def _rule_matches(self, rule, url: str, host: str, type_bit: int, third_party: bool, site: str) -> bool:
+        if not rule[R_TYPES] & type_bit:
+            return False
+        tp = rule[R_THIRD_PARTY]
+        if tp and (tp > 0) != third_party:
+            return False
+        include = rule[R_INCLUDE]
+        if include is not None and not _domain_matches(include, site):
+            return False
+        exclude = rule[R_EXCLUDE]
+        if exclude is not None and _domain_matches(exclude, site):
+            return False
+        if rule[R_KIND] == KIND_SUBSTRING:
+            return rule[R_PATTERN] in url
+        regex = self._compiled.get(rule[R_PATTERN])
+        if regex is None:
+            # Regexes are compiled on first use, so loading 100k rules never pays for all of them.
+            regex = self._compiled[rule[R_PATTERN]] = re.compile(rule[R_PATTERN])
+        return regex.search(url) is not None
+
+    def _match(self, bucket: _Bucket, url: str, tokens: list[str], host: str, type_bit: int,
+               third_party: bool, site: str):
+        hosts = bucket.hosts
+        if hosts:
+            for suffix in host_suffixes(host):
+                rules = hosts.get(suffix)
+                if rules is not None:
+                    for rule in rules:
+                        if self._rule_matches(rule, url, host, type_bit, third_party, site):
+                            return rule
+        index = bucket.tokens
+        for token in tokens:
+            rules = index.get(token)
+            if rules is not None:
+                for rule in rules:
+                    if self._rule_matches(rule, url, host, type_bit, third_party, site):
+                        return rule
+        for rule in bucket.generic:
+            if self._rule_matches(rule, url, host, type_bit, third_party, site):
+                return rule
+        return None
+
+    def should_block(self, url: str, host: str, site: str, type_bit: int, third_party: bool) -> bool:
+        url = url.lower()
+        host = host.lower()
+        tokens = _TOKEN.findall(url)
+        rule = self._match(self.block, url, tokens, host, type_bit, third_party, site)
+        if rule is None:
+            return False
+        if rule[R_IMPORTANT]:
+            return True
+        return self._match(self.allow, url, tokens, host, type_bit, third_party, site) is None
+
+    def page_allowed(self, page_url: str, site: str) -> bool:
+        page_url = page_url.lower()
+        site = site.lower()
+        suffixes = None
+        for host, rule in self.document_allow:
+            if host is not None:
+                if suffixes is None:
+                    suffixes = set(host_suffixes(site))
+                if host not in suffixes:
+                    continue
+            if self._rule_matches(rule, page_url, site, TYPE_ALL, False, site):
+                return True
+        return False
+
+
+def registrable_part(host: str) -> str:
+    # One label below the public suffix; the suffix is the last label unless a longer one is listed.
+    if not host or host[-1].isdigit() or ":" in host:
+        return host  # An IP literal is its own site.
+    parts = host.rsplit(".", _SUFFIX_LABELS + 1)
+    for n in range(min(_SUFFIX_LABELS, len(parts) - 1), 1, -1):
+        if ".".join(parts[-n:]) in MULTI_PART_SUFFIXES:
+            return ".".join(parts[-n - 1:])
+    return ".".join(parts[-2:])
+
+
+def is_third_party(host: str, site: str) -> bool:
+    return registrable_part(host) != registrable_part(site)
+
+
+__all__ = [
+    "FilterIndex", "parse_filter", "is_third_party", "registrable_part", "host_suffixes", "MULTI_PART_SUFFIXES",
+    "TYPE_ALL", "TYPE_OTHER", "TYPE_SCRIPT", "TYPE_IMAGE", "TYPE_STYLESHEET", "TYPE_OBJECT",
+    "TYPE_SUBDOCUMENT", "TYPE_XMLHTTPREQUEST", "TYPE_FONT", "TYPE_MEDIA", "TYPE_PING", "TYPE_WEBSOCKET",
+]
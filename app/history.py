@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QCoreApplication, QObject, QStandardPaths, Signal
+
+
+logger = logging.getLogger(__name__)
+
+RECORDED_SCHEMES = ("http", "https", "file")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    id          INTEGER PRIMARY KEY,
+    url         TEXT NOT NULL UNIQUE,
+    title       TEXT NOT NULL DEFAULT '',
+    visit_count INTEGER NOT NULL DEFAULT 0,
+    typed_count INTEGER NOT NULL DEFAULT 0,
+    last_visit  REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS visits (
+    id         INTEGER PRIMARY KEY,
+    url_id     INTEGER NOT NULL REFERENCES urls(id) ON DELETE CASCADE,
+    visit_time REAL NOT NULL,
+    typed      INTEGER NOT NULL DEFAULT 0
+);
+DROP INDEX IF EXISTS visits_time;
+CREATE INDEX IF NOT EXISTS visits_time_id ON visits(visit_time DESC, id DESC);
+CREATE INDEX IF NOT EXISTS visits_url ON visits(url_id);
+CREATE INDEX IF NOT EXISTS urls_last_visit ON urls(last_visit DESC);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS urls_fts USING fts5(
+    url, title, content='urls', content_rowid='id', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS urls_ai AFTER INSERT ON urls BEGIN
+    INSERT INTO urls_fts(rowid, url, title) VALUES (new.id, new.url, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS urls_ad AFTER DELETE ON urls BEGIN
+    INSERT INTO urls_fts(urls_fts, rowid, url, title) VALUES ('delete', old.id, old.url, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS urls_au AFTER UPDATE OF url, title ON urls BEGIN
+    INSERT INTO urls_fts(urls_fts, rowid, url, title) VALUES ('delete', old.id, old.url, old.title);
+    INSERT INTO urls_fts(rowid, url, title) VALUES (new.id, new.url, new.title);
+END;
+"""
+
+UPSERT_VISIT = """
+INSERT INTO urls(url, title, visit_count, typed_count, last_visit) VALUES (?, ?, 1, ?, ?)
+ON CONFLICT(url) DO UPDATE SET
+    visit_count = visit_count + 1,
+    typed_count = typed_count + excluded.typed_count,
+    last_visit = excluded.last_visit,
+    title = CASE WHEN excluded.title != '' THEN excluded.title ELSE title END
+"""
+INSERT_VISIT = "INSERT INTO visits(url_id, visit_time, typed) SELECT id, ?, ? FROM urls WHERE url = ?"
+UPDATE_TITLE = "UPDATE urls SET title = ? WHERE url = ? AND title != ?"
+
+
+def default_history_path() -> str:
+    base = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    if not base:
+        base = str(Path.home() / ".gbrowser")
+    return os.path.join(base, "history.sqlite")
+
+
+def fts_query(text: str) -> str:
+    # Every whitespace-separated term must match, as a prefix, in the URL or the title.
+    terms = []
+    for raw in text.split():
+        term = "".join(ch for ch in raw if ch.isalnum() or ch in "-_.")
+        term = term.strip("-_.")
+        if term:
+            terms.append('"' + term.replace('"', '""') + '"*')
+    return " ".join(terms)
+
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=5.0, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+@dataclass
+class HistoryEntry:
+    visit_time: float
+    url: str
+    title: str
+    visit_id: int
+
+    @property
+    def cursor(self) -> tuple[float, int]:
+        return self.visit_time, self.visit_id
+
+
+class HistoryStore(QObject):
+
+    visits_committed = Signal(int)
+    cleared = Signal()
+
+    BATCH_SIZE = 500
+    BATCH_WINDOW = 0.25
+
+    def __init__(self, path: Optional[str] = None, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.path = path or default_history_path()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        setup = connect(self.path)
+        setup.executescript(SCHEMA)
+        setup.close()
+
+        self._reader = connect(self.path)
+        self._reader.execute("PRAGMA query_only=ON")
+
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+
+    def record_visit(self, url: str, title: str = "", typed: bool = False) -> None:
+        if not url or url.split(":", 1)[0].lower() not in RECORDED_SCHEMES:
+            return
+        self._queue.put(("visit", url, title or "", time.time(), 1 if typed else 0))
+
+    def update_title(self, url: str, title: str) -> None:
+        if url and title:
+            self._queue.put(("title", url, title))
+
+    def clear(self) -> None:
+        self._queue.put(("clear",))
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5.0)
+        try:
+            self._reader.close()
+        except Exception:
+            pass
+
+    def _run(self) -> None:
+        conn = connect(self.path)
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.BATCH_WINDOW
+            while len(batch) < self.BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            try:
+                self._apply(conn, batch)
+            except Exception:
+                logger.exception("Failed to write %d history records", len(batch))
+        conn.close()
+
+    def _apply(self, conn: sqlite3.Connection, batch: list) -> None:
+        visits = 0
+        cleared = False
+        conn.execute("BEGIN")
+        try:
+            for op in batch:
+                kind = op[0]
+                if kind == "visit":
+                    _, url, title, ts, typed = op
+                    conn.execute(UPSERT_VISIT, (url, title, typed, ts))
+                    conn.execute(INSERT_VISIT, (ts, typed, url))
+                    visits += 1
+                elif kind == "title":
+                    _, url, title = op
+                    conn.execute(UPDATE_TITLE, (title, url, title))
+                elif kind == "clear":
+                    conn.execute("DELETE FROM visits")
+                    conn.execute("DELETE FROM urls")
+                    cleared = True
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if cleared:
+            self.cleared.emit()
+        if visits:
+            self.visits_committed.emit(visits)
+
+    def page(self, query: str = "", before: Optional[tuple[float, int]] = None,
+             limit: int = 200) -> list[HistoryEntry]:
+        # Keyset pagination keeps every page O(limit), however deep the scroll. The key is
+        # (visit_time, id): visits sharing a timestamp must not be skipped at a page boundary.
+        visit_time, visit_id = before if before is not None else (float("inf"), 0)
+        match = fts_query(query)
+        if match:
+            sql = (
+                "SELECT v.visit_time, u.url, u.title, v.id FROM visits v JOIN urls u ON u.id = v.url_id "
+                "WHERE v.url_id IN (SELECT rowid FROM urls_fts WHERE urls_fts MATCH ?) "
+                "AND (v.visit_time, v.id) < (?, ?) ORDER BY v.visit_time DESC, v.id DESC LIMIT ?"
+            )
+            params = (match, visit_time, visit_id, limit)
+        elif query.strip():
+            return []
+        else:
+            sql = (
+                "SELECT v.visit_time, u.url, u.title, v.id FROM visits v JOIN urls u ON u.id = v.url_id "
+                "WHERE (v.visit_time, v.id) < (?, ?) ORDER BY v.visit_time DESC, v.id DESC LIMIT ?"
+            )
+            params = (visit_time, visit_id, limit)
+        try:
+            rows = self._reader.execute(sql, params).fetchall()
+        except sqlite3.Error:
+            logger.exception("History query failed: %r", query)
+            return []
+        return [HistoryEntry(*row) for row in rows]
+
+    def search_pages(self, query: str, limit: int = 20) -> list[tuple[str, str, int, int, float]]:
+        match = fts_query(query)
+        if not match:
+            return []
+        sql = (
+            "SELECT u.url, u.title, u.visit_count, u.typed_count, u.last_visit FROM urls_fts f "
+            "JOIN urls u ON u.id = f.rowid WHERE urls_fts MATCH ? ORDER BY bm25(urls_fts) LIMIT ?"
+        )
+        try:
+            return self._reader.execute(sql, (match, limit)).fetchall()
+        except sqlite3.Error:
+            logger.exception("History search failed: %r", query)
+            return []
+
+
+_history_store: Optional[HistoryStore] = None
+
+
+def get_history_store(path: Optional[str] = None) -> HistoryStore:
+    # One writer thread and one database connection for every window.
+    global _history_store
+    if _history_store is None:
+        _history_store = HistoryStore(path, QCoreApplication.instance())
+    return _history_store
+
+
+__all__ = ["HistoryStore", "HistoryEntry", "default_history_path", "fts_query", "get_history_store"]
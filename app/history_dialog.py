@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Optional
+
+from PySide6.QtCore import Qt, QUrl, Signal, QTimer, QModelIndex, QAbstractTableModel
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QTableView, QPushButton,
+    QHeaderView, QAbstractItemView, QMessageBox, QWidget
+)
+
+from app.history import HistoryStore, HistoryEntry
+
+
+class HistoryModel(QAbstractTableModel):
+
+    PAGE_SIZE = 200
+    HEADERS = ("Visited", "Title", "URL")
+
+    def __init__(self, store: HistoryStore, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._store = store
+        self._query = ""
+        self._entries: list[HistoryEntry] = []
+        self._exhausted = False
+
+    def set_query(self, query: str) -> None:
+        self.beginResetModel()
+        self._query = query
+        self._entries = []
+        self._exhausted = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def reload(self) -> None:
+        self.set_query(self._query)
+
+    def entry(self, row: int) -> Optional[HistoryEntry]:
+        return self._entries[row] if 0 <= row < len(self._entries) else None
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._entries)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if parent.isValid() or self._exhausted:
+            return
+        before = self._entries[-1].cursor if self._entries else None
+        page = self._store.page(self._query, before=before, limit=self.PAGE_SIZE)
+        if len(page) < self.PAGE_SIZE:
+            self._exhausted = True
+        if not page:
+            return
+        start = len(self._entries)
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self._entries.extend(page)
+        self.endInsertRows()
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole) -> Any:
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        e = self.entry(index.row()) if index.isValid() else None
+        if e is None:
+            return None
+        if role == Qt.DisplayRole:
+            col = index.column()
+            if col == 0:
+                return time.strftime("%Y-%m-%d %H:%M", time.localtime(e.visit_time))
+            if col == 1:
+                return e.title or e.url
+            return e.url
+        if role == Qt.ToolTipRole:
+            return e.url
+        return None
+
+
+class HistoryDialog(QDialog):
+
+    open_url_requested = Signal(QUrl)
+
+    SEARCH_DELAY_MS = 200
+
+    def __init__(self, store: HistoryStore, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("History")
+        self.resize(900, 600)
+        self._store = store
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 12, 12, 12)
+        layout.setSpacing(8)
+
+        top = QHBoxLayout()
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("Search history")
+        self.search.setClearButtonEnabled(True)
+        self.clear_btn = QPushButton("Clear history")
+        top.addWidget(self.search, 1)
+        top.addWidget(self.clear_btn)
+        layout.addLayout(top)
+
+        self.model = HistoryModel(store, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setShowGrid(False)
+        self.table.verticalHeader().hide()
+        self.table.verticalHeader().setDefaultSectionSize(24)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        header.setSectionResizeMode(2, QHeaderView.Stretch)
+        layout.addWidget(self.table, 1)
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(lambda: self.model.set_query(self.search.text()))
+
+        self.search.textChanged.connect(lambda _: self._search_timer.start())
+        self.table.doubleClicked.connect(self._on_activated)
+        self.clear_btn.clicked.connect(self._on_clear)
+        store.cleared.connect(self.model.reload)
+        self.model.fetchMore()
+
+    def _on_activated(self, index: QModelIndex) -> None:
+        e = self.model.entry(index.row())
+        if e is not None:
+            self.open_url_requested.emit(QUrl(e.url))
+
+    def _on_clear(self) -> None:
+        answer = QMessageBox.question(self, "Clear history", "Delete all browsing history?")
+        if answer == QMessageBox.Yes:
+            self._store.clear()
+
+
+__all__ = ["HistoryDialog", "HistoryModel"]
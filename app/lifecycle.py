@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWebEngineCore import QWebEnginePage
+
+
+LifecycleState = QWebEnginePage.LifecycleState
+
+# Used when the renderer RSS cannot be read (non-Linux, sandboxed /proc, ...).
+ESTIMATED_RENDERER_MB = 150
+
+
+@dataclass
+class LifecyclePolicy:
+    enabled: bool = True
+    freeze_after_min: int = 5
+    discard_after_min: int = 30
+    memory_budget_mb: int = 2048
+
+
+def renderer_rss_mb(pid: int) -> Optional[float]:
+    if pid <= 0:
+        return None
+    try:
+        with open(f"/proc/{pid}/statm", "r", encoding="ascii") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class TabLifecycleManager(QObject):
+
+    state_changed = Signal(object, object)
+
+    CHECK_INTERVAL_MS = 10_000
+
+    def __init__(self, tab_manager, policy: Optional[LifecyclePolicy] = None) -> None:
+        super().__init__(tab_manager)
+        self._tabs = tab_manager
+        self._current = None
+        self.policy = policy or LifecyclePolicy()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.CHECK_INTERVAL_MS)
+        self._timer.timeout.connect(self.evaluate)
+        self._timer.start()
+
+    def set_policy(self, policy: LifecyclePolicy) -> None:
+        self.policy = policy
+        self.evaluate()
+
+    def activate(self, tab) -> None:
+        now = time.monotonic()
+        if self._current is not None and self._current is not tab:
+            self._current.last_active = now
+        self._current = tab
+        if tab is None:
+            return
+        tab.last_active = now
+        if tab.lifecycle_state() != LifecycleState.Active:
+            # Discarded pages reload from their saved history on the way back to Active.
+            self._set_state(tab, LifecycleState.Active)
+
+    def forget(self, tab) -> None:
+        if self._current is tab:
+            self._current = None
+
+    def freeze(self, tab) -> bool:
+        if tab is self._current or tab.lifecycle_state() != LifecycleState.Active:
+            return False
+        return self._set_state(tab, LifecycleState.Frozen)
+
+    def discard(self, tab) -> bool:
+        if tab is self._current or tab.lifecycle_state() == LifecycleState.Discarded:
+            return False
+        return self._set_state(tab, LifecycleState.Discarded)
+
+    def evaluate(self) -> None:
+        if not self.policy.enabled:
+            return
+
+        now = time.monotonic()
+        freeze_after = self.policy.freeze_after_min * 60
+        discard_after = self.policy.discard_after_min * 60
+
+        background = [t for t in self._tabs.browser_tabs() if t is not self._current]
+        for tab in background:
+            if self._is_pinned_by_page(tab):
+                continue
+            idle = now - tab.last_active
+            if discard_after > 0 and idle >= discard_after:
+                self.discard(tab)
+            elif freeze_after > 0 and idle >= freeze_after:
+                self.freeze(tab)
+
+        self._enforce_memory_budget(background)
+
+    def memory_usage_mb(self) -> float:
+        return sum(self._renderer_usage().values())
+
+    def _renderer_usage(self) -> dict[int, float]:
+        usage: dict[int, float] = {}
+        for tab in self._tabs.browser_tabs():
+            if tab.lifecycle_state() == LifecycleState.Discarded:
+                continue
+            pid = tab.render_process_pid()
+            key = pid if pid > 0 else -id(tab)
+            if key in usage:
+                continue
+            rss = renderer_rss_mb(pid)
+            usage[key] = rss if rss is not None else ESTIMATED_RENDERER_MB
+        return usage
+
+    def _enforce_memory_budget(self, background: list) -> None:
+        budget = self.policy.memory_budget_mb
+        if budget <= 0:
+            return
+
+        usage = self._renderer_usage()
+        total = sum(usage.values())
+        if total <= budget:
+            return
+
+        sharing: dict[int, int] = {}
+        for tab in self._tabs.browser_tabs():
+            if tab.lifecycle_state() != LifecycleState.Discarded:
+                pid = tab.render_process_pid()
+                sharing[pid] = sharing.get(pid, 0) + 1
+
+        candidates = sorted(
+            (t for t in background
+             if t.lifecycle_state() != LifecycleState.Discarded and not self._is_pinned_by_page(t)),
+            key=lambda t: t.last_active,
+        )
+        for tab in candidates:
+            if total <= budget:
+                break
+            pid = tab.render_process_pid()
+            key = pid if pid > 0 else -id(tab)
+            share = usage.get(key, ESTIMATED_RENDERER_MB) / max(1, sharing.get(pid, 1))
+            if self.discard(tab):
+                total -= share
+
+    def _is_pinned_by_page(self, tab) -> bool:
+        page = tab.page()
+        try:
+            return page is not None and page.recentlyAudible()
+        except Exception:
+            return False
+
+    def _set_state(self, tab, state) -> bool:
+        page = tab.page()
+        if page is None:
+            return False
+        try:
+            page.setLifecycleState(state)
+        except Exception:
+            return False
+        self.state_changed.emit(tab, state)
+        return True
+
+
+__all__ = ["LifecyclePolicy", "TabLifecycleManager", "renderer_rss_mb"]
@@ -0,0 +1,552 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import queue
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import islice
+from operator import itemgetter
+from typing import Callable, Iterable, Optional
+
+from PySide6.QtCore import Qt, QCoreApplication, QObject, QEvent, QPoint, QTimer, Signal
+from PySide6.QtWidgets import QListWidget, QListWidgetItem, QLineEdit, QAbstractItemView
+
+from app.history import RECORDED_SCHEMES, HistoryStore
+
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[\W_]+")
+_SCHEME_RE = re.compile(r"^[a-z][a-z0-9+.-]*://(www\.)?")
+
+DAY = 24 * 60 * 60
+
+
+def strip_scheme(url: str) -> str:
+    return _SCHEME_RE.sub("", url.lower(), count=1)
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.split(text.lower()) if t]
+
+
+def frecency(visits: int, typed: int, last_visit: float, now: float) -> float:
+    # Visit counts weighted by recency buckets, with typed visits counting extra.
+    age = now - last_visit
+    if age < 4 * DAY:
+        weight = 100
+    elif age < 14 * DAY:
+        weight = 70
+    elif age < 31 * DAY:
+        weight = 50
+    elif age < 90 * DAY:
+        weight = 30
+    else:
+        weight = 10
+    return (visits + 4 * typed) * weight
+
+
+@dataclass
+class Suggestion:
+    url: str
+    title: str
+    score: float
+    tab_id: int = 0
+
+
+# Entries are plain tuples of atoms: the garbage collector untracks those, so a
+# half-million-row index adds nothing to collection pauses on the UI thread.
+URL, TITLE, VISITS, TYPED, LAST_VISIT, TEXT, HOST, SCORE, TAB_ID = range(9)
+
+
+def make_entry(url: str, title: str, visits: int, typed: int, last_visit: float,
+               now: float, tab_id: int = 0) -> tuple:
+    title = title or ""
+    host = strip_scheme(url)
+    return (url, title, visits, typed, last_visit, host + " " + title.lower(), host,
+            frecency(visits, typed, last_visit, now), tab_id)
+
+
+def index_tokens(entry: tuple) -> set[str]:
+    site, _, path = entry[HOST].partition("/")
+    tokens = tokenize(site)
+    tokens += tokenize(path)[:3]
+    tokens += tokenize(entry[TITLE])
+    found = {t for t in tokens if len(t) > 1 and not t.isdigit()}
+    found.add(site)
+    return found
+
+
+def merged_rows(snapshot: tuple[list[tuple], dict[str, tuple]]) -> list[tuple[str, str, int, int, float]]:
+    entries, delta = snapshot
+    merged = {e[URL]: e for e in entries}
+    merged.update(delta)
+    return [e[:LAST_VISIT + 1] for e in merged.values()]
+
+
+class SuggestionIndex:
+
+    SHORT_PREFIX = 2
+    SHORT_TOP = 64
+    GATHER_LIMIT = 8000
+    SCAN_LIMIT = 64
+    SCAN_BUDGET = 2000
+    DELTA_LIMIT = 5000
+
+    def __init__(self) -> None:
+        self._entries: list[tuple] = []
+        self._by_url: dict[str, int] = {}
+        self._postings: dict[str, array] = {}
+        self._tokens: list[str] = []
+        self._counts = array("Q", [0])
+        self._short: dict[str, array] = {}
+        self._delta: dict[str, tuple] = {}
+        self._tabs: list[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._delta)
+
+    def build(self, rows: Iterable[tuple[str, str, int, int, float]], now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        entries = [make_entry(url, title, visits, typed, last, now) for url, title, visits, typed, last in rows]
+        # Entry ids are frecency ranks, so every posting list is already in result order.
+        entries.sort(key=itemgetter(SCORE), reverse=True)
+
+        postings: dict[str, array] = {}
+        for eid, e in enumerate(entries):
+            for tok in index_tokens(e):
+                p = postings.get(tok)
+                if p is None:
+                    p = postings[tok] = array("I")
+                p.append(eid)
+
+        tokens = sorted(postings)
+        counts = array("Q", [0])
+        total = 0
+        for tok in tokens:
+            total += len(postings[tok])
+            counts.append(total)
+
+        # One- and two-letter prefixes keep only their best-ranked ids. Each is taken from the heads
+        # of the posting lists in its token range, not by visiting every (entry, token) pair.
+        short: dict[str, array] = {}
+        for n in range(1, self.SHORT_PREFIX + 1):
+            lo = 0
+            while lo < len(tokens):
+                prefix = tokens[lo][:n]
+                if len(prefix) < n:
+                    lo += 1
+                    continue
+                hi = bisect_left(tokens, prefix + "\uffff", lo)
+                ids: set[int] = set()
+                for tok in tokens[lo:hi]:
+                    ids.update(postings[tok][:self.SHORT_TOP])
+                short[prefix] = array("I", heapq.nsmallest(self.SHORT_TOP, ids))
+                lo = hi
+
+        self._entries = entries
+        self._by_url = {e[URL]: i for i, e in enumerate(entries)}
+        self._postings = postings
+        self._tokens = tokens
+        self._counts = counts
+        self._short = short
+        self._delta = {}
+
+    def rows(self) -> list[tuple[str, str, int, int, float]]:
+        return merged_rows(self.snapshot())
+
+    def snapshot(self) -> tuple[list[tuple], dict[str, tuple]]:
+        # build() replaces the entry list rather than mutating it, so it can be read from another thread.
+        return self._entries, dict(self._delta)
+
+    def needs_rebuild(self) -> bool:
+        return len(self._delta) > self.DELTA_LIMIT
+
+    def add_visit(self, url: str, title: str, typed: bool, ts: float) -> None:
+        # Fresh visits land in a small overlay that is scanned linearly until the next rebuild.
+        old = self._delta.get(url)
+        if old is None:
+            eid = self._by_url.get(url)
+            old = self._entries[eid] if eid is not None else None
+        visits = old[VISITS] + 1 if old else 1
+        typed_count = (old[TYPED] if old else 0) + (1 if typed else 0)
+        title = title or (old[TITLE] if old else "")
+        self._delta[url] = make_entry(url, title, visits, typed_count, ts, ts)
+
+    def update_title(self, url: str, title: str) -> None:
+        e = self._delta.get(url)
+        if e is not None:
+            self._delta[url] = make_entry(url, title, e[VISITS], e[TYPED], e[LAST_VISIT], e[LAST_VISIT])
+
+    def set_tabs(self, tabs: list[tuple[int, str, str]]) -> None:
+        now = time.time()
+        self._tabs = [make_entry(url, title, 0, 0, now, now, tab_id) for tab_id, url, title in tabs if url]
+
+    def _range(self, key: str) -> tuple[int, int]:
+        lo = bisect_left(self._tokens, key)
+        return lo, bisect_left(self._tokens, key + "\uffff", lo)
+
+    def _estimate(self, key: str, complete: bool) -> int:
+        if complete:
+            return len(self._postings.get(key, ()))
+        lo, hi = self._range(key)
+        return self._counts[hi] - self._counts[lo]
+
+    def _candidate_ids(self, key: str, complete: bool) -> Iterable[int]:
+        # A token followed by a separator in the typed text is finished and matched exactly;
+        # only the token still being typed is treated as a prefix.
+        if complete and key in self._postings:
+            return self._postings[key]
+        if len(key) <= self.SHORT_PREFIX:
+            return self._short.get(key, ())
+        lo, hi = self._range(key)
+        if hi - lo == 1:
+            return self._postings[self._tokens[lo]]
+        total = self._counts[hi] - self._counts[lo]
+        # Common prefixes match a large share of the index, so walking it in rank order finds hits fastest.
+        # Gathering only pays off when that walk would run out of budget before reaching SCAN_LIMIT hits.
+        dense = total * self.SCAN_BUDGET >= 2 * self.SCAN_LIMIT * len(self._entries)
+        if total > self.GATHER_LIMIT or dense:
+            return range(len(self._entries))
+        # Posting lists are in rank order, so only the head of each can reach the scanned part.
+        budget = self.SCAN_BUDGET
+        ids: set[int] = set()
+        for tok in self._tokens[lo:hi]:
+            ids.update(self._postings[tok][:budget])
+        return sorted(ids)[:budget]
+
+    def _keys(self, needles: list[str]) -> list[tuple[str, bool]]:
+        keys = []
+        for i, n in enumerate(needles):
+            site, slash, _ = n.partition("/")
+            if slash and site:
+                keys.append((site, True))
+            toks = tokenize(n)
+            # Earlier terms are finished; so is the last one once a separator follows it.
+            done = i < len(needles) - 1 or not n[-1].isalnum()
+            keys += [(tok, done or j < len(toks) - 1) for j, tok in enumerate(toks)]
+        return keys
+
+    def query(self, text: str, limit: int = 8) -> list[Suggestion]:
+        needles = [n for n in (strip_scheme(t) for t in text.split()) if n]
+        keys = self._keys(needles)
+        if not keys:
+            return []
+        long_keys = [k for k in keys if k[1] or len(k[0]) > self.SHORT_PREFIX]
+        if long_keys:
+            key, complete = min(long_keys, key=lambda k: self._estimate(*k))
+        else:
+            key, complete = max(keys, key=lambda k: len(k[0]))
+
+        candidates: list[tuple] = []
+        entries, delta = self._entries, self._delta
+        for eid in islice(self._candidate_ids(key, complete), self.SCAN_BUDGET):
+            e = entries[eid]
+            haystack = e[TEXT]
+            for n in needles:
+                if n not in haystack:
+                    break
+            else:
+                if e[URL] not in delta:
+                    candidates.append(e)
+                    if len(candidates) >= self.SCAN_LIMIT:
+                        break
+
+        def matching(pool: Iterable[tuple]) -> list[tuple]:
+            # Runs over every overlay row and open tab on each keystroke; a plain loop, not all() over a generator.
+            found = []
+            for e in pool:
+                haystack = e[TEXT]
+                for n in needles:
+                    if n not in haystack:
+                        break
+                else:
+                    found.append(e)
+            return found
+
+        candidates += matching(delta.values())
+        tabs = matching(self._tabs)
+
+        first = needles[0]
+        best: dict[str, tuple[float, tuple]] = {}
+        for e in candidates:
+            boost = 4.0 if e[HOST].startswith(first) else 1.0
+            score = e[SCORE] * boost
+            if score > best.get(e[URL], (-1.0, None))[0]:
+                best[e[URL]] = (score, e)
+        for e in tabs:
+            # Open tabs win over history rows for the same URL.
+            prior = best.get(e[URL])
+            score = (prior[0] if prior else 0.0) + 1000.0
+            best[e[URL]] = (score, e)
+
+        ranked = heapq.nlargest(limit, best.values(), key=itemgetter(0))
+        return [Suggestion(e[URL], e[TITLE], score, e[TAB_ID]) for score, e in ranked]
+
+
+class OmniboxEngine(QObject):
+
+    suggestions_ready = Signal(int, list)
+
+    ROW_LIMIT = 500_000
+    TABS_DELAY_MS = 500
+
+    def __init__(self, history_path: Optional[str] = None,
+                 tabs_snapshot: Optional[Callable[[], list[tuple[int, str, str]]]] = None,
+                 parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._history_path = history_path
+        self._tabs_snapshot = tabs_snapshot
+        self._index = SuggestionIndex()
+        self._queue: queue.Queue = queue.Queue()
+        self._seq = 0
+        # Worker-thread state for background rebuilds: ops that arrive while a replacement index
+        # is being built are replayed onto it before it is swapped in.
+        self._generation = 0
+        self._building = False
+        self._replay: list[tuple] = []
+        self._tabs: list[tuple[int, str, str]] = []
+
+        self._tabs_timer = QTimer(self)
+        self._tabs_timer.setSingleShot(True)
+        self._tabs_timer.setInterval(self.TABS_DELAY_MS)
+        self._tabs_timer.timeout.connect(self._push_tabs)
+
+        self._thread = threading.Thread(target=self._run, name="omnibox-index", daemon=True)
+        self._thread.start()
+        self.reload()
+
+    def reload(self) -> None:
+        self._queue.put(("load",))
+
+    def query(self, text: str) -> int:
+        self._seq += 1
+        self._queue.put(("query", self._seq, text))
+        return self._seq
+
+    def latest_seq(self) -> int:
+        return self._seq
+
+    def note_visit(self, url: str, title: str = "", typed: bool = False) -> None:
+        if url and url.split(":", 1)[0].lower() in RECORDED_SCHEMES:
+            self._queue.put(("visit", url, title, typed, time.time()))
+
+    def note_title(self, url: str, title: str) -> None:
+        self._queue.put(("title", url, title))
+
+    def set_open_tabs(self, tabs: list[tuple[int, str, str]]) -> None:
+        self._queue.put(("tabs", tabs))
+
+    def schedule_tabs_update(self, *args) -> None:
+        if self._tabs_snapshot is not None and not self._tabs_timer.isActive():
+            self._tabs_timer.start()
+
+    def _push_tabs(self) -> None:
+        try:
+            self.set_open_tabs(self._tabs_snapshot())
+        except Exception:
+            logger.exception("Failed to snapshot open tabs")
+
+    def close(self) -> None:
+        self._tabs_timer.stop()
+        self._queue.put(None)
+        self._thread.join(timeout=2.0)
+
+    def _load_rows(self) -> list[tuple[str, str, int, int, float]]:
+        if not self._history_path:
+            return []
+        try:
+            conn = sqlite3.connect(self._history_path, timeout=5.0)
+            try:
+                return conn.execute(
+                    "SELECT url, title, visit_count, typed_count, last_visit FROM urls "
+                    "ORDER BY last_visit DESC LIMIT ?", (self.ROW_LIMIT,)
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            logger.exception("Failed to load history for suggestions")
+            return []
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            # Drain whatever piled up; only the newest query is still worth answering.
+            pending = [item]
+            while True:
+                try:
+                    pending.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            last_query = None
+            for op in pending:
+                if op is None:
+                    return
+                kind = op[0]
+                if kind == "query":
+                    last_query = op
+                elif kind in ("visit", "title"):
+                    self._apply(self._index, op)
+                    if self._building:
+                        self._replay.append(op)
+                elif kind == "tabs":
+                    self._tabs = op[1]
+                    self._index.set_tabs(op[1])
+                elif kind == "load":
+                    # Whatever the old index holds may just have been cleared; answer from nothing until
+                    # the stored history is indexed.
+                    self._index = SuggestionIndex()
+                    self._index.set_tabs(self._tabs)
+                    self._start_build(self._load_rows)
+                elif kind == "built":
+                    self._swap(op[1], op[2])
+            if last_query is not None:
+                _, seq, text = last_query
+                try:
+                    results = self._index.query(text)
+                except Exception:
+                    logger.exception("Suggestion query failed: %r", text)
+                    results = []
+                self.suggestions_ready.emit(seq, results)
+            if not self._building and self._index.needs_rebuild():
+                snapshot = self._index.snapshot()
+                self._start_build(lambda: merged_rows(snapshot))
+
+    @staticmethod
+    def _apply(index: SuggestionIndex, op: tuple) -> None:
+        if op[0] == "visit":
+            index.add_visit(*op[1:])
+        else:
+            index.update_title(*op[1:])
+
+    def _start_build(self, rows: Callable[[], list[tuple[str, str, int, int, float]]]) -> None:
+        # Building half a million entries takes seconds; queries keep using the current index meanwhile.
+        self._generation += 1
+        self._building = True
+        self._replay = []
+        generation = self._generation
+
+        def _build() -> None:
+            index = SuggestionIndex()
+            try:
+                index.build(rows())
+            except Exception:
+                logger.exception("Failed to build the suggestion index")
+                index = None
+            self._queue.put(("built", generation, index))
+
+        threading.Thread(target=_build, name="omnibox-build", daemon=True).start()
+
+    def _swap(self, generation: int, index: Optional[SuggestionIndex]) -> None:
+        if generation != self._generation:
+            return
+        self._building = False
+        replay, self._replay = self._replay, []
+        if index is None:
+            return
+        for op in replay:
+            self._apply(index, op)
+        index.set_tabs(self._tabs)
+        self._index = index
+
+
+_omnibox_engine: Optional[OmniboxEngine] = None
+
+
+def get_omnibox_engine(history: Optional[HistoryStore] = None,
+                       tabs_snapshot: Optional[Callable[[], list[tuple[int, str, str]]]] = None) -> OmniboxEngine:
+    # Shared by every window: one suggestion index, kept in step with the one history store.
+    global _omnibox_engine
+    if _omnibox_engine is None:
+        _omnibox_engine = OmniboxEngine(history.path if history is not None else None, tabs_snapshot,
+                                        QCoreApplication.instance())
+        if history is not None:
+            history.cleared.connect(_omnibox_engine.reload)
+    return _omnibox_engine
+
+
+class OmniboxPopup(QListWidget):
+
+    suggestion_activated = Signal(object)
+
+    def __init__(self, line_edit: QLineEdit, engine: OmniboxEngine) -> None:
+        super().__init__(line_edit)
+        self._edit = line_edit
+        self._engine = engine
+        self._suggestions: list[Suggestion] = []
+
+        self.setWindowFlags(Qt.ToolTip | Qt.FramelessWindowHint)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setObjectName("omnibox_popup")
+
+        line_edit.textEdited.connect(self._on_text_edited)
+        line_edit.returnPressed.connect(self.hide)
+        line_edit.installEventFilter(self)
+        engine.suggestions_ready.connect(self._on_suggestions)
+        self.itemClicked.connect(lambda item: self._activate(self.row(item)))
+
+    def _on_text_edited(self, text: str) -> None:
+        if text.strip():
+            self._engine.query(text)
+        else:
+            self.hide()
+
+    def _on_suggestions(self, seq: int, suggestions: list) -> None:
+        # Answers to superseded keystrokes are dropped.
+        if seq != self._engine.latest_seq() or not self._edit.hasFocus():
+            return
+        self._suggestions = suggestions
+        self.clear()
+        if not suggestions:
+            self.hide()
+            return
+        for s in suggestions:
+            label = f"⇥ Switch to tab: {s.title or s.url}" if s.tab_id else (s.title or s.url)
+            item = QListWidgetItem(f"{label}\n{s.url}")
+            item.setToolTip(s.url)
+            self.addItem(item)
+        row_h = self.sizeHintForRow(0) if self.count() else 36
+        self.setFixedSize(self._edit.width(), min(8, self.count()) * row_h + 10)
+        self.move(self._edit.mapToGlobal(QPoint(0, self._edit.height() + 2)))
+        self.show()
+
+    def _activate(self, row: int) -> None:
+        if 0 <= row < len(self._suggestions):
+            self.hide()
+            self.suggestion_activated.emit(self._suggestions[row])
+
+    def eventFilter(self, obj, event) -> bool:
+        if obj is self._edit and self.isVisible():
+            if event.type() == QEvent.KeyPress:
+                key = event.key()
+                if key in (Qt.Key_Down, Qt.Key_Up):
+                    step = 1 if key == Qt.Key_Down else -1
+                    row = max(-1, min(self.count() - 1, self.currentRow() + step))
+                    self.setCurrentRow(row)
+                    if row >= 0:
+                        self._edit.setText(self._suggestions[row].url)
+                    return True
+                if key in (Qt.Key_Return, Qt.Key_Enter) and self.currentRow() >= 0:
+                    self._activate(self.currentRow())
+                    return True
+                if key == Qt.Key_Escape:
+                    self.hide()
+                    return True
+            elif event.type() == QEvent.FocusOut:
+                self.hide()
+        return super().eventFilter(obj, event)
+
+
+__all__ = [
+    "SuggestionIndex", "Suggestion", "OmniboxEngine", "OmniboxPopup", "frecency", "merged_rows", "get_omnibox_engine",
+]
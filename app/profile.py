@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QCoreApplication, QObject, QStandardPaths, Signal
+from PySide6.QtWebEngineCore import (
+    QWebEngineDownloadRequest, QWebEnginePage, QWebEngineProfile, QWebEngineSettings
+)
+
+from app.archive import OfflineArchive, SCHEME as ARCHIVE_SCHEME
+from app.browser_view import BrowserView
+from app.content_blocker import ContentBlocker
+from app.speculation import SpeculationEngine
+from app.downloads import DownloadManager
+
+CACHE_TYPES = {
+    "Disk": QWebEngineProfile.HttpCacheType.DiskHttpCache,
+    "Memory": QWebEngineProfile.HttpCacheType.MemoryHttpCache,
+    "None": QWebEngineProfile.HttpCacheType.NoCache,
+}
+
+
+def default_storage_path() -> str:
+    base = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    if not base:
+        base = str(Path.home() / ".gbrowser")
+    return os.path.join(base, "profile")
+
+
+def _dir_usage(path: str) -> tuple[int, int]:
+    total = files = 0
+    stack = [path]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+                        files += 1
+                except OSError:
+                    continue
+    return total, files
+
+
+class ProfileManager(QObject):
+
+    download_requested = Signal(object)
+    cache_stats_ready = Signal(int, int)
+
+    def __init__(self, storage_path: Optional[str] = None, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.storage_path = storage_path or default_storage_path()
+        os.makedirs(self.storage_path, exist_ok=True)
+
+        # A named profile is persistent: cookies, local storage and the HTTP cache survive restarts.
+        self.profile = QWebEngineProfile("GBrowser", self)
+        self.profile.setPersistentStoragePath(self.storage_path)
+        self.profile.setCachePath(os.path.join(self.storage_path, "cache"))
+        self.profile.setPersistentCookiesPolicy(QWebEngineProfile.PersistentCookiesPolicy.AllowPersistentCookies)
+
+        s = self.profile.settings()
+        try:
+            s.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, True)
+            s.setAttribute(QWebEngineSettings.WebAttribute.LocalStorageEnabled, True)
+            s.setAttribute(QWebEngineSettings.WebAttribute.PluginsEnabled, False)
+        except Exception:
+            pass
+
+        self.downloads = DownloadManager(parent=self)
+
+        # Filter lists are read or compiled off the GUI thread; requests pass until the index is ready.
+        self.content_blocker = ContentBlocker(parent=self)
+        self.profile.setUrlRequestInterceptor(self.content_blocker.interceptor)
+        self.content_blocker.load()
+
+        self.speculation = SpeculationEngine(self.profile, parent=self)
+
+        self.archive = OfflineArchive(parent=self)
+        self.profile.installUrlSchemeHandler(ARCHIVE_SCHEME.encode("ascii"), self.archive.scheme_handler)
+        self.archive.load()
+
+        # Profile-level signals are connected here and nowhere else, so each fires one handler.
+        self.profile.downloadRequested.connect(self._on_download_requested)
+        # clearHttpCache() only starts the clear; the size is worth measuring once it is done.
+        self.profile.clearHttpCacheCompleted.connect(self.request_cache_stats)
+
+    def create_page(self, parent: Optional[QObject] = None) -> QWebEnginePage:
+        return QWebEnginePage(self.profile, parent)
+
+    def create_view(self, parent=None) -> BrowserView:
+        view = BrowserView(parent, profile=self.profile)
+        view.link_hovered.connect(self.speculation.hover)
+        view.save_page_requested.connect(self.archive.save_page)
+        return view
+
+    def apply_cache_settings(self, cache_type: str, max_size_mb: int) -> None:
+        self.profile.setHttpCacheType(CACHE_TYPES.get(cache_type, QWebEngineProfile.HttpCacheType.DiskHttpCache))
+        # 0 lets Chromium pick a size based on free disk space.
+        self.profile.setHttpCacheMaximumSize(max(0, max_size_mb) * 1024 * 1024)
+
+    def cache_type_name(self) -> str:
+        current = self.profile.httpCacheType()
+        for name, value in CACHE_TYPES.items():
+            if value == current:
+                return name
+        return "Disk"
+
+    def request_cache_stats(self) -> None:
+        path = self.profile.cachePath()
+
+        def _worker() -> None:
+            size, files = _dir_usage(path)
+            self.cache_stats_ready.emit(size, files)
+
+        threading.Thread(target=_worker, name="cache-stats", daemon=True).start()
+
+    def clear_cache(self) -> None:
+        self.profile.clearHttpCache()
+
+    def _on_download_requested(self, download: QWebEngineDownloadRequest) -> None:
+        if self.speculation.owns(download.page()):
+            # A guessed URL must never start a download on its own.
+            download.cancel()
+            return
+        if self.archive.claim(download):
+            return
+        self.downloads.add(download)
+        self.download_requested.emit(download)
+
+
+_profile_manager: Optional[ProfileManager] = None
+
+
+def get_profile_manager(storage_path: Optional[str] = None) -> ProfileManager:
+    global _profile_manager
+    if _profile_manager is None:
+        _profile_manager = ProfileManager(storage_path, QCoreApplication.instance())
+    return _profile_manager
+
+
+__all__ = ["ProfileManager", "get_profile_manager", "default_storage_path", "CACHE_TYPES"]
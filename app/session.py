@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, QStandardPaths, QByteArray, QDataStream, QIODevice
+
+
+logger = logging.getLogger(__name__)
+
+SESSION_VERSION = 1
+
+
+def default_session_path() -> str:
+    base = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    if not base:
+        base = str(Path.home() / ".gbrowser")
+    return os.path.join(base, "session.json")
+
+
+def serialize_history(history) -> Optional[str]:
+    try:
+        data = QByteArray()
+        stream = QDataStream(data, QIODevice.WriteOnly)
+        stream << history
+        return base64.b64encode(bytes(data)).decode("ascii")
+    except Exception:
+        return None
+
+
+def restore_history(history, encoded: str) -> bool:
+    try:
+        data = QByteArray(base64.b64decode(encoded))
+        stream = QDataStream(data, QIODevice.ReadOnly)
+        stream >> history
+        return history.count() > 0
+    except Exception:
+        return False
+
+
+def write_atomic(path: str, payload: bytes) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".session-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class SessionStore(QObject):
+
+    SAVE_DELAY_MS = 1500
+
+    def __init__(self, snapshot: Callable[[], dict], path: Optional[str] = None,
+                 parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.path = path or default_session_path()
+        self._snapshot = snapshot
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-writer")
+        self._enabled = True
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.SAVE_DELAY_MS)
+        self._timer.timeout.connect(self._flush)
+
+    def set_enabled(self, enabled: bool) -> None:
+        self._enabled = enabled
+        if not enabled:
+            self._timer.stop()
+
+    def schedule_save(self, *args) -> None:
+        if self._enabled and not self._timer.isActive():
+            self._timer.start()
+
+    def load(self) -> Optional[dict]:
+        try:
+            with open(self.path, "rb") as f:
+                state = json.loads(f.read().decode("utf-8"))
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.exception("Failed to read session file: %s", self.path)
+            return None
+        if not isinstance(state, dict) or state.get("version") != SESSION_VERSION:
+            return None
+        return state
+
+    def _encode(self) -> Optional[bytes]:
+        try:
+            state = dict(self._snapshot())
+        except Exception:
+            logger.exception("Failed to snapshot the session")
+            return None
+        state["version"] = SESSION_VERSION
+        return json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _flush(self) -> None:
+        # The snapshot touches Qt objects and has to run here; only the disk write is off-thread.
+        payload = self._encode()
+        if payload is not None:
+            self._writer.submit(self._write, payload)
+
+    def _write(self, payload: bytes) -> None:
+        try:
+            write_atomic(self.path, payload)
+        except Exception:
+            logger.exception("Failed to write session file: %s", self.path)
+
+    def save_now(self) -> None:
+        self._timer.stop()
+        if not self._enabled:
+            return
+        payload = self._encode()
+        self._writer.shutdown(wait=True)
+        if payload is not None:
+            self._write(payload)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-writer")
+
+
+_session_store: Optional[SessionStore] = None
+
+
+def get_session_store(snapshot: Callable[[], dict], path: Optional[str] = None) -> SessionStore:
+    # Every window saves into one file; a single writer keeps an older snapshot from landing after a newer one.
+    global _session_store
+    if _session_store is None:
+        _session_store = SessionStore(snapshot, path, QCoreApplication.instance())
+    return _session_store
+
+
+__all__ = ["SessionStore", "serialize_history", "restore_history", "default_session_path", "get_session_store"]
@@ -5,10 +5,10 @@ from PySide6.QtCore import Qt, Signal, QUrl
 from PySide6.QtGui import QFont
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QSlider, QComboBox,
-    QPushButton, QLineEdit, QCheckBox, QWidget
+    QPushButton, QLineEdit, QCheckBox, QWidget, QSpinBox
 )
 
-from app.effects import apply_acrylic_to_widget
+from app.effects import apply_acrylic_to_widget, schedule_acrylic_for_widget, forget_widget
 
 
 class SettingsDialog(QDialog):
@@ -16,10 +16,11 @@ class SettingsDialog(QDialog):
 
     def __init__(self, parent: QWidget | None = None, initial_acrylic_color: int = 0x661F2937) -> None:
         super().__init__(parent)
+        self.setObjectName("settings_dialog")
         self.setWindowFlags(Qt.Dialog | Qt.FramelessWindowHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setModal(True)
-        self.resize(520, 360)
+        self.resize(560, 730)
 
         self._base_rgb = 0x001F2937
         self._initial_color = initial_acrylic_color
@@ -31,25 +32,21 @@ class SettingsDialog(QDialog):
 
         title = QLabel("Settings")
         title.setFont(QFont("Segoe UI", 14))
-        title.setStyleSheet("color: white")
         layout.addWidget(title)
 
         row = QHBoxLayout()
         label = QLabel("Acrylic transparency:")
-        label.setStyleSheet("color:white")
         self.alpha_slider = QSlider(Qt.Horizontal)
         self.alpha_slider.setRange(0, 100)
         self.alpha_slider.setValue(int(self._initial_alpha * 100 / 255))
         self.alpha_value_lbl = QLabel(f"{self.alpha_slider.value()}%")
-        self.alpha_value_lbl.setStyleSheet("color:white")
         row.addWidget(label)
         row.addWidget(self.alpha_slider, 1)
         row.addWidget(self.alpha_value_lbl)
         layout.addLayout(row)
 
         row2 = QHBoxLayout()
-        theme_lbl = QLabel("Theme (Coming Soon):")
-        theme_lbl.setStyleSheet("color:white")
+        theme_lbl = QLabel("Theme:")
         self.theme_combo = QComboBox()
         self.theme_combo.addItems(["Dark", "Light", "Auto"])
         row2.addWidget(theme_lbl)
@@ -58,7 +55,6 @@ class SettingsDialog(QDialog):
 
         row3 = QHBoxLayout()
         home_lbl = QLabel("Home page URL (To apply this change, you need to restart the browser):")
-        home_lbl.setStyleSheet("color:white")
         self.home_edit = QLineEdit()
         self.home_edit.setPlaceholderText("https://example.com")
         row3.addWidget(home_lbl)
@@ -66,17 +62,129 @@ class SettingsDialog(QDialog):
         layout.addLayout(row3)
 
         self.sys_transparency = QCheckBox("Enable system transparency effects (Disabling this parameter may result in the browser frame being absent)")
-        self.sys_transparency.setStyleSheet("color:white")
         self.sys_transparency.setChecked(True)
         layout.addWidget(self.sys_transparency)
 
+        self.content_blocker_enabled = QCheckBox("Block ads and trackers")
+        self.content_blocker_enabled.setChecked(True)
+        layout.addWidget(self.content_blocker_enabled)
+
+        row_spec = QHBoxLayout()
+        self.speculation_enabled = QCheckBox("Preload pages the address bar predicts")
+        self.speculation_enabled.setChecked(True)
+        self.speculation_stats_lbl = QLabel("")
+        row_spec.addWidget(self.speculation_enabled)
+        row_spec.addStretch(1)
+        row_spec.addWidget(self.speculation_stats_lbl)
+        layout.addLayout(row_spec)
+
+        self.restore_session = QCheckBox("Restore tabs from the previous session on startup")
+        self.restore_session.setChecked(True)
+        layout.addWidget(self.restore_session)
+
+        row_strip = QHBoxLayout()
+        strip_lbl = QLabel("Tab strip (applies after restart):")
+        self.tab_strip_combo = QComboBox()
+        self.tab_strip_combo.addItems(["Buttons", "Virtualized"])
+        row_strip.addWidget(strip_lbl)
+        row_strip.addWidget(self.tab_strip_combo)
+        layout.addLayout(row_strip)
+
+        self.lifecycle_enabled = QCheckBox("Freeze and discard inactive background tabs")
+        self.lifecycle_enabled.setChecked(True)
+        layout.addWidget(self.lifecycle_enabled)
+
+        row4 = QHBoxLayout()
+        freeze_lbl = QLabel("Freeze after:")
+        self.freeze_spin = QSpinBox()
+        self.freeze_spin.setRange(0, 24 * 60)
+        self.freeze_spin.setSuffix(" min")
+        self.freeze_spin.setSpecialValueText("Never")
+        discard_lbl = QLabel("Discard after:")
+        self.discard_spin = QSpinBox()
+        self.discard_spin.setRange(0, 24 * 60)
+        self.discard_spin.setSuffix(" min")
+        self.discard_spin.setSpecialValueText("Never")
+        row4.addWidget(freeze_lbl)
+        row4.addWidget(self.freeze_spin)
+        row4.addWidget(discard_lbl)
+        row4.addWidget(self.discard_spin)
+        layout.addLayout(row4)
+
+        row5 = QHBoxLayout()
+        budget_lbl = QLabel("Tab memory budget:")
+        self.memory_budget_spin = QSpinBox()
+        self.memory_budget_spin.setRange(0, 64 * 1024)
+        self.memory_budget_spin.setSingleStep(256)
+        self.memory_budget_spin.setSuffix(" MB")
+        self.memory_budget_spin.setSpecialValueText("Unlimited")
+        row5.addWidget(budget_lbl)
+        row5.addWidget(self.memory_budget_spin)
+        row5.addStretch(1)
+        layout.addLayout(row5)
+
+        self.lifecycle_enabled.toggled.connect(self.freeze_spin.setEnabled)
+        self.lifecycle_enabled.toggled.connect(self.discard_spin.setEnabled)
+        self.lifecycle_enabled.toggled.connect(self.memory_budget_spin.setEnabled)
+
+        row6 = QHBoxLayout()
+        cache_lbl = QLabel("HTTP cache:")
+        self.cache_type_combo = QComboBox()
+        self.cache_type_combo.addItems(["Disk", "Memory", "None"])
+        self.cache_size_spin = QSpinBox()
+        self.cache_size_spin.setRange(0, 16 * 1024)
+        self.cache_size_spin.setSingleStep(64)
+        self.cache_size_spin.setSuffix(" MB")
+        self.cache_size_spin.setSpecialValueText("Automatic")
+        row6.addWidget(cache_lbl)
+        row6.addWidget(self.cache_type_combo)
+        row6.addWidget(self.cache_size_spin)
+        row6.addStretch(1)
+        layout.addLayout(row6)
+
+        row7 = QHBoxLayout()
+        self.cache_stats_lbl = QLabel("Cache on disk: calculating...")
+        self.clear_cache_btn = QPushButton("Clear cache")
+        self.clear_cache_btn.setObjectName("clear_cache")
+        self.clear_cache_btn.setFixedHeight(26)
+        row7.addWidget(self.cache_stats_lbl, 1)
+        row7.addWidget(self.clear_cache_btn)
+        layout.addLayout(row7)
+
+        row8 = QHBoxLayout()
+        storage_lbl = QLabel("Profile storage (applies after restart):")
+        self.storage_edit = QLineEdit()
+        row8.addWidget(storage_lbl)
+        row8.addWidget(self.storage_edit)
+        layout.addLayout(row8)
+
+        row9 = QHBoxLayout()
+        parallel_lbl = QLabel("Simultaneous downloads:")
+        self.max_downloads_spin = QSpinBox()
+        self.max_downloads_spin.setRange(1, 16)
+        rate_lbl = QLabel("Download speed limit:")
+        self.download_limit_spin = QSpinBox()
+        self.download_limit_spin.setRange(0, 1024 * 1024)
+        self.download_limit_spin.setSingleStep(100)
+        self.download_limit_spin.setSuffix(" KB/s")
+        self.download_limit_spin.setSpecialValueText("Unlimited")
+        row9.addWidget(parallel_lbl)
+        row9.addWidget(self.max_downloads_spin)
+        row9.addWidget(rate_lbl)
+        row9.addWidget(self.download_limit_spin)
+        row9.addStretch(1)
+        layout.addLayout(row9)
+
+        self.cache_type_combo.currentTextChanged.connect(
+            lambda t: self.cache_size_spin.setEnabled(t == "Disk")
+        )
+
         btn_row = QHBoxLayout()
         btn_row.addStretch(1)
         self.cancel_btn = QPushButton("Cancel")
         self.save_btn = QPushButton("Save")
         for b in (self.cancel_btn, self.save_btn):
             b.setFixedHeight(30)
-            b.setStyleSheet("color:white;background:rgba(255,255,255,0.06);border-radius:6px;")
         btn_row.addWidget(self.cancel_btn)
         btn_row.addWidget(self.save_btn)
         layout.addLayout(btn_row)
@@ -94,14 +202,29 @@ class SettingsDialog(QDialog):
         except Exception:
             pass
 
+    def set_cache_stats(self, size: int, files: int) -> None:
+        self.cache_stats_lbl.setText(f"Cache on disk: {size / (1024 * 1024):.1f} MB in {files} files")
+
+    def set_speculation_stats(self, stats: dict) -> None:
+        self.speculation_stats_lbl.setText(
+            f"{stats['hits']} used, {stats['misses']} missed, {stats['expired'] + stats['evicted']} discarded"
+        )
+
     def _on_alpha_changed(self, value: int) -> None:
         self.alpha_value_lbl.setText(f"{value}%")
         aa = int(value * 255 / 100) & 0xFF
         color = (aa << 24) | (self._base_rgb & 0x00FFFFFF)
         try:
-            apply_acrylic_to_widget(self, color)
+            schedule_acrylic_for_widget(self, color)
+        except Exception:
+            pass
+
+    def hideEvent(self, event) -> None:
+        try:
+            forget_widget(self)
         except Exception:
             pass
+        super().hideEvent(event)
 
     def _on_save(self) -> None:
         value = self.alpha_slider.value()
@@ -112,6 +235,19 @@ class SettingsDialog(QDialog):
             "theme": self.theme_combo.currentText(),
             "home_page": self.home_edit.text().strip(),
             "system_transparency": self.sys_transparency.isChecked(),
+            "tab_strip_mode": self.tab_strip_combo.currentText(),
+            "restore_session": self.restore_session.isChecked(),
+            "content_blocker_enabled": self.content_blocker_enabled.isChecked(),
+            "speculation_enabled": self.speculation_enabled.isChecked(),
+            "tab_lifecycle_enabled": self.lifecycle_enabled.isChecked(),
+            "freeze_after_min": self.freeze_spin.value(),
+            "discard_after_min": self.discard_spin.value(),
+            "memory_budget_mb": self.memory_budget_spin.value(),
+            "http_cache_type": self.cache_type_combo.currentText(),
+            "http_cache_max_mb": self.cache_size_spin.value(),
+            "profile_storage_path": self.storage_edit.text().strip(),
+            "max_concurrent_downloads": self.max_downloads_spin.value(),
+            "download_limit_kbps": self.download_limit_spin.value(),
         }
         self.settings_saved.emit(settings)
         self.accept()
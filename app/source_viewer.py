@@ -0,0 +1,469 @@
+from __future__ import annotations
+
+import re
+import threading
+from array import array
+from bisect import bisect_right, bisect_left
+from collections import OrderedDict
+from typing import Optional
+
+from PySide6.QtCore import Qt, QObject, QRect, QTimer, Signal
+from PySide6.QtGui import QColor, QFont, QFontDatabase, QFontMetrics, QGuiApplication, QKeySequence, QPainter, QShortcut
+from PySide6.QtWidgets import (
+    QAbstractScrollArea, QDialog, QHBoxLayout, QLabel, QLineEdit, QPushButton, QVBoxLayout, QWidget
+)
+
+
+MAX_LINE_CHARS = 1000
+
+TEXT, TAG, COMMENT, QUOTE_D, QUOTE_S = range(5)
+
+COLORS = {
+    "text": QColor("#d4d4d4"),
+    "tag": QColor("#569cd6"),
+    "attr": QColor("#9cdcfe"),
+    "value": QColor("#ce9178"),
+    "comment": QColor("#6a9955"),
+    "gutter": QColor("#858585"),
+    "gutter_bg": QColor("#1e1e1e"),
+    "background": QColor("#252526"),
+    "match": QColor(255, 200, 0, 90),
+    "current": QColor(255, 140, 0, 160),
+    "selection": QColor(38, 79, 120),
+}
+
+_TAG_NAME = re.compile(r"</?[!?]?[\w:.-]*")
+_ATTR = re.compile(r"\s+|/?>|[^\s=>/\"']+|=|\"|'|.")
+
+
+class SourceDocument:
+    # Lines longer than MAX_LINE_CHARS are split into several display lines, so a minified
+    # single-line page still scrolls and paints in small pieces.
+
+    def __init__(self, text: str) -> None:
+        self.text = text.replace("\t", "    ")
+        starts = array("Q", [0])
+        find = self.text.find
+        pos = 0
+        end = len(self.text)
+        while pos < end:
+            nl = find("\n", pos)
+            stop = end if nl < 0 else nl + 1
+            while stop - pos > MAX_LINE_CHARS:
+                pos += MAX_LINE_CHARS
+                starts.append(pos)
+            pos = stop
+            if pos < end:
+                starts.append(pos)
+        self.starts = starts
+        widths = (b - a for a, b in zip(starts, starts[1:]))
+        self.max_columns = max(max(widths, default=0), end - starts[-1])
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def line(self, index: int) -> str:
+        start = self.starts[index]
+        end = self.starts[index + 1] if index + 1 < len(self.starts) else len(self.text)
+        return self.text[start:end].rstrip("\r\n")
+
+    def line_of(self, offset: int) -> int:
+        return max(0, bisect_right(self.starts, offset) - 1)
+
+    def lines(self, first: int, last: int) -> str:
+        start = self.starts[first]
+        end = self.starts[last + 1] if last + 1 < len(self.starts) else len(self.text)
+        return self.text[start:end]
+
+
+def highlight_line(line: str, state: int) -> tuple[list[tuple[int, int, str]], int]:
+    spans: list[tuple[int, int, str]] = []
+    pos, n = 0, len(line)
+    after_eq = False
+    while pos < n:
+        if state == TEXT:
+            lt = line.find("<", pos)
+            if lt < 0:
+                spans.append((pos, n - pos, "text"))
+                break
+            if lt > pos:
+                spans.append((pos, lt - pos, "text"))
+            if line.startswith("<!--", lt):
+                state, pos = COMMENT, lt
+                continue
+            m = _TAG_NAME.match(line, lt)
+            spans.append((lt, m.end() - lt, "tag"))
+            state, pos = TAG, m.end()
+        elif state == COMMENT:
+            end = line.find("-->", pos)
+            stop = n if end < 0 else end + 3
+            spans.append((pos, stop - pos, "comment"))
+            pos = stop
+            if end >= 0:
+                state = TEXT
+        elif state in (QUOTE_D, QUOTE_S):
+            end = line.find('"' if state == QUOTE_D else "'", pos)
+            stop = n if end < 0 else end + 1
+            spans.append((pos, stop - pos, "value"))
+            pos = stop
+            if end >= 0:
+                state = TAG
+        else:
+            m = _ATTR.match(line, pos)
+            tok = m.group()
+            if tok.endswith(">"):
+                spans.append((pos, len(tok), "tag"))
+                state = TEXT
+            elif tok in ('"', "'"):
+                spans.append((pos, 1, "value"))
+                state = QUOTE_D if tok == '"' else QUOTE_S
+            elif not tok.isspace() and tok != "=":
+                spans.append((pos, len(tok), "value" if after_eq else "attr"))
+            after_eq = tok == "="
+            pos = m.end()
+    return spans, state
+
+
+class HtmlHighlighter:
+    # End-of-line states are remembered every CHECKPOINT lines as highlighting proceeds, so
+    # painting a viewport only tokenizes from the nearest checkpoint. Far-off jumps resync by
+    # starting SYNC_LINES above the viewport instead of tokenizing the whole page first.
+
+    CHECKPOINT = 256
+    SYNC_LINES = 64
+    CACHE_LINES = 4096
+
+    def __init__(self, document: SourceDocument) -> None:
+        self._doc = document
+        self._states = array("B", [TEXT])
+        self._cache: OrderedDict[int, list] = OrderedDict()
+
+    def _advance_checkpoints(self, line: int) -> None:
+        doc, step = self._doc, self.CHECKPOINT
+        while len(self._states) * step <= line:
+            k = len(self._states) - 1
+            state = self._states[k]
+            for i in range(k * step, min(len(doc), (k + 1) * step)):
+                state = highlight_line(doc.line(i), state)[1]
+            self._states.append(state)
+
+    def spans(self, first: int, last: int) -> dict[int, list]:
+        out: dict[int, list] = {}
+        missing = [i for i in range(first, last + 1) if i not in self._cache]
+        if missing:
+            start = missing[0]
+            known = (len(self._states) - 1) * self.CHECKPOINT
+            if start <= known + 4 * self.CHECKPOINT:
+                self._advance_checkpoints(start)
+                line = start - start % self.CHECKPOINT
+                state = self._states[line // self.CHECKPOINT]
+            else:
+                line, state = max(0, start - self.SYNC_LINES), TEXT
+            for i in range(line, last + 1):
+                spans, state = highlight_line(self._doc.line(i), state)
+                if i >= first:
+                    self._cache[i] = spans
+        for i in range(first, last + 1):
+            spans = self._cache.get(i)
+            if spans is not None:
+                self._cache.move_to_end(i)
+                out[i] = spans
+        while len(self._cache) > self.CACHE_LINES:
+            self._cache.popitem(last=False)
+        return out
+
+
+class _Worker(QObject):
+    # Not owned by the dialog: its threads keep it alive, so they never emit on a deleted object.
+
+    indexed = Signal(object)
+    search_done = Signal(int, object)
+
+    MAX_MATCHES = 100_000
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def index(self, text: str) -> None:
+        def _run() -> None:
+            document = SourceDocument(text)
+            if not self.cancelled:
+                self.indexed.emit(document)
+
+        threading.Thread(target=_run, name="source-index", daemon=True).start()
+
+    def search(self, generation: int, document: SourceDocument, query: str, current: list) -> None:
+        def _run() -> None:
+            matches = array("Q")
+            pattern = re.compile(re.escape(query), re.IGNORECASE)
+            for i, m in enumerate(pattern.finditer(document.text)):
+                # A newer query or a closed dialog supersedes this one; stop scanning.
+                if i % 4096 == 0 and (self.cancelled or current[0] != generation):
+                    return
+                matches.append(m.start())
+                if len(matches) >= self.MAX_MATCHES:
+                    break
+            if not self.cancelled:
+                self.search_done.emit(generation, matches)
+
+        threading.Thread(target=_run, name="source-search", daemon=True).start()
+
+
+class SourceView(QAbstractScrollArea):
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        font = QFontDatabase.systemFont(QFontDatabase.FixedFont)
+        font.setStyleHint(QFont.Monospace)
+        self.viewport().setFont(font)
+        fm = QFontMetrics(font)
+        self._line_h = fm.height()
+        self._char_w = max(1, fm.horizontalAdvance("M"))
+        self._ascent = fm.ascent()
+
+        self.document: Optional[SourceDocument] = None
+        self.highlighter: Optional[HtmlHighlighter] = None
+        self.matches = array("Q")
+        self.match_len = 0
+        self.current_match = -1
+        self._selection: Optional[tuple[int, int]] = None
+        self._anchor = -1
+        self.setFocusPolicy(Qt.StrongFocus)
+
+    def set_document(self, document: SourceDocument) -> None:
+        self.document = document
+        self.highlighter = HtmlHighlighter(document)
+        self._selection = None
+        self._update_scrollbars()
+        self.viewport().update()
+
+    def set_matches(self, matches: array, length: int) -> None:
+        self.matches = matches
+        self.match_len = length
+        self.current_match = -1
+        self.viewport().update()
+
+    def _gutter_width(self) -> int:
+        digits = len(str(len(self.document))) if self.document else 1
+        return (digits + 2) * self._char_w
+
+    def _visible_lines(self) -> int:
+        return max(1, self.viewport().height() // self._line_h)
+
+    def _visible_columns(self) -> int:
+        return max(1, (self.viewport().width() - self._gutter_width()) // self._char_w)
+
+    def _update_scrollbars(self) -> None:
+        lines = len(self.document) if self.document else 0
+        cols = self.document.max_columns if self.document else 0
+        vbar, hbar = self.verticalScrollBar(), self.horizontalScrollBar()
+        vbar.setRange(0, max(0, lines - self._visible_lines()))
+        vbar.setPageStep(self._visible_lines())
+        hbar.setRange(0, max(0, cols - self._visible_columns()))
+        hbar.setPageStep(self._visible_columns())
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._update_scrollbars()
+
+    def scroll_to_offset(self, offset: int) -> None:
+        if self.document is None:
+            return
+        line = self.document.line_of(offset)
+        vbar = self.verticalScrollBar()
+        if not (vbar.value() <= line < vbar.value() + self._visible_lines()):
+            vbar.setValue(max(0, line - self._visible_lines() // 3))
+        column = offset - self.document.starts[line]
+        hbar = self.horizontalScrollBar()
+        if not (hbar.value() <= column < hbar.value() + self._visible_columns()):
+            hbar.setValue(max(0, column - 8))
+        self.viewport().update()
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self.viewport())
+        rect = self.viewport().rect()
+        painter.fillRect(rect, COLORS["background"])
+        doc = self.document
+        if doc is None:
+            return
+
+        gutter = self._gutter_width()
+        painter.fillRect(QRect(0, 0, gutter, rect.height()), COLORS["gutter_bg"])
+        first = self.verticalScrollBar().value()
+        last = min(len(doc) - 1, first + self._visible_lines())
+        left = self.horizontalScrollBar().value()
+        cols = self._visible_columns() + 1
+        spans = self.highlighter.spans(first, last)
+
+        lo = bisect_left(self.matches, doc.starts[first])
+        hi_offset = doc.starts[last + 1] if last + 1 < len(doc) else len(doc.text)
+        hi = bisect_left(self.matches, hi_offset, lo)
+        current = self.matches[self.current_match] if 0 <= self.current_match < len(self.matches) else -1
+
+        painter.setClipRect(QRect(gutter, 0, rect.width() - gutter, rect.height()))
+        for k in range(lo, hi):
+            start = self.matches[k]
+            line = doc.line_of(start)
+            col = start - doc.starts[line]
+            y = (line - first) * self._line_h
+            x = gutter + (col - left) * self._char_w
+            color = COLORS["current"] if start == current else COLORS["match"]
+            painter.fillRect(QRect(x, y, self.match_len * self._char_w, self._line_h), color)
+
+        if self._selection is not None:
+            s0, s1 = self._selection
+            for i in range(max(first, s0), min(last, s1) + 1):
+                painter.fillRect(QRect(gutter, (i - first) * self._line_h, rect.width(), self._line_h),
+                                 COLORS["selection"])
+
+        for i in range(first, last + 1):
+            y = (i - first) * self._line_h + self._ascent
+            text = doc.line(i)
+            for start, length, kind in spans.get(i, [(0, len(text), "text")]):
+                end = start + length
+                if end <= left or start >= left + cols:
+                    continue
+                s, e = max(start, left), min(end, left + cols)
+                painter.setPen(COLORS[kind])
+                painter.drawText(gutter + (s - left) * self._char_w, y, text[s:e])
+
+        painter.setClipping(False)
+        painter.setPen(COLORS["gutter"])
+        for i in range(first, last + 1):
+            painter.drawText(QRect(0, (i - first) * self._line_h, gutter - self._char_w, self._line_h),
+                             Qt.AlignRight | Qt.AlignVCenter, str(i + 1))
+
+    def _line_at(self, y: float) -> int:
+        line = self.verticalScrollBar().value() + int(y) // self._line_h
+        return min(max(0, line), len(self.document) - 1)
+
+    def mousePressEvent(self, event) -> None:
+        if self.document is not None and event.button() == Qt.LeftButton:
+            self._anchor = self._line_at(event.position().y())
+            self._selection = (self._anchor, self._anchor)
+            self.viewport().update()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event) -> None:
+        if self.document is not None and event.buttons() & Qt.LeftButton and self._anchor >= 0:
+            line = self._line_at(event.position().y())
+            self._selection = (min(self._anchor, line), max(self._anchor, line))
+            self.viewport().update()
+        super().mouseMoveEvent(event)
+
+    def keyPressEvent(self, event) -> None:
+        if self.document is not None:
+            if event.matches(QKeySequence.Copy) and self._selection is not None:
+                QGuiApplication.clipboard().setText(self.document.lines(*self._selection))
+                return
+            if event.matches(QKeySequence.SelectAll):
+                self._selection = (0, len(self.document) - 1)
+                self.viewport().update()
+                return
+        super().keyPressEvent(event)
+
+
+class SourceViewerDialog(QDialog):
+
+    SEARCH_DELAY_MS = 150
+
+    def __init__(self, title: str = "", parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle(f"Page Source - {title}" if title else "Page Source")
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.resize(900, 650)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setSpacing(6)
+
+        bar = QHBoxLayout()
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("Find in source (Ctrl+F)")
+        self.search.setClearButtonEnabled(True)
+        self.prev_btn = QPushButton("▲")
+        self.next_btn = QPushButton("▼")
+        for b in (self.prev_btn, self.next_btn):
+            b.setFixedSize(28, 26)
+        self.status = QLabel("Loading...")
+        bar.addWidget(self.search, 1)
+        bar.addWidget(self.prev_btn)
+        bar.addWidget(self.next_btn)
+        bar.addWidget(self.status)
+        layout.addLayout(bar)
+
+        self.view = SourceView(self)
+        layout.addWidget(self.view, 1)
+
+        self._worker = _Worker()
+        self._worker.indexed.connect(self._on_indexed)
+        self._worker.search_done.connect(self._on_search_done)
+        self.finished.connect(self._worker.cancel)
+        self._generation = [0]
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self._start_search)
+
+        self.search.textChanged.connect(lambda _: self._search_timer.start())
+        self.search.returnPressed.connect(self._on_return)
+        self.next_btn.clicked.connect(lambda: self._step(1))
+        self.prev_btn.clicked.connect(lambda: self._step(-1))
+        QShortcut(QKeySequence.Find, self, activated=self.search.setFocus)
+        QShortcut(QKeySequence.FindNext, self, activated=lambda: self._step(1))
+        QShortcut(QKeySequence.FindPrevious, self, activated=lambda: self._step(-1))
+
+    def set_html(self, html: str) -> None:
+        # toHtml hands the page over on the GUI thread; splitting it into lines happens off it.
+        self.status.setText(f"Indexing {len(html) / (1024 * 1024):.1f} MB...")
+        self._worker.index(html)
+
+    def _on_indexed(self, document: SourceDocument) -> None:
+        self.view.set_document(document)
+        self.status.setText(f"{len(document)} lines")
+        if self.search.text():
+            self._start_search()
+
+    def _start_search(self) -> None:
+        self._generation[0] += 1
+        query = self.search.text()
+        doc = self.view.document
+        if doc is None:
+            return
+        if not query:
+            self.view.set_matches(array("Q"), 0)
+            self.status.setText(f"{len(doc)} lines")
+            return
+        self.status.setText("Searching...")
+        self._worker.search(self._generation[0], doc, query, self._generation)
+
+    def _on_search_done(self, generation: int, matches: array) -> None:
+        if generation != self._generation[0]:
+            return
+        self.view.set_matches(matches, len(self.search.text()))
+        self.status.setText(f"{len(matches)} matches" if matches else "No matches")
+        if matches:
+            self._step(1)
+
+    def _on_return(self) -> None:
+        if self._search_timer.isActive():
+            self._search_timer.stop()
+            self._start_search()
+        else:
+            self._step(-1 if QGuiApplication.keyboardModifiers() & Qt.ShiftModifier else 1)
+
+    def _step(self, delta: int) -> None:
+        matches = self.view.matches
+        if not matches:
+            return
+        self.view.current_match = (self.view.current_match + delta) % len(matches)
+        self.status.setText(f"{self.view.current_match + 1} of {len(matches)}")
+        self.view.scroll_to_offset(matches[self.view.current_match])
+
+
+__all__ = ["SourceViewerDialog", "SourceView", "SourceDocument", "HtmlHighlighter", "highlight_line"]
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import html
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from PySide6.QtCore import QObject, QTimer, QUrl
+from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
+
+from app.lifecycle import renderer_rss_mb
+
+
+# An omnibox candidate is prerendered only when it is both strong and well ahead of the runner-up.
+PRERENDER_MIN_SCORE = 800.0
+PRERENDER_LEAD = 2.0
+
+
+def speculation_key(url: QUrl) -> str:
+    return url.adjusted(QUrl.StripTrailingSlash | QUrl.RemoveFragment).toString()
+
+
+def is_confident(typed: str, suggestions: list) -> bool:
+    if not suggestions or len(typed.strip()) < 2:
+        return False
+    top = suggestions[0]
+    if top.tab_id:
+        return False
+    # Imported here so loading the profile does not pull the omnibox and history modules in before first paint.
+    from app.omnibox import strip_scheme
+    typed = strip_scheme(typed.strip())
+    if typed.startswith("www."):
+        typed = typed[4:]
+    if not strip_scheme(top.url).startswith(typed):
+        return False
+    runner_up = suggestions[1].score if len(suggestions) > 1 else 0.0
+    return top.score >= PRERENDER_MIN_SCORE and top.score >= PRERENDER_LEAD * runner_up
+
+
+@dataclass
+class _Prerender:
+    page: QWebEnginePage
+    key: str
+    started: float = field(default_factory=time.monotonic)
+
+
+class SpeculationEngine(QObject):
+
+    MAX_PAGES = 2
+    MEMORY_BUDGET_MB = 400
+    TTL_S = 30.0
+    HOVER_DELAY_MS = 150
+    PRECONNECT_REPEAT_S = 10.0
+    CHECK_MS = 2000
+
+    def __init__(self, profile: QWebEngineProfile, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._profile = profile
+        self.enabled = True
+        self._pages: list[_Prerender] = []
+        self._warmer: Optional[QWebEnginePage] = None
+        self._warm_origins: dict[str, float] = {}
+        self._hovered: Optional[QUrl] = None
+        self.counters = {"prerendered": 0, "hits": 0, "misses": 0, "expired": 0, "evicted": 0, "preconnects": 0}
+
+        self._hover_timer = QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.setInterval(self.HOVER_DELAY_MS)
+        self._hover_timer.timeout.connect(self._on_hover_dwell)
+
+        self._check_timer = QTimer(self)
+        self._check_timer.setInterval(self.CHECK_MS)
+        self._check_timer.timeout.connect(self._enforce_limits)
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enabled = enabled
+        if not enabled:
+            self.cancel_all()
+
+    def stats(self) -> dict:
+        out = dict(self.counters)
+        out["active"] = len(self._pages)
+        return out
+
+    def owns(self, page) -> bool:
+        return page is not None and (page is self._warmer or any(p.page is page for p in self._pages))
+
+    def hover(self, url: str) -> None:
+        # Called for every linkHovered; only a link the pointer rests on gets its connection warmed.
+        q = QUrl(url) if url else QUrl()
+        if not self.enabled or q.scheme() not in ("http", "https"):
+            self._hovered = None
+            self._hover_timer.stop()
+            return
+        self._hovered = q
+        self._hover_timer.start()
+
+    def _on_hover_dwell(self) -> None:
+        if self._hovered is not None:
+            self.preconnect(self._hovered)
+
+    def preconnect(self, url: QUrl) -> None:
+        if not self.enabled or url.scheme() not in ("http", "https") or not url.host():
+            return
+        origin = url.adjusted(QUrl.RemovePath | QUrl.RemoveQuery | QUrl.RemoveFragment | QUrl.RemoveUserInfo)
+        key = origin.toString()
+        now = time.monotonic()
+        if now - self._warm_origins.get(key, -self.PRECONNECT_REPEAT_S) < self.PRECONNECT_REPEAT_S:
+            return
+        self._warm_origins[key] = now
+        if len(self._warm_origins) > 64:
+            cutoff = now - self.PRECONNECT_REPEAT_S
+            self._warm_origins = {k: t for k, t in self._warm_origins.items() if t >= cutoff}
+
+        # One blank page in the same profile asks Chromium to resolve and open sockets that real tabs reuse.
+        if self._warmer is None:
+            self._warmer = QWebEnginePage(self._profile, self)
+            self._warmer.setAudioMuted(True)
+        links = "".join(
+            f'<link rel="preconnect" href="{html.escape(o)}" crossorigin><link rel="dns-prefetch" href="{html.escape(o)}">'
+            for o in self._warm_origins
+        )
+        self._warmer.setHtml(f"<!doctype html><html><head>{links}</head></html>", QUrl("about:blank"))
+        self.counters["preconnects"] += 1
+
+    def prerender(self, url: QUrl) -> None:
+        if not self.enabled or url.scheme() not in ("http", "https"):
+            return
+        key = speculation_key(url)
+        if any(p.key == key for p in self._pages):
+            return
+        while len(self._pages) >= self.MAX_PAGES:
+            self._drop(self._pages[0], "evicted")
+
+        page = QWebEnginePage(self._profile, self)
+        page.setAudioMuted(True)
+        page.setUrl(url)
+        self._pages.append(_Prerender(page, key))
+        self.counters["prerendered"] += 1
+        if not self._check_timer.isActive():
+            self._check_timer.start()
+
+    def take(self, url: QUrl) -> Optional[QWebEnginePage]:
+        if not self.enabled:
+            return None
+        key = speculation_key(url)
+        for entry in self._pages:
+            # Redirects (http -> https, bare host -> www) still count as the page the user asked for.
+            if entry.key == key or speculation_key(entry.page.url()) == key:
+                self._pages.remove(entry)
+                entry.page.setAudioMuted(False)
+                entry.page.setParent(None)
+                self.counters["hits"] += 1
+                return entry.page
+        self.counters["misses"] += 1
+        return None
+
+    def cancel_all(self) -> None:
+        for entry in list(self._pages):
+            self._drop(entry, "expired")
+        self._check_timer.stop()
+
+    def _drop(self, entry: _Prerender, reason: str) -> None:
+        self._pages.remove(entry)
+        self.counters[reason] += 1
+        entry.page.deleteLater()
+
+    def _enforce_limits(self) -> None:
+        now = time.monotonic()
+        for entry in list(self._pages):
+            if now - entry.started > self.TTL_S:
+                self._drop(entry, "expired")
+
+        total = 0.0
+        seen: set[int] = set()
+        for entry in self._pages:
+            pid = int(entry.page.renderProcessPid())
+            if pid > 0 and pid not in seen:
+                seen.add(pid)
+                total += renderer_rss_mb(pid) or 0.0
+        while self._pages and total > self.MEMORY_BUDGET_MB:
+            oldest = self._pages[0]
+            pid = int(oldest.page.renderProcessPid())
+            if pid in seen:
+                seen.discard(pid)
+                total -= renderer_rss_mb(pid) or 0.0
+            self._drop(oldest, "evicted")
+
+        if not self._pages:
+            self._check_timer.stop()
+
+
+__all__ = ["SpeculationEngine", "is_confident", "speculation_key", "PRERENDER_MIN_SCORE"]
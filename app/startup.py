@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FLAG = "--profile-startup"
+
+
+class StartupProfiler:
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.phases: list[tuple[str, float, float]] = []
+        self._last = self.origin
+        self._reported = False
+
+    def mark(self, name: str) -> None:
+        # A mark closes the phase that started at the previous mark or span.
+        now = time.perf_counter()
+        self.phases.append((name, self._last, now))
+        self._last = now
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Spans nest inside the current phase, so they do not move the mark baseline.
+            self.phases.append((name, start, time.perf_counter()))
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.origin) * 1000.0
+
+    def report(self) -> str:
+        lines = ["Startup profile:"]
+        for name, start, end in self.phases:
+            lines.append(f"  {name:<28} {(end - start) * 1000.0:8.1f} ms   at {(end - self.origin) * 1000.0:8.1f} ms")
+        return "\n".join(lines)
+
+    def finish(self) -> None:
+        if self.enabled and not self._reported:
+            self._reported = True
+            logger.info("%s", self.report())
+
+
+_profiler: Optional[StartupProfiler] = None
+
+
+def get_startup_profiler() -> StartupProfiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler()
+    return _profiler
+
+
+__all__ = ["StartupProfiler", "get_startup_profiler", "PROFILE_FLAG"]
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+from PySide6.QtCore import Qt, QMimeData, QByteArray, QPoint
+from PySide6.QtGui import QCursor, QDrag, QGuiApplication, QPixmap
+from PySide6.QtWidgets import QApplication, QMenu, QWidget
+
+
+TAB_MIME = "application/x-gbrowser-tab"
+
+
+def start_tab_drag(source: QWidget, tab_id: int, pixmap: Optional[QPixmap] = None) -> bool:
+    # Tab ids are only meaningful inside this process, so the payload carries the pid too.
+    mime = QMimeData()
+    mime.setData(TAB_MIME, QByteArray(f"{os.getpid()}:{tab_id}".encode("ascii")))
+    drag = QDrag(source)
+    drag.setMimeData(mime)
+    if pixmap is not None and not pixmap.isNull():
+        drag.setPixmap(pixmap)
+        drag.setHotSpot(pixmap.rect().center())
+    if drag.exec(Qt.MoveAction) != Qt.IgnoreAction:
+        return False
+    # Esc also ends a drag with IgnoreAction, with the button still held; and a release over one
+    # of our own windows that did not take the tab is not a tear-off either.
+    if QGuiApplication.mouseButtons() & Qt.LeftButton:
+        return False
+    return QApplication.topLevelAt(QCursor.pos()) is None
+
+
+def drag_tab(strip: QWidget, tab_id: int, pixmap: Optional[QPixmap] = None) -> None:
+    # Released outside every window, so the tab was pulled out into a window of its own.
+    if start_tab_drag(strip, tab_id, pixmap):
+        strip.tab_detach_requested.emit(tab_id)
+
+
+def exec_tab_menu(strip: QWidget, tab_id: int, global_pos: QPoint) -> None:
+    # Shared by TabPanel and TabStrip; both expose count() and the detach/close signals.
+    menu = QMenu(strip)
+    detach_action = menu.addAction("Move to New Window")
+    detach_action.setEnabled(strip.count() > 1)
+    menu.addSeparator()
+    close_action = menu.addAction("Close Tab")
+    action = menu.exec(global_pos)
+    if action is detach_action:
+        strip.tab_detach_requested.emit(tab_id)
+    elif action is close_action:
+        strip.tab_close_requested.emit(tab_id)
+
+
+def dragged_tab_id(mime: QMimeData) -> int:
+    if not mime.hasFormat(TAB_MIME):
+        return 0
+    try:
+        pid, tab_id = bytes(mime.data(TAB_MIME)).decode("ascii").split(":")
+        return int(tab_id) if int(pid) == os.getpid() else 0
+    except ValueError:
+        return 0
+
+
+__all__ = ["start_tab_drag", "drag_tab", "exec_tab_menu", "dragged_tab_id", "TAB_MIME"]
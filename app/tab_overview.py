@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from PySide6.QtCore import Qt, Signal, QSize, QRect, QModelIndex, QAbstractListModel
+from PySide6.QtGui import QPainter, QPen
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QLineEdit, QListView, QStyledItemDelegate, QStyle, QWidget
+)
+
+from app.favicons import FaviconCache, favicon_host
+from app.theme import get_theme_manager
+from app.thumbnails import ThumbnailCache
+
+
+class TabOverviewModel(QAbstractListModel):
+
+    TabIdRole = Qt.UserRole + 1
+    IconRole = Qt.UserRole + 2
+
+    def __init__(self, tab_manager, thumbnails: ThumbnailCache, favicons: FaviconCache,
+                 parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._thumbnails = thumbnails
+        self._favicons = favicons
+        # Title and URL come from the tab object, which answers for placeholders and frozen pages
+        # without touching their renderer.
+        self._entries = [
+            (tab.tab_id, tab.title() or tab.url().toString(), tab.url().toString(), favicon_host(tab.url()))
+            for tab in tab_manager.browser_tabs()
+        ]
+        self._rows = {entry[0]: row for row, entry in enumerate(self._entries)}
+        thumbnails.thumbnail_ready.connect(self._on_thumbnail_ready)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._entries):
+            return None
+        tab_id, title, url, host = self._entries[index.row()]
+        if role == Qt.DisplayRole:
+            return title
+        if role == Qt.ToolTipRole:
+            return url
+        if role == Qt.DecorationRole:
+            # Only rows the view paints ask for a thumbnail, so opening the grid decodes a screenful at most.
+            return self._thumbnails.pixmap(tab_id)
+        if role == self.IconRole:
+            return self._favicons.pixmap(host)
+        if role == self.TabIdRole:
+            return tab_id
+        return None
+
+    def _on_thumbnail_ready(self, tab_id: int) -> None:
+        row = self._rows.get(tab_id)
+        if row is not None:
+            idx = self.index(row)
+            self.dataChanged.emit(idx, idx, [Qt.DecorationRole])
+
+
+class _OverviewDelegate(QStyledItemDelegate):
+
+    CARD = QSize(240, 176)
+    THUMB_HEIGHT = 150
+
+    def sizeHint(self, option, index: QModelIndex) -> QSize:
+        return self.CARD
+
+    def paint(self, painter: QPainter, option, index: QModelIndex) -> None:
+        themes = get_theme_manager()
+        rect = option.rect.adjusted(6, 6, -6, -6)
+        selected = bool(option.state & QStyle.State_Selected)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(themes.color("tab_active") if selected or hovered else themes.color("control"))
+        painter.drawRoundedRect(rect, 6, 6)
+
+        thumb_rect = QRect(rect.left() + 6, rect.top() + 6, rect.width() - 12, self.THUMB_HEIGHT - 12)
+        thumb = index.data(Qt.DecorationRole)
+        if thumb is not None:
+            painter.drawPixmap(thumb_rect, thumb)
+        else:
+            painter.setBrush(themes.color("control_hover"))
+            painter.drawRoundedRect(thumb_rect, 4, 4)
+        if selected:
+            painter.setPen(QPen(themes.color("accent"), 2))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRoundedRect(rect, 6, 6)
+
+        left = rect.left() + 8
+        text_top = rect.top() + self.THUMB_HEIGHT
+        icon = index.data(TabOverviewModel.IconRole)
+        if icon is not None:
+            painter.drawPixmap(QRect(left, text_top + 2, 16, 16), icon)
+            left += 22
+        text_rect = QRect(left, text_top, rect.right() - left - 6, 20)
+        painter.setPen(QPen(themes.color("text_tab")))
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                         painter.fontMetrics().elidedText(index.data(Qt.DisplayRole) or "", Qt.ElideRight,
+                                                          text_rect.width()))
+        painter.restore()
+
+
+class TabOverview(QDialog):
+
+    tab_selected = Signal(int)
+
+    def __init__(self, tab_manager, thumbnails: ThumbnailCache, favicons: FaviconCache,
+                 parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Tabs")
+        self.resize(1040, 680)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 12, 12, 12)
+        layout.setSpacing(8)
+
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("Filter tabs")
+        self.search.setClearButtonEnabled(True)
+        layout.addWidget(self.search)
+
+        self.model = TabOverviewModel(tab_manager, thumbnails, favicons, self)
+        self.grid = QListView()
+        self.grid.setObjectName("tab_overview")
+        self.grid.setViewMode(QListView.IconMode)
+        self.grid.setResizeMode(QListView.Adjust)
+        self.grid.setMovement(QListView.Static)
+        # Uniform sizes let the view lay out hundreds of cards without asking each one for a size hint.
+        self.grid.setUniformItemSizes(True)
+        self.grid.setLayoutMode(QListView.Batched)
+        self.grid.setGridSize(_OverviewDelegate.CARD)
+        self.grid.setMouseTracking(True)
+        self.grid.setItemDelegate(_OverviewDelegate(self.grid))
+        self.grid.setModel(self.model)
+        layout.addWidget(self.grid, 1)
+
+        current = tab_manager.current_tab_id()
+        for row in range(self.model.rowCount()):
+            if self.model.index(row).data(TabOverviewModel.TabIdRole) == current:
+                self.grid.setCurrentIndex(self.model.index(row))
+                self.grid.scrollTo(self.model.index(row))
+                break
+
+        self.grid.activated.connect(self._on_activated)
+        self.grid.clicked.connect(self._on_activated)
+        self.search.textChanged.connect(self._apply_filter)
+        self.search.returnPressed.connect(self._activate_first_visible)
+
+    def _apply_filter(self, text: str) -> None:
+        needle = text.strip().lower()
+        for row in range(self.model.rowCount()):
+            idx = self.model.index(row)
+            hay = f"{idx.data(Qt.DisplayRole)} {idx.data(Qt.ToolTipRole)}".lower()
+            self.grid.setRowHidden(row, bool(needle) and needle not in hay)
+
+    def _activate_first_visible(self) -> None:
+        for row in range(self.model.rowCount()):
+            if not self.grid.isRowHidden(row):
+                self._on_activated(self.model.index(row))
+                return
+
+    def _on_activated(self, index: QModelIndex) -> None:
+        tab_id = index.data(TabOverviewModel.TabIdRole)
+        if tab_id:
+            self.tab_selected.emit(tab_id)
+        self.accept()
+
+
+__all__ = ["TabOverview", "TabOverviewModel"]
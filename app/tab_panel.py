@@ -2,23 +2,32 @@ from __future__ import annotations
 
 from typing import Optional
 
-from PySide6.QtCore import Qt, Signal, QSize
+from PySide6.QtCore import Qt, Signal, QSize, QEvent, QPoint
+from PySide6.QtGui import QIcon, QPixmap
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QPushButton, QLabel, QScrollArea,
-    QSizePolicy
+    QSizePolicy, QApplication
 )
 
+from app.tab_drag import drag_tab, dragged_tab_id, exec_tab_menu
+from app.tab_registry import TabRegistry
+from app.theme import set_style_property
+
 
 class _TabButton(QWidget):
     
     clicked = Signal(int)
     close_clicked = Signal(int)
+    drag_started = Signal(int)
+    menu_requested = Signal(int, QPoint)
     
-    def __init__(self, index: int, title: str = "", parent: Optional[QWidget] = None):
+    def __init__(self, tab_id: int, title: str = "", parent: Optional[QWidget] = None):
         super().__init__(parent)
-        self.index = index
+        self.tab_id = tab_id
         self._title = title
         self._tab_panel = parent 
+        self.setObjectName("tab_button")
+        self.setAttribute(Qt.WA_StyledBackground, True)
         
         self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
         self.setMaximumHeight(30)
@@ -28,34 +37,14 @@ class _TabButton(QWidget):
         layout.setSpacing(4)
         
         self.btn = QPushButton(title, self)
+        self.btn.setObjectName("tab_title")
         self.btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-        self.btn.setStyleSheet("""
-            QPushButton { 
-                background: transparent; 
-                color: rgba(255,255,255,0.9); 
-                border: none; 
-                padding: 2px 4px;
-                text-align: left;
-            }
-        """)
         self.btn.setCursor(Qt.PointingHandCursor)
+        self.btn.setIconSize(QSize(16, 16))
         
         self.close_btn = QPushButton("✕", self) 
+        self.close_btn.setObjectName("tab_close")
         self.close_btn.setFixedSize(16, 16)
-        self.close_btn.setStyleSheet("""
-            QPushButton { 
-                background: transparent; 
-                color: rgba(255,255,255,0.6); 
-                border: none; 
-                font-size: 10px;
-                padding: 0px;
-            }
-            QPushButton:hover {
-                color: rgba(255,255,255,0.9);
-                background: rgba(255,255,255,0.1);
-                border-radius: 8px;
-            }
-        """)
         self.close_btn.setCursor(Qt.PointingHandCursor)
         
         layout.addWidget(self.btn)
@@ -63,12 +52,34 @@ class _TabButton(QWidget):
         
         self.btn.clicked.connect(self._on_clicked)
         self.close_btn.clicked.connect(self._on_close_clicked)
+        self._press_pos: Optional[QPoint] = None
+        self.btn.installEventFilter(self)
+
+    def eventFilter(self, obj, event) -> bool:
+        if obj is self.btn:
+            kind = event.type()
+            if kind == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+                self._press_pos = event.position().toPoint()
+            elif kind == QEvent.MouseButtonRelease:
+                self._press_pos = None
+            elif kind == QEvent.MouseMove and self._press_pos is not None and event.buttons() & Qt.LeftButton:
+                if (event.position().toPoint() - self._press_pos).manhattanLength() >= QApplication.startDragDistance():
+                    self._press_pos = None
+                    # The drag swallows the release, so the press must not turn into a click later.
+                    self.btn.setDown(False)
+                    self.drag_started.emit(self.tab_id)
+                    return True
+        return super().eventFilter(obj, event)
 
     def _on_clicked(self):
-        self.clicked.emit(self.index)  
+        self.clicked.emit(self.tab_id)
 
     def _on_close_clicked(self):
-        self.close_clicked.emit(self.index)  
+        self.close_clicked.emit(self.tab_id)
+
+    def contextMenuEvent(self, event) -> None:
+        self.menu_requested.emit(self.tab_id, event.globalPos())
+        event.accept()
 
     def sizeHint(self) -> QSize:
         return QSize(100, 30)
@@ -80,20 +91,11 @@ class _TabButton(QWidget):
         self._title = title
         self.btn.setText(title)
 
+    def set_icon(self, pixmap: Optional[QPixmap]) -> None:
+        self.btn.setIcon(QIcon(pixmap) if pixmap is not None else QIcon())
+
     def set_active(self, active: bool) -> None:
-        if active:
-            self.setStyleSheet("""
-                background: rgba(255,255,255,0.06); 
-                border-radius: 4px;
-                border-bottom: 2px solid #4a9eff;
-            """)
-        else:
-            self.setStyleSheet("""
-                _TabButton:hover {
-                    background: rgba(255,255,255,0.03);
-                    border-radius: 4px;
-                }
-            """)
+        set_style_property(self, "active", active)
 
 
 class TabPanel(QWidget):
@@ -101,9 +103,13 @@ class TabPanel(QWidget):
     tab_selected = Signal(int)
     tab_close_requested = Signal(int)
     new_tab_requested = Signal()
+    tab_detach_requested = Signal(int)
+    tab_dropped = Signal(int)
     
-    def __init__(self, parent: Optional[QWidget] = None):
+    def __init__(self, registry: TabRegistry, parent: Optional[QWidget] = None):
         super().__init__(parent)
+        self.registry = registry
+        self.setAcceptDrops(True)
         
         self.setMaximumHeight(40)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
@@ -116,12 +122,7 @@ class TabPanel(QWidget):
         self.scroll.setWidgetResizable(True)
         self.scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.scroll.setStyleSheet("""
-            QScrollArea { 
-                background: transparent; 
-                border: none; 
-            }
-        """)
+        self.scroll.setObjectName("tab_scroll")
         self.scroll.setMaximumHeight(36)
         
         self.container = QWidget()
@@ -137,62 +138,116 @@ class TabPanel(QWidget):
         layout.addWidget(self.scroll, 1)
         
         self.new_btn = QPushButton("+")
+        self.new_btn.setObjectName("tab_new")
         self.new_btn.setFixedSize(24, 24)
-        self.new_btn.setStyleSheet("""
-            QPushButton { 
-                background: rgba(255,255,255,0.06); 
-                border-radius: 4px; 
-                color: white; 
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background: rgba(255,255,255,0.1);
-            }
-        """)
         self.new_btn.clicked.connect(lambda: self.new_tab_requested.emit())
         layout.addWidget(self.new_btn)
         
-        self._buttons: list[_TabButton] = []
-        self._current_index: int = -1
+        self._current_id: int = 0
+
+    def _create_button(self, tab_id: int, title: str) -> _TabButton:
+        b = _TabButton(tab_id, title, parent=self.container)
+        b.clicked.connect(self._on_tab_clicked)
+        b.close_clicked.connect(self._on_tab_close_clicked)
+        b.drag_started.connect(self._on_tab_drag_started)
+        b.menu_requested.connect(self._on_tab_menu_requested)
+        b.set_active(False)
+        self.registry.set_button(tab_id, b)
+        return b
+
+    def insert_tab(self, tab_id: int, title: str) -> None:
+        position = self.registry.position(tab_id)
+        if position < 0:
+            position = self.hbox.count()
+        b = self._create_button(tab_id, title or f"Tab {position+1}")
+        self.hbox.insertWidget(position, b)
+
+    def remove_tab(self, tab_id: int) -> None:
+        b = self.registry.button(tab_id)
+        if b is None:
+            return
+        self.registry.set_button(tab_id, None)
+        if tab_id == self._current_id:
+            self._current_id = 0
+        self.hbox.removeWidget(b)
+        b.setParent(None)
+        b.deleteLater()
+
+    def move_tab(self, from_index: int, to_index: int) -> None:
+        b = self.registry.button(self.registry.id_at(to_index))
+        if b is None or from_index == to_index:
+            return
+        self.hbox.removeWidget(b)
+        self.hbox.insertWidget(to_index, b)
+
+    def count(self) -> int:
+        return self.hbox.count()
 
     def sync_with_tab_manager(self, tab_manager) -> None:
-        # Удаляем старые кнопки
-        for btn in self._buttons:
-            btn.clicked.disconnect()
-            btn.close_clicked.disconnect()
+        # deleteLater() drops the buttons' connections along with them.
+        while self.hbox.count():
+            btn = self.hbox.takeAt(0).widget()
+            if btn is None:
+                continue
+            self.registry.set_button(btn.tab_id, None)
             btn.setParent(None)
             btn.deleteLater()
         
-        self._buttons.clear()
+        self._current_id = 0
         
         count = tab_manager.count()
         for i in range(count):
             title = tab_manager.tabText(i) or f"Tab {i+1}"
-            b = _TabButton(i, title, parent=self.container)
-            b.clicked.connect(self._on_tab_clicked)  
-            b.close_clicked.connect(self._on_tab_close_clicked)  
+            b = self._create_button(tab_manager.tab_id_at(i), title)
             self.hbox.addWidget(b)
-            self._buttons.append(b)
         
-        cur = tab_manager.currentIndex()
-        self.set_current_index(cur)
-
-    def _on_tab_clicked(self, index: int) -> None:
-        self.tab_selected.emit(index)
-
-    def _on_tab_close_clicked(self, index: int) -> None:
-        self.tab_close_requested.emit(index)
+        self.set_current_tab(tab_manager.current_tab_id())
+
+    def _on_tab_clicked(self, tab_id: int) -> None:
+        self.tab_selected.emit(tab_id)
+
+    def _on_tab_close_clicked(self, tab_id: int) -> None:
+        self.tab_close_requested.emit(tab_id)
+
+    def _on_tab_drag_started(self, tab_id: int) -> None:
+        b = self.registry.button(tab_id)
+        drag_tab(self, tab_id, b.grab() if b is not None else None)
+
+    def _on_tab_menu_requested(self, tab_id: int, global_pos: QPoint) -> None:
+        exec_tab_menu(self, tab_id, global_pos)
+
+    def dragEnterEvent(self, event) -> None:
+        if dragged_tab_id(event.mimeData()):
+            event.acceptProposedAction()
+
+    def dropEvent(self, event) -> None:
+        tab_id = dragged_tab_id(event.mimeData())
+        if tab_id:
+            event.acceptProposedAction()
+            self.tab_dropped.emit(tab_id)
+
+    def set_current_tab(self, tab_id: int) -> None:
+        if tab_id == self._current_id:
+            return
+        old = self.registry.button(self._current_id)
+        if old is not None:
+            old.set_active(False)
+        btn = self.registry.button(tab_id)
+        if btn is not None:
+            btn.set_active(True)
+            self._current_id = tab_id
+        else:
+            self._current_id = 0
 
-    def set_current_index(self, index: int) -> None:
-        self._current_index = index
-        for btn in self._buttons:
-            btn.set_active(btn.index == index)
+    def update_tab_title(self, tab_id: int, title: str) -> None:
+        btn = self.registry.button(tab_id)
+        if btn is not None:
+            btn.set_title(title)
 
-    def update_tab_title(self, index: int, title: str) -> None:
-        for btn in self._buttons:
-            if btn.index == index:
-                btn.set_title(title)
-                break
+    def update_tab_icon(self, tab_id: int, pixmap: Optional[QPixmap]) -> None:
+        btn = self.registry.button(tab_id)
+        if btn is not None:
+            btn.set_icon(pixmap)
 
 
 __all__ = ["TabPanel"]
\ No newline at end of file
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import Any, Iterator, Optional
+
+from PySide6.QtWidgets import QWidget
+
+
+class TabRegistry:
+
+    def __init__(self, shared: Optional[TabRegistry] = None) -> None:
+        # Each window keeps its own order and buttons; ids and widgets are also held by the shared
+        # registry, so a tab keeps its id when it moves to another window.
+        self._shared = shared if shared is not None else self
+        self._next_id = 1
+        self._widgets: dict[int, QWidget] = {}
+        self._buttons: dict[int, Any] = {}
+        self._order: list[int] = []
+        self._positions: dict[int, int] = {}
+
+    def register(self, widget: QWidget) -> int:
+        shared = self._shared
+        tab_id = shared._next_id
+        shared._next_id += 1
+        self.adopt(tab_id, widget)
+        return tab_id
+
+    def adopt(self, tab_id: int, widget: QWidget) -> None:
+        self._widgets[tab_id] = widget
+        self._shared._widgets[tab_id] = widget
+
+    def release(self, tab_id: int) -> None:
+        # Leaves this window only; the shared entry stays for whichever window takes the tab next.
+        self.remove(tab_id)
+        self._widgets.pop(tab_id, None)
+        self._buttons.pop(tab_id, None)
+
+    def unregister(self, tab_id: int) -> None:
+        self.release(tab_id)
+        self._shared._widgets.pop(tab_id, None)
+
+    def insert(self, tab_id: int, position: int) -> None:
+        if tab_id in self._positions:
+            self.remove(tab_id)
+        position = max(0, min(position, len(self._order)))
+        self._order.insert(position, tab_id)
+        self._renumber(position, len(self._order))
+
+    def remove(self, tab_id: int) -> None:
+        position = self._positions.pop(tab_id, None)
+        if position is None:
+            return
+        del self._order[position]
+        self._renumber(position, len(self._order))
+
+    def move(self, from_position: int, to_position: int) -> None:
+        n = len(self._order)
+        if from_position == to_position or not 0 <= from_position < n or not 0 <= to_position < n:
+            return
+        self._order.insert(to_position, self._order.pop(from_position))
+        self._renumber(min(from_position, to_position), max(from_position, to_position) + 1)
+
+    def _renumber(self, start: int, stop: int) -> None:
+        order, positions = self._order, self._positions
+        for i in range(start, stop):
+            positions[order[i]] = i
+
+    def widget(self, tab_id: int) -> Optional[QWidget]:
+        return self._widgets.get(tab_id)
+
+    def button(self, tab_id: int) -> Any:
+        return self._buttons.get(tab_id)
+
+    def set_button(self, tab_id: int, button: Any) -> None:
+        if button is None:
+            self._buttons.pop(tab_id, None)
+        else:
+            self._buttons[tab_id] = button
+
+    def position(self, tab_id: int) -> int:
+        return self._positions.get(tab_id, -1)
+
+    def id_at(self, position: int) -> int:
+        if 0 <= position < len(self._order):
+            return self._order[position]
+        return 0
+
+    def ids(self) -> Iterator[int]:
+        return iter(self._order)
+
+    def __contains__(self, tab_id: int) -> bool:
+        return tab_id in self._widgets
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+
+_tab_registry: Optional[TabRegistry] = None
+
+
+def get_tab_registry() -> TabRegistry:
+    global _tab_registry
+    if _tab_registry is None:
+        _tab_registry = TabRegistry()
+    return _tab_registry
+
+
+__all__ = ["TabRegistry", "get_tab_registry"]
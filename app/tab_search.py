@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import queue
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from PySide6.QtCore import Qt, QObject, QTimer, Signal
+
+from app.lifecycle import LifecycleState
+
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w{2,}", re.UNICODE)
+
+
+def tokenize(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+
+@dataclass
+class TabMatch:
+    tab_id: int
+    score: float
+    title: str
+    url: str
+    snippet: str
+
+
+class TextIndex:
+    # Inverted index over tab text. Only the worker thread touches it.
+
+    K1 = 1.2
+    B = 0.75
+    TITLE_WEIGHT = 3
+    MAX_TERMS_PER_TAB = 5000
+    MAX_TEXT_CHARS = 32_000
+    MAX_POSTINGS = 1_500_000
+
+    def __init__(self) -> None:
+        self.postings: dict[str, dict[int, int]] = {}
+        self.docs: OrderedDict[int, tuple[str, str, str, dict[str, int], int]] = OrderedDict()
+        self.total_postings = 0
+        self._total_length = 0
+        self._vocab: list[str] = []
+        self._vocab_dirty = False
+
+    def update(self, tab_id: int, url: str, title: str, text: str) -> None:
+        self.remove(tab_id)
+        counts = Counter(tokenize(text))
+        for term in tokenize(title):
+            counts[term] += self.TITLE_WEIGHT
+        length = sum(counts.values())
+        if len(counts) > self.MAX_TERMS_PER_TAB:
+            counts = Counter(dict(counts.most_common(self.MAX_TERMS_PER_TAB)))
+        terms = dict(counts)
+        for term, tf in terms.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = {}
+                self._vocab_dirty = True
+            posting[tab_id] = tf
+        self.docs[tab_id] = (url, title, text[:self.MAX_TEXT_CHARS], terms, length)
+        self.total_postings += len(terms)
+        self._total_length += length
+        # Past the budget the tabs indexed longest ago go first.
+        while self.total_postings > self.MAX_POSTINGS and len(self.docs) > 1:
+            self.remove(next(iter(self.docs)))
+
+    def remove(self, tab_id: int) -> None:
+        doc = self.docs.pop(tab_id, None)
+        if doc is None:
+            return
+        terms, length = doc[3], doc[4]
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(tab_id, None)
+            if not posting:
+                del self.postings[term]
+                self._vocab_dirty = True
+        self.total_postings -= len(terms)
+        self._total_length -= length
+
+    def _expand(self, prefix: str) -> list[str]:
+        if self._vocab_dirty:
+            self._vocab = sorted(self.postings)
+            self._vocab_dirty = False
+        start = bisect.bisect_left(self._vocab, prefix)
+        out = []
+        for term in self._vocab[start:start + 64]:
+            if not term.startswith(prefix):
+                break
+            out.append(term)
+        return out
+
+    def search(self, query: str, limit: int = 50) -> list[TabMatch]:
+        terms = tokenize(query)
+        if not terms or not self.docs:
+            return []
+        n = len(self.docs)
+        avg_length = self._total_length / n if n else 1.0
+        scores: Optional[dict[int, float]] = None
+        for i, term in enumerate(terms):
+            # The last word is still being typed, so it matches as a prefix.
+            candidates = self._expand(term) if i == len(terms) - 1 else [term]
+            term_scores: dict[int, float] = {}
+            for candidate in candidates:
+                posting = self.postings.get(candidate)
+                if not posting:
+                    continue
+                idf = math.log(1.0 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                for tab_id, tf in posting.items():
+                    length = self.docs[tab_id][4]
+                    s = idf * tf * (self.K1 + 1) / (tf + self.K1 * (1 - self.B + self.B * length / avg_length))
+                    if s > term_scores.get(tab_id, 0.0):
+                        term_scores[tab_id] = s
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {tab_id: s + term_scores[tab_id] for tab_id, s in scores.items() if tab_id in term_scores}
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+        out = []
+        for tab_id, score in ranked:
+            url, title, text, _, _ = self.docs[tab_id]
+            out.append(TabMatch(tab_id, score, title, url, snippet(text, terms)))
+        return out
+
+
+def snippet(text: str, terms: list[str], width: int = 160) -> str:
+    lower = text.lower()
+    at = -1
+    for term in terms:
+        at = lower.find(term)
+        if at >= 0:
+            break
+    if at < 0:
+        return " ".join(text[:width].split())
+    start = max(0, at - width // 3)
+    piece = " ".join(text[start:start + width].split())
+    return ("…" if start else "") + piece + ("…" if start + width < len(text) else "")
+
+
+class TabSearchIndex(QObject):
+
+    results_ready = Signal(int, list)
+
+    DEBOUNCE_MS = 1500
+    MAX_READ_CHARS = 200_000
+
+    def __init__(self, tab_manager, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._tabs = tab_manager
+        self._seq = 0
+        # tab_id -> monotonic deadline; a page that keeps loading is read once it settles.
+        self._due: dict[int, float] = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.CoarseTimer)
+        self._timer.timeout.connect(self._flush)
+
+        self._index = TextIndex()
+        self._jobs: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def schedule(self, tab_id: int) -> None:
+        self._due[tab_id] = time.monotonic() + self.DEBOUNCE_MS / 1000.0
+        if not self._timer.isActive():
+            self._timer.start(self.DEBOUNCE_MS)
+
+    def forget(self, tab_id: int) -> None:
+        self._due.pop(tab_id, None)
+        self._submit(("remove", tab_id))
+
+    def search(self, query: str) -> int:
+        self._seq += 1
+        self._submit(("search", self._seq, query))
+        return self._seq
+
+    def latest_seq(self) -> int:
+        return self._seq
+
+    def close(self) -> None:
+        self._closed = True
+        self._timer.stop()
+        self._due.clear()
+        if self._thread is not None:
+            self._jobs.put(("close",))
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _flush(self) -> None:
+        now = time.monotonic()
+        for tab_id, deadline in list(self._due.items()):
+            if deadline <= now:
+                del self._due[tab_id]
+                self._read(tab_id)
+        if self._due:
+            self._timer.start(max(0, int((min(self._due.values()) - now) * 1000)))
+
+    def _read(self, tab_id: int) -> None:
+        tab = self._tabs.tab(tab_id)
+        page = tab.page() if tab is not None else None
+        # A discarded tab keeps whatever was indexed before it was dropped.
+        if page is None or tab.lifecycle_state() != LifecycleState.Active:
+            return
+        url = page.url().toString()
+        title = page.title()
+
+        def _on_text(text: str, tid: int = tab_id) -> None:
+            if not self._closed and tid in self._tabs.registry:
+                self._submit(("update", tid, url, title, (text or "")[:self.MAX_READ_CHARS]))
+
+        page.toPlainText(_on_text)
+
+    def _submit(self, job: tuple) -> None:
+        if self._closed:
+            return
+        self._jobs.put(job)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="tab-search-index", daemon=True)
+            self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job[0] == "close":
+                # Drop the postings with the thread rather than with the window's Python wrapper.
+                self._index = TextIndex()
+                return
+            try:
+                if job[0] == "update":
+                    self._index.update(*job[1:])
+                elif job[0] == "remove":
+                    self._index.remove(job[1])
+                elif job[0] == "search":
+                    self.results_ready.emit(job[1], self._index.search(job[2]))
+            except Exception:
+                logger.exception("Tab search job %s failed", job[0])
+
+
+__all__ = ["TabSearchIndex", "TextIndex", "TabMatch", "tokenize", "snippet"]
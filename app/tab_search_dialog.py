@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from PySide6.QtCore import Qt, Signal, QTimer
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QLabel, QWidget
+)
+
+from app.tab_search import TabSearchIndex
+
+
+class TabSearchDialog(QDialog):
+
+    match_activated = Signal(int, str)
+
+    SEARCH_DELAY_MS = 150
+
+    def __init__(self, index: TabSearchIndex, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Search open tabs")
+        self.resize(720, 480)
+        self._index = index
+        self._seq = 0
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 12, 12, 12)
+        layout.setSpacing(8)
+
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("Find text in open tabs")
+        self.search.setClearButtonEnabled(True)
+        layout.addWidget(self.search)
+
+        self.results = QListWidget()
+        self.results.setWordWrap(True)
+        self.results.setAlternatingRowColors(False)
+        layout.addWidget(self.results, 1)
+
+        self.status_lbl = QLabel("")
+        layout.addWidget(self.status_lbl)
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self._run_search)
+
+        self.search.textChanged.connect(lambda _: self._search_timer.start())
+        self.search.returnPressed.connect(self._activate_current)
+        self.results.itemActivated.connect(self._on_item_activated)
+        index.results_ready.connect(self._on_results)
+
+    def _run_search(self) -> None:
+        query = self.search.text().strip()
+        if not query:
+            self._seq = 0
+            self.results.clear()
+            self.status_lbl.setText("")
+            return
+        self._seq = self._index.search(query)
+
+    def _on_results(self, seq: int, matches: list) -> None:
+        if seq != self._seq:
+            return
+        self.results.clear()
+        for match in matches:
+            item = QListWidgetItem(f"{match.title or match.url}\n{match.snippet}")
+            item.setToolTip(match.url)
+            item.setData(Qt.UserRole, match.tab_id)
+            self.results.addItem(item)
+        if matches:
+            self.results.setCurrentRow(0)
+        self.status_lbl.setText(f"{len(matches)} tabs match" if matches else "No open tab matches")
+
+    def _activate_current(self) -> None:
+        item = self.results.currentItem()
+        if item is not None:
+            self._on_item_activated(item)
+
+    def _on_item_activated(self, item: QListWidgetItem) -> None:
+        self.match_activated.emit(int(item.data(Qt.UserRole)), self.search.text().strip())
+        self.accept()
+
+
+__all__ = ["TabSearchDialog"]
@@ -0,0 +1,482 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from PySide6.QtCore import (
+    Qt, Signal, QSize, QRect, QPoint, QModelIndex, QAbstractListModel, QPersistentModelIndex
+)
+from PySide6.QtGui import QPainter, QColor, QPen, QPixmap
+from PySide6.QtWidgets import (
+    QWidget, QHBoxLayout, QPushButton, QAbstractScrollArea, QSizePolicy, QApplication
+)
+
+from app.tab_drag import drag_tab, dragged_tab_id, exec_tab_menu
+from app.tab_registry import TabRegistry
+from app.theme import ThemeManager, get_theme_manager
+
+
+class TabListModel(QAbstractListModel):
+
+    TabIdRole = Qt.UserRole + 1
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._ids: list[int] = []
+        # tab_id -> row, so title and icon updates do not scan the list.
+        self._rows: dict[int, int] = {}
+        self._titles: dict[int, str] = {}
+        self._icons: dict[int, QPixmap] = {}
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._ids)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._ids):
+            return None
+        tab_id = self._ids[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._titles[tab_id]
+        if role == Qt.DecorationRole:
+            return self._icons.get(tab_id)
+        if role == self.TabIdRole:
+            return tab_id
+        return None
+
+    def title(self, row: int) -> str:
+        return self._titles[self._ids[row]]
+
+    def icon(self, row: int) -> Optional[QPixmap]:
+        return self._icons.get(self._ids[row])
+
+    def row_of(self, tab_id: int) -> int:
+        return self._rows.get(tab_id, -1)
+
+    def _reindex(self, first: int = 0) -> None:
+        for row in range(first, len(self._ids)):
+            self._rows[self._ids[row]] = row
+
+    def id_at(self, row: int) -> int:
+        return self._ids[row] if 0 <= row < len(self._ids) else 0
+
+    def insert_tab(self, row: int, tab_id: int, title: str) -> None:
+        row = max(0, min(row, len(self._ids)))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._ids.insert(row, tab_id)
+        self._reindex(row)
+        self._titles[tab_id] = title
+        self.endInsertRows()
+
+    def remove_tab(self, row: int) -> None:
+        if not 0 <= row < len(self._ids):
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        tab_id = self._ids.pop(row)
+        del self._rows[tab_id]
+        self._reindex(row)
+        self._titles.pop(tab_id, None)
+        self._icons.pop(tab_id, None)
+        self.endRemoveRows()
+
+    def move_tab(self, from_row: int, to_row: int) -> None:
+        n = len(self._ids)
+        if from_row == to_row or not 0 <= from_row < n or not 0 <= to_row < n:
+            return
+        # beginMoveRows expects the destination as an insertion point in the old list.
+        dest = to_row + 1 if to_row > from_row else to_row
+        self.beginMoveRows(QModelIndex(), from_row, from_row, QModelIndex(), dest)
+        self._ids.insert(to_row, self._ids.pop(from_row))
+        self._reindex(min(from_row, to_row))
+        self.endMoveRows()
+
+    def set_title(self, row: int, title: str) -> None:
+        if not 0 <= row < len(self._ids):
+            return
+        tab_id = self._ids[row]
+        if self._titles.get(tab_id) == title:
+            return
+        self._titles[tab_id] = title
+        idx = self.index(row)
+        self.dataChanged.emit(idx, idx, [Qt.DisplayRole])
+
+    def set_icon(self, row: int, pixmap: Optional[QPixmap]) -> None:
+        if not 0 <= row < len(self._ids):
+            return
+        tab_id = self._ids[row]
+        if pixmap is None:
+            if self._icons.pop(tab_id, None) is None:
+                return
+        else:
+            self._icons[tab_id] = pixmap
+        idx = self.index(row)
+        self.dataChanged.emit(idx, idx, [Qt.DecorationRole])
+
+    def reset(self, entries: list[tuple[int, str]]) -> None:
+        self.beginResetModel()
+        self._ids = [tab_id for tab_id, _ in entries]
+        self._rows = {}
+        self._reindex()
+        self._titles = dict(entries)
+        self._icons = {tab_id: pix for tab_id, pix in self._icons.items() if tab_id in self._titles}
+        self.endResetModel()
+
+
+class _TabDelegate:
+
+    TEXT = QColor(255, 255, 255, 230)
+    CLOSE = QColor(255, 255, 255, 153)
+    CLOSE_HOVER = QColor(255, 255, 255, 230)
+    CLOSE_HOVER_BG = QColor(255, 255, 255, 26)
+    ACTIVE_BG = QColor(255, 255, 255, 15)
+    HOVER_BG = QColor(255, 255, 255, 8)
+    ACCENT = QColor(0x4A, 0x9E, 0xFF)
+
+    CLOSE_SIZE = 16
+    ICON_SIZE = 16
+
+    def apply_theme(self, themes: ThemeManager) -> None:
+        self.TEXT = themes.color("text_tab")
+        self.CLOSE = themes.color("text_muted")
+        self.CLOSE_HOVER = themes.color("text_tab")
+        self.CLOSE_HOVER_BG = themes.color("control_soft_hover")
+        self.ACTIVE_BG = themes.color("tab_active")
+        self.HOVER_BG = themes.color("tab_hover")
+        self.ACCENT = themes.color("accent")
+
+    def close_rect(self, rect: QRect) -> QRect:
+        s = self.CLOSE_SIZE
+        return QRect(rect.right() - s - 6, rect.center().y() - s // 2 + 1, s, s)
+
+    def paint(self, painter: QPainter, rect: QRect, title: str, icon: Optional[QPixmap],
+              active: bool, hovered: bool, close_hovered: bool) -> None:
+        body = rect.adjusted(4, 2, -4, -2)
+        if active or hovered:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.ACTIVE_BG if active else self.HOVER_BG)
+            painter.drawRoundedRect(body, 4, 4)
+        if active:
+            painter.fillRect(QRect(body.left(), body.bottom() - 1, body.width(), 2), self.ACCENT)
+
+        close = self.close_rect(rect)
+        left = body.left() + 4
+        if icon is not None:
+            s = self.ICON_SIZE
+            painter.drawPixmap(QRect(left, body.center().y() - s // 2 + 1, s, s), icon)
+            left += s + 6
+        text_rect = QRect(left, body.top(), close.left() - left - 4, body.height())
+        fm = painter.fontMetrics()
+        painter.setPen(QPen(self.TEXT))
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                         fm.elidedText(title, Qt.ElideRight, text_rect.width()))
+
+        if close_hovered:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.CLOSE_HOVER_BG)
+            painter.drawEllipse(close)
+        painter.setPen(QPen(self.CLOSE_HOVER if close_hovered else self.CLOSE))
+        f = painter.font()
+        f.setPixelSize(10)
+        painter.save()
+        painter.setFont(f)
+        painter.drawText(close, Qt.AlignCenter, "✕")
+        painter.restore()
+
+
+class TabStripView(QAbstractScrollArea):
+
+    tab_clicked = Signal(int)
+    close_clicked = Signal(int)
+    drag_started = Signal(int)
+    menu_requested = Signal(int, QPoint)
+
+    TAB_WIDTH = 140
+    SPACING = 3
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._model: Optional[TabListModel] = None
+        self._delegate = _TabDelegate()
+        self._current = QPersistentModelIndex()
+        self._hover_row = -1
+        self._hover_close = False
+        self._pressed = (-1, False)
+        self._press_pos: Optional[QPoint] = None
+
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setFrameShape(QAbstractScrollArea.NoFrame)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setFixedHeight(36)
+        self.viewport().setMouseTracking(True)
+        self.viewport().setAutoFillBackground(False)
+        self.horizontalScrollBar().valueChanged.connect(self.viewport().update)
+
+        themes = get_theme_manager()
+        self._delegate.apply_theme(themes)
+        themes.theme_changed.connect(self._on_theme_changed)
+
+    def _on_theme_changed(self, _name: str) -> None:
+        self._delegate.apply_theme(get_theme_manager())
+        self.viewport().update()
+
+    def setModel(self, model: TabListModel) -> None:
+        self._model = model
+        model.rowsInserted.connect(self._on_layout_changed)
+        model.rowsRemoved.connect(self._on_layout_changed)
+        model.rowsMoved.connect(self._on_layout_changed)
+        model.modelReset.connect(self._on_layout_changed)
+        model.dataChanged.connect(self._on_data_changed)
+        self._on_layout_changed()
+
+    def model(self) -> Optional[TabListModel]:
+        return self._model
+
+    def set_current_row(self, row: int) -> None:
+        old = self._current.row() if self._current.isValid() else -1
+        if row == old:
+            return
+        self._current = QPersistentModelIndex(self._model.index(row)) if self._model else QPersistentModelIndex()
+        self._update_row(old)
+        self._update_row(row)
+        self.ensure_visible(row)
+
+    def current_row(self) -> int:
+        return self._current.row() if self._current.isValid() else -1
+
+    def ensure_visible(self, row: int) -> None:
+        if row < 0:
+            return
+        rect = self._row_rect(row)
+        bar = self.horizontalScrollBar()
+        offset = bar.value()
+        if rect.left() < 0:
+            bar.setValue(offset + rect.left())
+        elif rect.right() > self.viewport().width():
+            bar.setValue(offset + rect.right() - self.viewport().width())
+
+    def row_at(self, x: int) -> int:
+        if self._model is None:
+            return -1
+        stride = self.TAB_WIDTH + self.SPACING
+        pos = x + self.horizontalScrollBar().value()
+        row = pos // stride
+        if pos < 0 or pos - row * stride >= self.TAB_WIDTH or row >= self._model.rowCount():
+            return -1
+        return row
+
+    def _row_rect(self, row: int) -> QRect:
+        stride = self.TAB_WIDTH + self.SPACING
+        x = row * stride - self.horizontalScrollBar().value()
+        return QRect(x, 0, self.TAB_WIDTH, self.viewport().height())
+
+    def row_pixmap(self, row: int) -> QPixmap:
+        return self.viewport().grab(self._row_rect(row))
+
+    def _update_row(self, row: int) -> None:
+        if row >= 0:
+            self.viewport().update(self._row_rect(row))
+
+    def _on_layout_changed(self, *args) -> None:
+        self._hover_row = -1
+        self._update_scroll_range()
+        self.viewport().update()
+
+    def _on_data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=None) -> None:
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self._update_row(row)
+
+    def _update_scroll_range(self) -> None:
+        count = self._model.rowCount() if self._model else 0
+        total = count * (self.TAB_WIDTH + self.SPACING)
+        bar = self.horizontalScrollBar()
+        bar.setRange(0, max(0, total - self.viewport().width()))
+        bar.setPageStep(self.viewport().width())
+        bar.setSingleStep(self.TAB_WIDTH // 2)
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._update_scroll_range()
+
+    def paintEvent(self, event) -> None:
+        if self._model is None:
+            return
+        count = self._model.rowCount()
+        if count == 0:
+            return
+        stride = self.TAB_WIDTH + self.SPACING
+        offset = self.horizontalScrollBar().value()
+        clip = event.rect()
+        first = max(0, (clip.left() + offset) // stride)
+        last = min(count - 1, (clip.right() + offset) // stride)
+
+        painter = QPainter(self.viewport())
+        painter.setRenderHint(QPainter.Antialiasing)
+        current = self.current_row()
+        for row in range(first, last + 1):
+            self._delegate.paint(
+                painter, self._row_rect(row), self._model.title(row), self._model.icon(row),
+                row == current, row == self._hover_row,
+                row == self._hover_row and self._hover_close,
+            )
+        painter.end()
+
+    def _hit(self, pos) -> tuple[int, bool]:
+        row = self.row_at(int(pos.x()))
+        if row < 0:
+            return -1, False
+        return row, self._delegate.close_rect(self._row_rect(row)).contains(pos.toPoint())
+
+    def mouseMoveEvent(self, event) -> None:
+        if self._press_pos is not None and event.buttons() & Qt.LeftButton:
+            if (event.position().toPoint() - self._press_pos).manhattanLength() >= QApplication.startDragDistance():
+                row = self._pressed[0]
+                self._press_pos = None
+                self._pressed = (-1, False)
+                self.drag_started.emit(row)
+                return
+        row, on_close = self._hit(event.position())
+        if (row, on_close) != (self._hover_row, self._hover_close):
+            old = self._hover_row
+            self._hover_row, self._hover_close = row, on_close
+            self._update_row(old)
+            if row != old:
+                self._update_row(row)
+            self.viewport().setCursor(Qt.PointingHandCursor if row >= 0 else Qt.ArrowCursor)
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event) -> None:
+        old = self._hover_row
+        self._hover_row, self._hover_close = -1, False
+        self._update_row(old)
+        super().leaveEvent(event)
+
+    def mousePressEvent(self, event) -> None:
+        if event.button() == Qt.LeftButton:
+            self._pressed = self._hit(event.position())
+            row, on_close = self._pressed
+            self._press_pos = event.position().toPoint() if row >= 0 and not on_close else None
+        elif event.button() == Qt.MiddleButton:
+            self._pressed = (self._hit(event.position())[0], True)
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event) -> None:
+        pressed, self._pressed = self._pressed, (-1, False)
+        self._press_pos = None
+        if event.button() in (Qt.LeftButton, Qt.MiddleButton):
+            row, on_close = self._hit(event.position())
+            if event.button() == Qt.MiddleButton:
+                on_close = True
+            if row >= 0 and (row, on_close) == pressed:
+                if on_close:
+                    self.close_clicked.emit(row)
+                else:
+                    self.tab_clicked.emit(row)
+        super().mouseReleaseEvent(event)
+
+    def contextMenuEvent(self, event) -> None:
+        row = self.row_at(event.pos().x())
+        if row >= 0:
+            self.menu_requested.emit(row, event.globalPos())
+        event.accept()
+
+    def wheelEvent(self, event) -> None:
+        delta = event.angleDelta()
+        step = delta.x() or delta.y()
+        bar = self.horizontalScrollBar()
+        bar.setValue(bar.value() - step)
+        event.accept()
+
+    def sizeHint(self) -> QSize:
+        return QSize(400, 36)
+
+
+class TabStrip(QWidget):
+
+    tab_selected = Signal(int)
+    tab_close_requested = Signal(int)
+    new_tab_requested = Signal()
+    tab_detach_requested = Signal(int)
+    tab_dropped = Signal(int)
+
+    def __init__(self, registry: TabRegistry, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.registry = registry
+        self.setAcceptDrops(True)
+
+        self.setMaximumHeight(40)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+        layout.setSpacing(4)
+
+        self.model = TabListModel(self)
+        self.view = TabStripView(self)
+        self.view.setObjectName("tab_strip_view")
+        self.view.setModel(self.model)
+        self.view.tab_clicked.connect(lambda row: self.tab_selected.emit(self.model.id_at(row)))
+        self.view.close_clicked.connect(lambda row: self.tab_close_requested.emit(self.model.id_at(row)))
+        self.view.drag_started.connect(self._on_drag_started)
+        self.view.menu_requested.connect(self._on_menu_requested)
+        layout.addWidget(self.view, 1)
+
+        self.new_btn = QPushButton("+")
+        self.new_btn.setObjectName("tab_new")
+        self.new_btn.setFixedSize(24, 24)
+        self.new_btn.clicked.connect(lambda: self.new_tab_requested.emit())
+        layout.addWidget(self.new_btn)
+
+    def insert_tab(self, tab_id: int, title: str) -> None:
+        position = self.registry.position(tab_id)
+        if position < 0:
+            position = self.model.rowCount()
+        self.model.insert_tab(position, tab_id, title or f"Tab {position+1}")
+
+    def remove_tab(self, tab_id: int) -> None:
+        # The registry has already dropped this position, so look the row up locally.
+        self.model.remove_tab(self.model.row_of(tab_id))
+
+    def move_tab(self, from_index: int, to_index: int) -> None:
+        self.model.move_tab(from_index, to_index)
+
+    def count(self) -> int:
+        return self.model.rowCount()
+
+    def _on_drag_started(self, row: int) -> None:
+        tab_id = self.model.id_at(row)
+        if tab_id:
+            drag_tab(self, tab_id, self.view.row_pixmap(row))
+
+    def _on_menu_requested(self, row: int, global_pos: QPoint) -> None:
+        tab_id = self.model.id_at(row)
+        if tab_id:
+            exec_tab_menu(self, tab_id, global_pos)
+
+    def dragEnterEvent(self, event) -> None:
+        if dragged_tab_id(event.mimeData()):
+            event.acceptProposedAction()
+
+    def dropEvent(self, event) -> None:
+        tab_id = dragged_tab_id(event.mimeData())
+        if tab_id:
+            event.acceptProposedAction()
+            self.tab_dropped.emit(tab_id)
+
+    def sync_with_tab_manager(self, tab_manager) -> None:
+        self.model.reset([
+            (tab_manager.tab_id_at(i), tab_manager.tabText(i) or f"Tab {i+1}")
+            for i in range(tab_manager.count())
+        ])
+        self.set_current_tab(tab_manager.current_tab_id())
+
+    def set_current_tab(self, tab_id: int) -> None:
+        # Rows come from the model, as in remove_tab; the registry can be ahead of it mid-update.
+        self.view.set_current_row(self.model.row_of(tab_id))
+
+    def update_tab_title(self, tab_id: int, title: str) -> None:
+        self.model.set_title(self.model.row_of(tab_id), title)
+
+    def update_tab_icon(self, tab_id: int, pixmap: Optional[QPixmap]) -> None:
+        self.model.set_icon(self.model.row_of(tab_id), pixmap)
+
+
+__all__ = ["TabListModel", "TabStripView", "TabStrip"]
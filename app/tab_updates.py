@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from PySide6.QtCore import QObject, QTimer, QUrl, Signal
+
+
+class TabUpdateCoalescer(QObject):
+
+    url_ready = Signal(int, QUrl)
+    title_ready = Signal(int, str)
+
+    FRAME_MS = 16
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._urls: dict[int, QUrl] = {}
+        self._titles: dict[int, str] = {}
+        self.received = 0
+        self.dropped = 0
+        self.flushes = 0
+
+        self._frame = QTimer(self)
+        self._frame.setSingleShot(True)
+        self._frame.setInterval(self.FRAME_MS)
+        self._frame.timeout.connect(self.flush)
+
+    def push_url(self, tab_id: int, url: QUrl) -> None:
+        # pushState routers can change the URL many times per frame; only the last one is shown.
+        self.received += 1
+        if tab_id in self._urls:
+            self.dropped += 1
+        self._urls[tab_id] = QUrl(url)
+        self._schedule()
+
+    def push_title(self, tab_id: int, title: str) -> None:
+        self.received += 1
+        if tab_id in self._titles:
+            self.dropped += 1
+        self._titles[tab_id] = title
+        self._schedule()
+
+    def forget(self, tab_id: int) -> None:
+        self._urls.pop(tab_id, None)
+        self._titles.pop(tab_id, None)
+
+    def flush(self) -> None:
+        self._frame.stop()
+        urls, self._urls = self._urls, {}
+        titles, self._titles = self._titles, {}
+        if not urls and not titles:
+            return
+        self.flushes += 1
+        for tab_id, url in urls.items():
+            self.url_ready.emit(tab_id, url)
+        for tab_id, title in titles.items():
+            self.title_ready.emit(tab_id, title)
+
+    def stats(self) -> dict:
+        return {"received": self.received, "dropped": self.dropped, "flushes": self.flushes}
+
+    def _schedule(self) -> None:
+        if not self._frame.isActive():
+            self._frame.start()
+
+
+__all__ = ["TabUpdateCoalescer"]
@@ -1,84 +1,352 @@
 from __future__ import annotations
 
-from typing import Optional
+import time
+from typing import Iterator, Optional
 
-from PySide6.QtCore import Qt, QUrl, Signal, Slot
-from PySide6.QtWidgets import QTabWidget, QWidget, QVBoxLayout, QMenu
+from PySide6.QtCore import QObject, QUrl, Signal, Slot
+from PySide6.QtGui import QIcon
+from PySide6.QtWidgets import QTabWidget, QWidget, QVBoxLayout
+from PySide6.QtWebEngineCore import QWebEnginePage
 from PySide6.QtWebEngineWidgets import QWebEngineView
 
+from app.browser_view import BrowserView
+from app.lifecycle import TabLifecycleManager
+from app.profile import get_profile_manager
+from app.session import serialize_history, restore_history
+from app.tab_registry import TabRegistry
+from app.tab_updates import TabUpdateCoalescer
+
 
 class BrowserTab(QWidget):
 
-    def __init__(self, url: str = "https://www.google.com"):
+    url_changed = Signal(QUrl)
+    title_changed = Signal(str)
+    icon_changed = Signal(QIcon)
+    load_finished = Signal(bool)
+    new_tab_requested = Signal(QUrl)
+    view_created = Signal()
+
+    def __init__(self, url: Optional[str] = "https://www.google.com", lazy: bool = False,
+                 title: str = "", history: Optional[str] = None):
         super().__init__()
-        self.view = QWebEngineView(self)
+        self.view: Optional[BrowserView] = None
+        self.last_active = time.monotonic()
+        self.tab_id = 0
+        self.create_window_handler = None
+
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+
+        # A tab adopted from createWindow() has its first navigation driven by the opener.
+        if url is not None:
+            if not isinstance(url, str):
+                url = "https://www.google.com"
+            q = QUrl(url)
+            if not q.isValid():
+                q = QUrl("https://www.google.com")
+        else:
+            q = QUrl()
+
+        self._pending_url = q
+        self._pending_title = title
+        self._pending_history = history
+
+        if not lazy:
+            self.materialize()
 
-        if not isinstance(url, str):
-            url = "https://www.google.com"
+    def is_materialized(self) -> bool:
+        return self.view is not None
 
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(self.view)
+    def materialize(self) -> BrowserView:
+        if self.view is not None:
+            return self.view
 
-        q = QUrl(url)
-        if not q.isValid():
-            q = QUrl("https://www.google.com")
+        self.view = get_profile_manager().create_view(self)
+        self.view.urlChanged.connect(self.url_changed)
+        self.view.titleChanged.connect(self.title_changed)
+        self.view.iconChanged.connect(self.icon_changed)
+        self.view.loadFinished.connect(self.load_finished)
+        self.view.new_tab_requested.connect(self.new_tab_requested)
+        self.view.create_window_handler = self._create_window
+        self._layout.addWidget(self.view)
 
-        self.setUrl(q)
+        history, self._pending_history = self._pending_history, None
+        if not (history and restore_history(self.view.history(), history)):
+            if not self._pending_url.isEmpty():
+                self.view.setUrl(self._pending_url)
+
+        self.view_created.emit()
+        return self.view
+
+    def _create_window(self, window_type):
+        if self.create_window_handler is None:
+            return None
+        return self.create_window_handler(window_type)
 
     def setUrl(self, url: str | QUrl) -> None:
         q = QUrl(url) if isinstance(url, str) else url
         if q.isValid():
-            self.view.setUrl(q)
+            self.materialize().setUrl(q)
 
-    def url(self):
+    def url(self) -> QUrl:
+        if self.view is None:
+            return QUrl(self._pending_url)
         return self.view.url()
 
+    def title(self) -> str:
+        if self.view is None:
+            return self._pending_title
+        return self.view.title()
+
+    def session_entry(self) -> dict:
+        entry = {"url": self.url().toString(), "title": self.title()}
+        if self.view is not None:
+            history = serialize_history(self.view.history())
+        else:
+            history = self._pending_history
+        if history:
+            entry["history"] = history
+        return entry
+
     def back(self) -> None:
-        self.view.back()
+        self.materialize().back()
 
     def forward(self) -> None:
-        self.view.forward()
+        self.materialize().forward()
 
     def reload(self) -> None:
-        self.view.reload()
+        self.materialize().reload()
+
+    def page(self) -> Optional[QWebEnginePage]:
+        return self.view.page() if self.view is not None else None
+
+    def lifecycle_state(self) -> QWebEnginePage.LifecycleState:
+        # A placeholder holds no renderer, which is what a discarded page looks like.
+        if self.view is None:
+            return QWebEnginePage.LifecycleState.Discarded
+        return self.view.page().lifecycleState()
+
+    def render_process_pid(self) -> int:
+        if self.view is None:
+            return 0
+        try:
+            return int(self.view.page().renderProcessPid())
+        except Exception:
+            return 0
 
 
 class TabManager(QTabWidget):
 
     tab_url_changed = Signal(int, QUrl)
+    # Fires for every navigation, uncoalesced; history must see each hop of a redirect chain.
+    tab_navigated = Signal(int, QUrl)
     tab_title_changed = Signal(int, str)
-
-    def __init__(self, parent: Optional[QWidget] = None) -> None:
+    tab_icon_changed = Signal(int, QIcon)
+    tab_load_finished = Signal(int, bool)
+    tab_deactivating = Signal(int)
+    tab_inserted = Signal(int)
+    tab_removed = Signal(int)
+    tab_moved = Signal(int, int)
+
+    def __init__(self, parent: Optional[QWidget] = None, registry: Optional[TabRegistry] = None) -> None:
         super().__init__(parent)
+        self.registry = registry if registry is not None else TabRegistry()
         self.setTabsClosable(True)
         self.setMovable(True)
 
-        self.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.customContextMenuRequested.connect(self._on_context_menu)
-
         self.tabCloseRequested.connect(self._on_tab_close_requested)
+        self.tabBar().tabMoved.connect(self._on_tab_moved)
 
-    def add_tab(self, url: str = "https://www.google.com", label: str = "New Tab") -> int:
-        tab = BrowserTab(url)
-        index = self.addTab(tab, label)
-        self.setCurrentIndex(index)
+        self._restoring = False
+        self.currentChanged.connect(self._materialize_current)
+
+        # Per-tab signal connections, dropped when a tab moves to another window.
+        self._connections: dict[int, list] = {}
+        self._detaching = 0
+
+        # Title and URL changes reach listeners at most once per frame per tab.
+        self.updates = TabUpdateCoalescer(self)
+        self.updates.url_ready.connect(self._on_url_changed)
+        self.updates.title_ready.connect(self._on_title_changed)
 
-        view = tab.view
+        self.lifecycle = TabLifecycleManager(self)
 
-        view.urlChanged.connect(lambda q, idx=index: self._on_url_changed(idx, q))
-        view.titleChanged.connect(lambda t, idx=index: self._on_title_changed(idx, t))
+    def add_tab(self, url: Optional[str] = "https://www.google.com", label: str = "New Tab",
+                activate: bool = True, lazy: bool = False, history: Optional[str] = None) -> int:
+        tab = BrowserTab(url, lazy=lazy, title=label, history=history)
+        tab_id = self.registry.register(tab)
+        tab.tab_id = tab_id
+        self._attach(tab)
 
-        return index
+        index = self.addTab(tab, label)
+        if activate:
+            self.setCurrentIndex(index)
+        return tab_id
+
+    def _attach(self, tab: BrowserTab) -> None:
+        tab_id = tab.tab_id
+        self._connections[tab_id] = [
+            tab.url_changed.connect(lambda q, tid=tab_id: self._on_navigated(tid, q)),
+            tab.title_changed.connect(lambda t, tid=tab_id: self.updates.push_title(tid, t)),
+            tab.icon_changed.connect(lambda i, tid=tab_id: self._on_icon_changed(tid, i)),
+            tab.load_finished.connect(lambda ok, tid=tab_id: self._on_load_finished(tid, ok)),
+            tab.new_tab_requested.connect(lambda q: self.add_tab(q.toString(), "New Tab")),
+        ]
+        tab.create_window_handler = self._create_window
+
+    def detach_tab(self, tab_id: int) -> Optional[BrowserTab]:
+        # The tab leaves with its view and page, so the renderer and its state go along untouched.
+        tab = self.registry.widget(tab_id)
+        index = self.registry.position(tab_id)
+        if not isinstance(tab, BrowserTab) or index < 0:
+            return None
+        for connection in self._connections.pop(tab_id, []):
+            QObject.disconnect(connection)
+        tab.create_window_handler = None
+        self.lifecycle.forget(tab)
+        self._detaching = tab_id
+        try:
+            self.removeTab(index)
+        finally:
+            self._detaching = 0
+        return tab
+
+    def adopt_tab(self, tab: BrowserTab, activate: bool = True) -> int:
+        # addTab() reparents the existing view; nothing is reloaded.
+        self.registry.adopt(tab.tab_id, tab)
+        self._attach(tab)
+        index = self.addTab(tab, tab.title() or "New Tab")
+        if activate:
+            self.setCurrentIndex(index)
+        return tab.tab_id
+
+    def is_detaching(self, tab_id: int) -> bool:
+        return tab_id != 0 and tab_id == self._detaching
+
+    def session_state(self) -> dict:
+        return {
+            "tabs": [tab.session_entry() for tab in self.browser_tabs()],
+            "current": self.currentIndex(),
+        }
+
+    def open_tabs(self) -> list[tuple[int, str, str]]:
+        return [(tab.tab_id, tab.url().toString(), tab.title()) for tab in self.browser_tabs()]
+
+    def restore_session(self, state: dict) -> bool:
+        entries = [e for e in state.get("tabs", []) if isinstance(e, dict) and e.get("url")]
+        if not entries:
+            return False
+
+        # Every restored tab starts as a placeholder; only the one that ends up current gets a view.
+        self._restoring = True
+        try:
+            for entry in entries:
+                self.add_tab(entry["url"], entry.get("title") or "New Tab", activate=False,
+                             lazy=True, history=entry.get("history"))
+            current = state.get("current", 0)
+            if not isinstance(current, int) or not 0 <= current < self.count():
+                current = 0
+            self.setCurrentIndex(current)
+        finally:
+            self._restoring = False
+        self._materialize_current(self.currentIndex())
+        return True
+
+    def _materialize_current(self, index: int) -> None:
+        if self._restoring:
+            return
+        w = self.widget(index)
+        if isinstance(w, BrowserTab):
+            w.materialize()
+
+    def _create_window(self, window_type: QWebEnginePage.WebWindowType) -> BrowserView:
+        # Hand Qt a real tab so the popup loads once, in the view the user will keep.
+        # Window/dialog popups open as foreground tabs; the user can move them out afterwards.
+        background = window_type == QWebEnginePage.WebWindowType.WebBrowserBackgroundTab
+        tab_id = self.add_tab(None, "New Tab", activate=not background)
+        return self.registry.widget(tab_id).materialize()
+
+    def tabInserted(self, index: int) -> None:
+        super().tabInserted(index)
+        tab_id = self.tab_id_at(index)
+        if tab_id:
+            self.registry.insert(tab_id, index)
+            self.tab_inserted.emit(tab_id)
+
+    def tabRemoved(self, index: int) -> None:
+        super().tabRemoved(index)
+        tab_id = self.registry.id_at(index)
+        if tab_id:
+            # Positions are updated first so listeners see the post-removal order;
+            # the widget/button entries stay until they are done with them.
+            self.registry.remove(tab_id)
+            self.updates.forget(tab_id)
+            self.tab_removed.emit(tab_id)
+            if tab_id == self._detaching:
+                self.registry.release(tab_id)
+            else:
+                self._connections.pop(tab_id, None)
+                self.registry.unregister(tab_id)
+
+    def _on_tab_moved(self, from_index: int, to_index: int) -> None:
+        self.registry.move(from_index, to_index)
+        self.tab_moved.emit(from_index, to_index)
+
+    def setCurrentIndex(self, index: int) -> None:
+        self._about_to_switch(index)
+        super().setCurrentIndex(index)
+
+    def setCurrentWidget(self, widget: QWidget) -> None:
+        self._about_to_switch(self.indexOf(widget))
+        super().setCurrentWidget(widget)
+
+    def _about_to_switch(self, index: int) -> None:
+        # Emitted while the outgoing tab is still on screen, so listeners can still grab it.
+        current = self.currentIndex()
+        if current >= 0 and index != current and not self._restoring:
+            self.tab_deactivating.emit(self.tab_id_at(current))
+
+    def tab_id_at(self, index: int) -> int:
+        return getattr(self.widget(index), "tab_id", 0)
+
+    def current_tab_id(self) -> int:
+        return self.tab_id_at(self.currentIndex())
+
+    def tab(self, tab_id: int) -> Optional[BrowserTab]:
+        return self.registry.widget(tab_id)
+
+    def select_tab(self, tab_id: int) -> None:
+        w = self.registry.widget(tab_id)
+        if w is not None:
+            self.setCurrentWidget(w)
+
+    def close_tab(self, tab_id: int) -> None:
+        index = self.registry.position(tab_id)
+        if index >= 0:
+            self._on_tab_close_requested(index)
+
+    def browser_tabs(self) -> Iterator[BrowserTab]:
+        for i in range(self.count()):
+            w = self.widget(i)
+            if isinstance(w, BrowserTab):
+                yield w
 
     def current_view(self) -> QWebEngineView:
         w = self.currentWidget()
         if isinstance(w, BrowserTab):
-            return w.view
+            return w.materialize()
         if isinstance(w, QWebEngineView):
             return w
         raise RuntimeError("Current tab does not contain a QWebEngineView")
 
+    def current_url(self) -> QUrl:
+        w = self.currentWidget()
+        if isinstance(w, BrowserTab):
+            return w.url()
+        if isinstance(w, QWebEngineView):
+            return w.url()
+        return QUrl()
+
     def open_url_in_current(self, url: str | QUrl) -> None:
         w = self.currentWidget()
         if isinstance(w, BrowserTab):
@@ -86,44 +354,40 @@ class TabManager(QTabWidget):
         elif isinstance(w, QWebEngineView):
             w.setUrl(QUrl(url))
 
-    def _on_url_changed(self, index: int, qurl: QUrl) -> None:
-        if 0 <= index < self.count():
-            self.tab_url_changed.emit(index, qurl)
+    def _on_navigated(self, tab_id: int, qurl: QUrl) -> None:
+        if tab_id in self.registry:
+            self.tab_navigated.emit(tab_id, qurl)
+        self.updates.push_url(tab_id, qurl)
 
-    def _on_title_changed(self, index: int, title: str) -> None:
-        if 0 <= index < self.count():
+    def _on_url_changed(self, tab_id: int, qurl: QUrl) -> None:
+        if tab_id in self.registry:
+            self.tab_url_changed.emit(tab_id, qurl)
+
+    def _on_title_changed(self, tab_id: int, title: str) -> None:
+        index = self.registry.position(tab_id)
+        if index >= 0:
             self.setTabText(index, title)
-            self.tab_title_changed.emit(index, title)
+            self.tab_title_changed.emit(tab_id, title)
+
+    def _on_icon_changed(self, tab_id: int, icon: QIcon) -> None:
+        if tab_id in self.registry:
+            self.tab_icon_changed.emit(tab_id, icon)
+
+    def _on_load_finished(self, tab_id: int, ok: bool) -> None:
+        if tab_id in self.registry:
+            self.tab_load_finished.emit(tab_id, ok)
 
     def _on_tab_close_requested(self, index: int) -> None:
+        w = self.widget(index)
+        self.lifecycle.forget(w)
         if self.count() > 1:
             self.removeTab(index)
         else:
             self.removeTab(index)
             self.add_tab("about:blank", "New Tab")
-
-    def _on_context_menu(self, pos):
-        tab_index = self.tabAt(pos)
-        if tab_index < 0:
-            return
-        menu = QMenu(self)
-        close_action = menu.addAction("Close Tab")
-        reload_action = menu.addAction("Reload")
-        duplicate_action = menu.addAction("Duplicate Tab")
-
-        action = menu.exec(self.mapToGlobal(pos))
-        if action is None:
-            return
-        if action == close_action:
-            self._on_tab_close_requested(tab_index)
-        elif action == reload_action:
-            w = self.widget(tab_index)
-            if isinstance(w, BrowserTab):
-                w.reload()
-        elif action == duplicate_action:
-            w = self.widget(tab_index)
-            if isinstance(w, BrowserTab):
-                self.add_tab(w.url().toString(), "Copy")
+        if w is not None:
+            # removeTab() only unparents; drop the view so its renderer goes away too.
+            w.deleteLater()
 
 
 __all__ = ["BrowserTab", "TabManager"]
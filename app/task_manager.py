@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from PySide6.QtCore import Qt, QObject, Signal, QModelIndex, QAbstractTableModel, QSortFilterProxyModel
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableView, QPushButton, QLabel, QSpinBox,
+    QHeaderView, QAbstractItemView, QMessageBox, QWidget
+)
+
+from app.lifecycle import LifecycleState
+
+
+logger = logging.getLogger(__name__)
+
+try:
+    _CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _CLOCK_TICKS = 100
+    _PAGE_SIZE = 4096
+
+
+@dataclass
+class ProcessSample:
+    pid: int
+    rss_mb: Optional[float]
+    cpu_percent: Optional[float]
+
+
+def read_process_stat(pid: int) -> Optional[tuple[int, float]]:
+    # One read of /proc/<pid>/stat gives both CPU ticks (utime + stime) and resident pages.
+    if pid <= 0:
+        return None
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            raw = f.read().decode("ascii", "replace")
+        fields = raw[raw.rindex(")") + 2:].split()
+        ticks = int(fields[11]) + int(fields[12])
+        rss_mb = int(fields[21]) * _PAGE_SIZE / (1024 * 1024)
+        return ticks, rss_mb
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ProcessSampler(QObject):
+
+    samples_ready = Signal(object)
+
+    def __init__(self, interval_ms: int = 1000, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._interval = max(100, interval_ms) / 1000
+        self._pids: frozenset[int] = frozenset()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last: dict[int, tuple[int, float]] = {}
+
+    def set_pids(self, pids) -> None:
+        with self._lock:
+            self._pids = frozenset(p for p in pids if p > 0)
+
+    def set_interval(self, interval_ms: int) -> None:
+        self._interval = max(100, interval_ms) / 1000
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="task-manager-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=2)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                pids = self._pids
+            try:
+                self.samples_ready.emit(self._sample(pids))
+            except Exception:
+                logger.exception("Process sampling failed")
+            self._wake.wait(self._interval)
+            self._wake.clear()
+
+    def _sample(self, pids: frozenset[int]) -> dict[int, ProcessSample]:
+        now = time.monotonic()
+        current: dict[int, tuple[int, float]] = {}
+        out: dict[int, ProcessSample] = {}
+        for pid in pids:
+            stat = read_process_stat(pid)
+            if stat is None:
+                out[pid] = ProcessSample(pid, None, None)
+                continue
+            ticks, rss_mb = stat
+            current[pid] = (ticks, now)
+            cpu = None
+            previous = self._last.get(pid)
+            if previous is not None and now > previous[1]:
+                cpu = (ticks - previous[0]) / _CLOCK_TICKS / (now - previous[1]) * 100
+            out[pid] = ProcessSample(pid, rss_mb, cpu)
+        # Only processes still being watched keep a CPU baseline.
+        self._last = current
+        return out
+
+
+STATE_NAMES = {
+    LifecycleState.Active: "Active",
+    LifecycleState.Frozen: "Frozen",
+    LifecycleState.Discarded: "Discarded",
+}
+
+
+class TaskManagerModel(QAbstractTableModel):
+
+    HEADERS = ("Tab", "Process ID", "Memory", "CPU", "State")
+    SortRole = Qt.UserRole + 1
+
+    def __init__(self, tab_manager, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._tabs = tab_manager
+        self._rows: list[tuple[int, str, int, object]] = []
+        self._samples: dict[int, ProcessSample] = {}
+        self._sharing: dict[int, int] = {}
+
+    def tab_id(self, row: int) -> int:
+        return self._rows[row][0] if 0 <= row < len(self._rows) else 0
+
+    def pid(self, row: int) -> int:
+        return self._rows[row][2] if 0 <= row < len(self._rows) else 0
+
+    def tabs_sharing(self, pid: int) -> int:
+        return self._sharing.get(pid, 0)
+
+    def pids(self) -> set[int]:
+        return {row[2] for row in self._rows if row[2] > 0} | {os.getpid()}
+
+    def refresh(self) -> None:
+        rows = []
+        sharing: dict[int, int] = {}
+        for index in range(self._tabs.count()):
+            tab = self._tabs.widget(index)
+            if not hasattr(tab, "render_process_pid"):
+                continue
+            state = tab.lifecycle_state()
+            pid = tab.render_process_pid() if state != LifecycleState.Discarded else 0
+            rows.append((tab.tab_id, self._tabs.tabText(index), pid, state))
+            if pid > 0:
+                sharing[pid] = sharing.get(pid, 0) + 1
+        self._sharing = sharing
+        if [r[0] for r in rows] != [r[0] for r in self._rows]:
+            self.beginResetModel()
+            self._rows = rows
+            self.endResetModel()
+        else:
+            self._rows = rows
+            self._emit_all_changed()
+
+    def set_samples(self, samples: dict[int, ProcessSample]) -> None:
+        self._samples = samples
+        self._emit_all_changed()
+
+    def browser_sample(self) -> Optional[ProcessSample]:
+        return self._samples.get(os.getpid())
+
+    def _emit_all_changed(self) -> None:
+        if self._rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._rows) - 1, len(self.HEADERS) - 1))
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole) -> Any:
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        tab_id, title, pid, state = self._rows[index.row()]
+        sample = self._samples.get(pid)
+        col = index.column()
+        if role == self.SortRole:
+            if col == 0:
+                return title.casefold()
+            if col == 1:
+                return pid
+            if col == 2:
+                return sample.rss_mb if sample is not None and sample.rss_mb is not None else -1.0
+            if col == 3:
+                return sample.cpu_percent if sample is not None and sample.cpu_percent is not None else -1.0
+            return STATE_NAMES.get(state, "")
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return title
+            if col == 1:
+                return str(pid) if pid > 0 else "—"
+            if col == 2:
+                if sample is None or sample.rss_mb is None:
+                    return "—"
+                shared = self._sharing.get(pid, 0)
+                return f"{sample.rss_mb:.1f} MB" + (f" (shared by {shared})" if shared > 1 else "")
+            if col == 3:
+                if sample is None or sample.cpu_percent is None:
+                    return "—"
+                return f"{sample.cpu_percent:.1f}%"
+            return STATE_NAMES.get(state, "")
+        if role == Qt.TextAlignmentRole and col in (1, 2, 3):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+
+class TaskManagerDialog(QDialog):
+
+    interval_changed = Signal(int)
+
+    def __init__(self, tab_manager, interval_ms: int = 1000, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Task Manager")
+        self.resize(720, 420)
+        self._tabs = tab_manager
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 12, 12, 12)
+        layout.setSpacing(8)
+
+        self.model = TaskManagerModel(tab_manager, self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setSortRole(TaskManagerModel.SortRole)
+        self.proxy.setDynamicSortFilter(True)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(2, Qt.DescendingOrder)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setShowGrid(False)
+        self.table.verticalHeader().hide()
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for col in range(1, len(TaskManagerModel.HEADERS)):
+            header.setSectionResizeMode(col, QHeaderView.ResizeToContents)
+        layout.addWidget(self.table, 1)
+
+        self.browser_lbl = QLabel("")
+        layout.addWidget(self.browser_lbl)
+
+        row = QHBoxLayout()
+        self.freeze_btn = QPushButton("Freeze")
+        self.discard_btn = QPushButton("Discard")
+        self.kill_btn = QPushButton("End process")
+        interval_lbl = QLabel("Refresh every:")
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setRange(250, 60000)
+        self.interval_spin.setSingleStep(250)
+        self.interval_spin.setSuffix(" ms")
+        self.interval_spin.setValue(interval_ms)
+        for w in (self.freeze_btn, self.discard_btn, self.kill_btn):
+            row.addWidget(w)
+        row.addStretch(1)
+        row.addWidget(interval_lbl)
+        row.addWidget(self.interval_spin)
+        layout.addLayout(row)
+
+        self.sampler = ProcessSampler(interval_ms, self)
+        self.sampler.samples_ready.connect(self._on_samples)
+
+        self.freeze_btn.clicked.connect(self._freeze_selected)
+        self.discard_btn.clicked.connect(self._discard_selected)
+        self.kill_btn.clicked.connect(self._kill_selected)
+        self.interval_spin.valueChanged.connect(self._on_interval_changed)
+        self.table.selectionModel().currentRowChanged.connect(lambda *_: self._update_controls())
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self.model.refresh()
+        self.sampler.set_pids(self.model.pids())
+        self.sampler.start()
+        self._update_controls()
+
+    def hideEvent(self, event) -> None:
+        # Nothing is sampled while the window is closed.
+        self.sampler.stop()
+        super().hideEvent(event)
+
+    def _on_samples(self, samples: dict) -> None:
+        # Tab titles, states and renderer PIDs are read here on the GUI thread; the thread only reads /proc.
+        self.model.refresh()
+        self.model.set_samples(samples)
+        self.sampler.set_pids(self.model.pids())
+        browser = self.model.browser_sample()
+        if browser is not None and browser.rss_mb is not None:
+            cpu = f", {browser.cpu_percent:.1f}% CPU" if browser.cpu_percent is not None else ""
+            self.browser_lbl.setText(f"Browser process: {browser.rss_mb:.1f} MB{cpu}, "
+                                     f"{self._tabs.updates.dropped} tab updates coalesced")
+        self._update_controls()
+
+    def _on_interval_changed(self, value: int) -> None:
+        self.sampler.set_interval(value)
+        self.interval_changed.emit(value)
+
+    def _selected_row(self) -> int:
+        index = self.table.currentIndex()
+        return self.proxy.mapToSource(index).row() if index.isValid() else -1
+
+    def _selected_tab(self):
+        return self._tabs.tab(self.model.tab_id(self._selected_row()))
+
+    def _update_controls(self) -> None:
+        tab = self._selected_tab()
+        state = tab.lifecycle_state() if tab is not None else None
+        current = tab is not None and tab is self._tabs.currentWidget()
+        self.freeze_btn.setEnabled(state == LifecycleState.Active and not current)
+        self.discard_btn.setEnabled(tab is not None and state != LifecycleState.Discarded and not current)
+        self.kill_btn.setEnabled(self.model.pid(self._selected_row()) > 0)
+
+    def _freeze_selected(self) -> None:
+        tab = self._selected_tab()
+        if tab is not None:
+            self._tabs.lifecycle.freeze(tab)
+            self.model.refresh()
+            self._update_controls()
+
+    def _discard_selected(self) -> None:
+        tab = self._selected_tab()
+        if tab is not None:
+            self._tabs.lifecycle.discard(tab)
+            self.model.refresh()
+            self._update_controls()
+
+    def _kill_selected(self) -> None:
+        pid = self.model.pid(self._selected_row())
+        if pid <= 0:
+            return
+        shared = self.model.tabs_sharing(pid)
+        if shared > 1:
+            answer = QMessageBox.question(
+                self, "End process", f"Process {pid} renders {shared} tabs. End it anyway?"
+            )
+            if answer != QMessageBox.Yes:
+                return
+        try:
+            os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+        except OSError as e:
+            QMessageBox.warning(self, "End process", f"Could not end process {pid}: {e}")
+        self.model.refresh()
+        self._update_controls()
+
+
+__all__ = ["TaskManagerDialog", "TaskManagerModel", "ProcessSampler", "ProcessSample", "read_process_stat"]
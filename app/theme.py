@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import Qt, QCoreApplication, QFileSystemWatcher, QObject, QTimer, Signal
+from PySide6.QtGui import QColor, QGuiApplication
+from PySide6.QtWidgets import QApplication, QWidget
+
+
+logger = logging.getLogger(__name__)
+
+THEME_NAMES = ("Dark", "Light", "Auto")
+
+PALETTES: dict[str, dict[str, str]] = {
+    "Dark": {
+        "text": "#FFFFFF",
+        "text_tab": "rgba(255,255,255,0.9)",
+        "text_muted": "rgba(255,255,255,0.6)",
+        "control": "rgba(255,255,255,0.06)",
+        "control_hover": "rgba(255,255,255,0.12)",
+        "control_soft_hover": "rgba(255,255,255,0.1)",
+        "input": "rgba(255,255,255,0.14)",
+        "border": "rgba(255,255,255,0.06)",
+        "focus_border": "rgba(255,255,255,0.12)",
+        "popup": "rgba(20,20,20,0.96)",
+        "dialog": "rgba(18,18,18,0.98)",
+        "scroll_handle": "rgba(255,255,255,0.08)",
+        "tab_active": "rgba(255,255,255,0.06)",
+        "tab_hover": "rgba(255,255,255,0.03)",
+        "web_frame": "#FFFFFF",
+        "accent": "#4A9EFF",
+    },
+    "Light": {
+        "text": "#1F2328",
+        "text_tab": "rgba(0,0,0,0.85)",
+        "text_muted": "rgba(0,0,0,0.55)",
+        "control": "rgba(0,0,0,0.06)",
+        "control_hover": "rgba(0,0,0,0.12)",
+        "control_soft_hover": "rgba(0,0,0,0.1)",
+        "input": "rgba(255,255,255,0.85)",
+        "border": "rgba(0,0,0,0.12)",
+        "focus_border": "rgba(0,0,0,0.25)",
+        "popup": "rgba(250,250,250,0.98)",
+        "dialog": "rgba(245,245,245,0.98)",
+        "scroll_handle": "rgba(0,0,0,0.18)",
+        "tab_active": "rgba(0,0,0,0.07)",
+        "tab_hover": "rgba(0,0,0,0.04)",
+        "web_frame": "#FFFFFF",
+        "accent": "#1A73E8",
+    },
+}
+
+_VARIABLE = re.compile(r"@([A-Za-z_][A-Za-z0-9_]*)")
+_RGBA = re.compile(r"rgba?\(\s*([\d.]+)\s*,\s*([\d.]+)\s*,\s*([\d.]+)\s*(?:,\s*([\d.]+)\s*)?\)")
+
+
+def default_stylesheet_path() -> Path:
+    return Path(__file__).resolve().parent.parent / "ui" / "styles.qss"
+
+
+def parse_color(value: str) -> QColor:
+    m = _RGBA.fullmatch(value.strip())
+    if m is None:
+        return QColor(value)
+    r, g, b = (int(float(v)) for v in m.groups()[:3])
+    alpha = m.group(4)
+    a = 255 if alpha is None else round(float(alpha) * 255 if float(alpha) <= 1 else float(alpha))
+    return QColor(r, g, b, a)
+
+
+def compile_stylesheet(template: str, palette: dict[str, str]) -> str:
+    def _sub(m: re.Match) -> str:
+        value = palette.get(m.group(1))
+        if value is None:
+            logger.warning("Unknown theme variable: @%s", m.group(1))
+            return m.group(0)
+        return value
+
+    return _VARIABLE.sub(_sub, template)
+
+
+def set_style_property(widget: QWidget, name: str, value) -> None:
+    # Only the widget whose state changed is re-polished, never its siblings or the app.
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+
+
+class ThemeManager(QObject):
+
+    theme_changed = Signal(str)
+
+    RELOAD_DELAY_MS = 100
+
+    def __init__(self, source: Optional[Path] = None, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.source = Path(source) if source is not None else default_stylesheet_path()
+        self._theme = "Dark"
+        self._template = ""
+        self._template_key = ""
+        self._cache: dict[tuple[str, str], str] = {}
+        self._applied: Optional[str] = None
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(lambda _path: self._reload_timer.start())
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(self.RELOAD_DELAY_MS)
+        self._reload_timer.timeout.connect(self.reload)
+
+        try:
+            QGuiApplication.styleHints().colorSchemeChanged.connect(self._on_color_scheme_changed)
+        except Exception:
+            pass
+
+        self._load_template()
+
+    def theme(self) -> str:
+        return self._theme
+
+    def resolved_theme(self) -> str:
+        if self._theme != "Auto":
+            return self._theme if self._theme in PALETTES else "Dark"
+        try:
+            scheme = QGuiApplication.styleHints().colorScheme()
+            return "Light" if scheme == Qt.ColorScheme.Light else "Dark"
+        except Exception:
+            return "Dark"
+
+    def palette(self) -> dict[str, str]:
+        return PALETTES[self.resolved_theme()]
+
+    def color(self, name: str) -> QColor:
+        return parse_color(self.palette().get(name, "#FF00FF"))
+
+    def set_theme(self, name: str) -> None:
+        self._theme = name if name in THEME_NAMES else "Dark"
+        self.apply()
+
+    def stylesheet(self) -> str:
+        key = (self.resolved_theme(), self._template_key)
+        compiled = self._cache.get(key)
+        if compiled is None:
+            compiled = self._cache[key] = compile_stylesheet(self._template, PALETTES[key[0]])
+        return compiled
+
+    def apply(self) -> None:
+        app = QApplication.instance()
+        if app is None:
+            return
+        qss = self.stylesheet()
+        # Setting the application stylesheet re-polishes every widget, so skip identical output.
+        if qss == self._applied:
+            return
+        app.setStyleSheet(qss)
+        self._applied = qss
+        self.theme_changed.emit(self.resolved_theme())
+
+    def reload(self) -> None:
+        self._load_template()
+        self.apply()
+
+    def _load_template(self) -> None:
+        try:
+            template = self.source.read_text(encoding="utf-8")
+        except OSError:
+            logger.info("Stylesheet file not found: %s", self.source)
+            template = ""
+        key = hashlib.sha1(template.encode("utf-8")).hexdigest()
+        if key != self._template_key:
+            self._template = template
+            self._template_key = key
+            self._cache = {k: v for k, v in self._cache.items() if k[1] == key}
+            logger.info("Stylesheet loaded: %s", self.source)
+        # Editors often save by replacing the file, which drops it from the watch list.
+        path = str(self.source)
+        if self.source.exists() and path not in self._watcher.files():
+            self._watcher.addPath(path)
+
+    def _on_color_scheme_changed(self, *_args) -> None:
+        if self._theme == "Auto":
+            self.apply()
+
+
+_theme_manager: Optional[ThemeManager] = None
+
+
+def get_theme_manager(source: Optional[Path] = None) -> ThemeManager:
+    global _theme_manager
+    if _theme_manager is None:
+        _theme_manager = ThemeManager(source, QCoreApplication.instance())
+    return _theme_manager
+
+
+__all__ = [
+    "ThemeManager", "get_theme_manager", "set_style_property", "compile_stylesheet", "parse_color",
+    "THEME_NAMES", "PALETTES",
+]
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import (
+    Qt, QBuffer, QByteArray, QCoreApplication, QIODevice, QObject, QStandardPaths, Signal
+)
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtWidgets import QWidget
+
+from app.session import write_atomic
+
+
+logger = logging.getLogger(__name__)
+
+
+def default_thumbnails_dir() -> str:
+    base = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+    if not base:
+        base = str(Path.home() / ".gbrowser" / "cache")
+    # Tab ids only mean something inside one run, so every process spills into its own folder.
+    return os.path.join(base, "thumbnails", str(os.getpid()))
+
+
+class ThumbnailCache(QObject):
+
+    thumbnail_ready = Signal(int)
+    _encoded = Signal(int, int, bytes)
+    _decoded = Signal(int, int, QImage)
+
+    WIDTH = 320
+    HEIGHT = 200
+    QUALITY = 70
+    MEMORY_BUDGET = 16 * 1024 * 1024
+    MAX_DECODED = 64
+
+    def __init__(self, directory: Optional[str] = None, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.directory = directory or default_thumbnails_dir()
+        # Compressed JPEGs, least recently used first; past the budget they move to disk.
+        self._memory: OrderedDict[int, bytes] = OrderedDict()
+        self.memory_bytes = 0
+        self._on_disk: set[int] = set()
+        self._pixmaps: OrderedDict[int, QPixmap] = OrderedDict()
+        self._decoding: set[int] = set()
+        # Bumped per capture and forget, so results of work that was overtaken are dropped.
+        self._generation: dict[int, int] = {}
+
+        self._jobs: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._encoded.connect(self._on_encoded)
+        self._decoded.connect(self._on_decoded)
+
+    def has(self, tab_id: int) -> bool:
+        return tab_id in self._memory or tab_id in self._on_disk
+
+    def capture(self, tab_id: int, widget: QWidget) -> None:
+        if not widget.isVisible() or widget.width() <= 0 or widget.height() <= 0:
+            return
+        image = widget.grab().toImage()
+        if image.isNull():
+            return
+        generation = self._generation.get(tab_id, 0) + 1
+        self._generation[tab_id] = generation
+        self._submit(("encode", tab_id, generation, image))
+
+    def pixmap(self, tab_id: int) -> Optional[QPixmap]:
+        # Only decoded thumbnails are returned; anything else is decoded off-thread and announced.
+        pix = self._pixmaps.get(tab_id)
+        if pix is not None:
+            self._pixmaps.move_to_end(tab_id)
+            return pix
+        if tab_id in self._decoding or not self.has(tab_id):
+            return None
+        self._decoding.add(tab_id)
+        data = self._memory.get(tab_id)
+        if data is not None:
+            self._memory.move_to_end(tab_id)
+        self._submit(("decode", tab_id, self._generation.get(tab_id, 0), data))
+        return None
+
+    def forget(self, tab_id: int) -> None:
+        self._generation[tab_id] = self._generation.get(tab_id, 0) + 1
+        data = self._memory.pop(tab_id, None)
+        if data is not None:
+            self.memory_bytes -= len(data)
+        self._pixmaps.pop(tab_id, None)
+        self._decoding.discard(tab_id)
+        if tab_id in self._on_disk:
+            self._on_disk.discard(tab_id)
+            self._submit(("unlink", tab_id))
+
+    def close(self) -> None:
+        self._submit(("close",))
+
+    def path_for(self, tab_id: int) -> str:
+        return os.path.join(self.directory, f"{tab_id}.jpg")
+
+    def _on_encoded(self, tab_id: int, generation: int, data: bytes) -> None:
+        if self._generation.get(tab_id) != generation or not data:
+            return
+        old = self._memory.pop(tab_id, None)
+        if old is not None:
+            self.memory_bytes -= len(old)
+        self._memory[tab_id] = data
+        self.memory_bytes += len(data)
+        # The on-disk copy is stale now; the fresh capture lives in memory until it is evicted.
+        self._on_disk.discard(tab_id)
+        self._pixmaps.pop(tab_id, None)
+        self._evict()
+        self.thumbnail_ready.emit(tab_id)
+
+    def _on_decoded(self, tab_id: int, generation: int, image: QImage) -> None:
+        self._decoding.discard(tab_id)
+        if self._generation.get(tab_id) != generation:
+            # A newer capture arrived while decoding; fetch that one instead.
+            if self.has(tab_id):
+                self.thumbnail_ready.emit(tab_id)
+            return
+        if image.isNull():
+            return
+        self._pixmaps[tab_id] = QPixmap.fromImage(image)
+        while len(self._pixmaps) > self.MAX_DECODED:
+            self._pixmaps.popitem(last=False)
+        self.thumbnail_ready.emit(tab_id)
+
+    def _evict(self) -> None:
+        while self.memory_bytes > self.MEMORY_BUDGET and len(self._memory) > 1:
+            tab_id, data = self._memory.popitem(last=False)
+            self.memory_bytes -= len(data)
+            self._on_disk.add(tab_id)
+            self._submit(("spill", tab_id, data))
+
+    def _submit(self, job: tuple) -> None:
+        self._jobs.put(job)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="thumbnail-io", daemon=True)
+            self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            job = self._jobs.get()
+            kind = job[0]
+            try:
+                if kind == "encode":
+                    self._encoded.emit(job[1], job[2], self._encode(job[3]))
+                elif kind == "decode":
+                    self._decoded.emit(job[1], job[2], self._decode(job[1], job[3]))
+                elif kind == "spill":
+                    write_atomic(self.path_for(job[1]), job[2])
+                elif kind == "unlink":
+                    try:
+                        os.unlink(self.path_for(job[1]))
+                    except OSError:
+                        pass
+                elif kind == "close":
+                    shutil.rmtree(self.directory, ignore_errors=True)
+                    return
+            except Exception:
+                logger.exception("Thumbnail job %s failed", kind)
+
+    def _encode(self, image: QImage) -> bytes:
+        image = image.scaled(self.WIDTH, self.HEIGHT, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        image = image.copy((image.width() - self.WIDTH) // 2, 0, self.WIDTH, self.HEIGHT)
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        if not image.convertToFormat(QImage.Format_RGB888).save(buffer, "JPG", self.QUALITY):
+            return b""
+        return bytes(data.data())
+
+    def _decode(self, tab_id: int, data: Optional[bytes]) -> QImage:
+        if data is None:
+            try:
+                with open(self.path_for(tab_id), "rb") as f:
+                    data = f.read()
+            except OSError:
+                return QImage()
+        image = QImage()
+        image.loadFromData(data, "JPG")
+        return image
+
+
+_thumbnail_cache: Optional[ThumbnailCache] = None
+
+
+def get_thumbnail_cache(directory: Optional[str] = None) -> ThumbnailCache:
+    # Shared by every window, so a tab keeps its thumbnail when it moves between them.
+    global _thumbnail_cache
+    if _thumbnail_cache is None:
+        _thumbnail_cache = ThumbnailCache(directory, QCoreApplication.instance())
+    return _thumbnail_cache
+
+
+__all__ = ["ThumbnailCache", "get_thumbnail_cache", "default_thumbnails_dir"]
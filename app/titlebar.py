@@ -3,9 +3,9 @@ from __future__ import annotations
 from typing import Optional
 
 from PySide6.QtCore import Qt, QPoint
-from PySide6.QtGui import QFont
+from PySide6.QtGui import QFont, QPixmap
 from PySide6.QtWidgets import (
-    QWidget, QHBoxLayout, QLabel, QPushButton, QLineEdit
+    QWidget, QHBoxLayout, QLabel, QPushButton, QLineEdit, QApplication
 )
 
 
@@ -15,6 +15,8 @@ class TitleBar(QWidget):
         super().__init__(parent)
         self.parent_window = parent
         self._drag_offset: Optional[object] = None
+        self._press_pos: Optional[QPoint] = None
+        self.setObjectName("titlebar")
         self.setFixedHeight(46)
 
         layout = QHBoxLayout(self)
@@ -22,44 +24,52 @@ class TitleBar(QWidget):
         layout.setSpacing(8)
 
         self.icon = QLabel("🌐")
+        self.icon.setFixedSize(18, 18)
+        self.icon.setAlignment(Qt.AlignCenter)
         self.title = QLabel("GBrowser")
+        self.title.setObjectName("window_title")
         self.title.setFont(QFont("Segoe UI", 10))
-        self.title.setStyleSheet("color: white")
 
         self.back = QPushButton("<-")
         self.fwd = QPushButton("->")
         self.reload = QPushButton("⟳")
         for b in (self.back, self.fwd, self.reload):
             b.setFixedSize(28, 28)
-            b.setStyleSheet(
-                "color:white;background:rgba(255,255,255,0.06);border-radius:6px;"
-            )
 
         self.new_tab = QPushButton("+")
         self.new_tab.setFixedSize(32, 28)
-        self.new_tab.setStyleSheet(
-            "color:white;background:rgba(255,255,255,0.06);border-radius:6px;"
-        )
 
         self.settings = QPushButton("⚙")
         self.settings.setFixedSize(28, 28)
-        self.settings.setStyleSheet(
-            "color:white;background:rgba(255,255,255,0.06);border-radius:6px;"
-        )
+
+        self.history = QPushButton("🕘")
+        self.history.setFixedSize(28, 28)
+        self.history.setToolTip("History (Ctrl+H)")
+
+        self.downloads = QPushButton("⬇")
+        self.downloads.setFixedSize(28, 28)
+        self.downloads.setToolTip("Downloads (Ctrl+J)")
+
+        for b in (self.back, self.fwd, self.reload, self.new_tab, self.settings, self.history, self.downloads):
+            b.setProperty("role", "nav")
 
         self.url = QLineEdit()
+        self.url.setObjectName("url_bar")
         self.url.setFixedHeight(30)
-        self.url.setStyleSheet(
-            "background:rgba(255,255,255,0.14);color:white;border:none;border-radius:6px;padding-left:8px;"
-        )
         self.url.setPlaceholderText("Enter the address and press Enter")
 
+        self.shield = QPushButton("🛡")
+        self.shield.setObjectName("shield")
+        self.shield.setProperty("role", "nav")
+        self.shield.setFixedSize(44, 28)
+        self.shield.setToolTip("Content blocker")
+
         self.min = QPushButton("–")
         self.max = QPushButton("☐")
         self.close = QPushButton("✕")
-        for b in (self.min, self.max, self.close):
+        for b, name in ((self.min, "win_min"), (self.max, "win_max"), (self.close, "win_close")):
+            b.setObjectName(name)
             b.setFixedSize(36, 26)
-            b.setStyleSheet("color:white;background:transparent;border:none;")
 
         layout.addWidget(self.icon)
         layout.addWidget(self.title)
@@ -70,8 +80,11 @@ class TitleBar(QWidget):
         layout.addWidget(self.new_tab)
         layout.addSpacing(8)
         layout.addWidget(self.settings)
+        layout.addWidget(self.history)
+        layout.addWidget(self.downloads)
         layout.addSpacing(8)
         layout.addWidget(self.url)
+        layout.addWidget(self.shield)
         layout.addWidget(self.min)
         layout.addWidget(self.max)
         layout.addWidget(self.close)
@@ -79,6 +92,9 @@ class TitleBar(QWidget):
     def mousePressEvent(self, event) -> None:
         if event.button() == Qt.LeftButton:
             win = self.parent_window
+            # The move starts once the pointer travels; a plain press or a double-click grabs nothing.
+            self._press_pos = event.globalPosition().toPoint()
+            # Kept for platforms without system moves, which fall back to moving the window from Python.
             if win is not None and win.isMaximized():
                 rel_x = event.position().x() / max(1.0, self.width())
                 self._drag_offset = ("max", rel_x)
@@ -86,7 +102,23 @@ class TitleBar(QWidget):
                 self._drag_offset = event.globalPosition().toPoint() - win.frameGeometry().topLeft()
         return super().mousePressEvent(event)
 
+    def mouseReleaseEvent(self, event) -> None:
+        self._press_pos = None
+        return super().mouseReleaseEvent(event)
+
     def mouseMoveEvent(self, event) -> None:
+        if event.buttons() & Qt.LeftButton and self._press_pos is not None:
+            pos = event.globalPosition().toPoint()
+            if (pos - self._press_pos).manhattanLength() < QApplication.startDragDistance():
+                return super().mouseMoveEvent(event)
+            self._press_pos = None
+            win = self.parent_window
+            handle = win.windowHandle() if win is not None else None
+            # The window manager runs the drag, including un-maximizing, without further mouse events here.
+            if handle is not None and handle.startSystemMove():
+                self._drag_offset = None
+                event.accept()
+                return
         if event.buttons() & Qt.LeftButton and self._drag_offset is not None:
             win = self.parent_window
             if win is None:
@@ -111,5 +143,15 @@ class TitleBar(QWidget):
     def set_icon(self, text_or_emoji: str) -> None:
         self.icon.setText(text_or_emoji)
 
+    def set_icon_pixmap(self, pixmap: Optional[QPixmap]) -> None:
+        if pixmap is None:
+            self.icon.setText("🌐")
+        else:
+            self.icon.setPixmap(pixmap)
+
+    def set_blocked_count(self, count: int) -> None:
+        self.shield.setText(f"🛡 {count}" if count else "🛡")
+        self.shield.setToolTip(f"Content blocker: {count} requests blocked on this page")
+
 
 __all__ = ["TitleBar"]
\ No newline at end of file
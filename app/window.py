@@ -4,52 +4,141 @@ import logging
 from pathlib import Path
 from typing import Optional
 
-from PySide6.QtCore import Qt, QUrl, QSettings
-from PySide6.QtGui import QFont
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QFrame
+from PySide6.QtCore import Qt, QPoint, QUrl, QSettings, QTimer
+from PySide6.QtGui import QColor, QCursor, QFont, QKeySequence, QPainter, QShortcut
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QFrame, QMenu
 
 from app.titlebar import TitleBar
-from app.tabs import TabManager
+from app.tabs import BrowserTab, TabManager
+from app.lifecycle import LifecyclePolicy, LifecycleState
+from app.profile import get_profile_manager, default_storage_path
+from app.session import get_session_store
 from app.tab_panel import TabPanel
-from app.settings import SettingsDialog
-from app.effects import apply_acrylic_to_widget, remove_acrylic
+from app.tab_registry import TabRegistry, get_tab_registry
+from app.startup import get_startup_profiler
 
 
 logger = logging.getLogger(__name__)
 
+# Open browser windows, oldest first. They share the profile and the tab registry.
+_windows: list[AcrylicBackgroundBrowser] = []
+# Shared services a window has started; the last window to close shuts them down.
+_services: list = []
+
+
+def _session_state() -> dict:
+    # One session file covers every window; on restore all of their tabs come back in one window.
+    windows = sorted(_windows, key=lambda w: not w.isActiveWindow())
+    if not windows:
+        return {"tabs": [], "current": 0}
+    state = windows[0].tabs.session_state()
+    for window in windows[1:]:
+        state["tabs"].extend(window.tabs.session_state()["tabs"])
+    return state
+
+
+def _open_tabs() -> list[tuple[int, str, str]]:
+    # The omnibox is shared, so "switch to tab" offers the tabs of every window.
+    tabs: list[tuple[int, str, str]] = []
+    for window in _windows:
+        tabs.extend(window.tabs.open_tabs())
+    return tabs
+
 
 class AcrylicBackgroundBrowser(QWidget):
 
-    def __init__(self) -> None:
+    THUMBNAIL_DELAY_MS = 500
+    RESIZE_MARGIN = 8
+
+    _RESIZE_CURSORS = {
+        Qt.LeftEdge: Qt.SizeHorCursor,
+        Qt.RightEdge: Qt.SizeHorCursor,
+        Qt.TopEdge: Qt.SizeVerCursor,
+        Qt.BottomEdge: Qt.SizeVerCursor,
+        Qt.LeftEdge | Qt.TopEdge: Qt.SizeFDiagCursor,
+        Qt.RightEdge | Qt.BottomEdge: Qt.SizeFDiagCursor,
+        Qt.RightEdge | Qt.TopEdge: Qt.SizeBDiagCursor,
+        Qt.LeftEdge | Qt.BottomEdge: Qt.SizeBDiagCursor,
+    }
+
+    def __init__(self, tab: Optional[BrowserTab] = None) -> None:
         super().__init__()
         self.setWindowTitle("GBrowser")
         self.setWindowFlags(Qt.FramelessWindowHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
+        # Tabs close with their window, so a closed window must not linger with live renderers.
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        # A window opened for a tab moved out of another one starts with just that tab.
+        self._moved_tab = tab
         self.resize(1200, 780)
+        self.setMouseTracking(True)
+        self._cursor_edges = Qt.Edge(0)
 
         self.settings = QSettings("GBrowser", "Main")
         self._acrylic_color = self.settings.value("acrylic_color", 0x661F2937, type=int)
         self._theme = self.settings.value("theme", "Dark", type=str)
         self._home_page = self.settings.value("home_page", "https://www.google.com", type=str)
         self._system_transparency = self.settings.value("system_transparency", True, type=bool)
+        self._tab_strip_mode = self.settings.value("tab_strip_mode", "Buttons", type=str)
+        self._http_cache_type = self.settings.value("http_cache_type", "Disk", type=str)
+        self._http_cache_max_mb = self.settings.value("http_cache_max_mb", 0, type=int)
+        self._profile_storage_path = self.settings.value("profile_storage_path", "", type=str)
+        self._restore_session = self.settings.value("restore_session", True, type=bool)
+        self._max_concurrent_downloads = self.settings.value("max_concurrent_downloads", 3, type=int)
+        self._download_limit_kbps = self.settings.value("download_limit_kbps", 0, type=int)
+        self._task_manager_interval_ms = self.settings.value("task_manager_interval_ms", 1000, type=int)
+        self._content_blocker_enabled = self.settings.value("content_blocker_enabled", True, type=bool)
+        self._content_blocker_allowlist = self.settings.value("content_blocker_allowlist", [], type=list)
+        self._speculation_enabled = self.settings.value("speculation_enabled", True, type=bool)
+        self._lifecycle_policy = LifecyclePolicy(
+            enabled=self.settings.value("tab_lifecycle_enabled", True, type=bool),
+            freeze_after_min=self.settings.value("freeze_after_min", 5, type=int),
+            discard_after_min=self.settings.value("discard_after_min", 30, type=int),
+            memory_budget_mb=self.settings.value("memory_budget_mb", 2048, type=int),
+        )
+
+        # The theme styles the first frame, so it is the one shared service set up here.
+        from app.theme import get_theme_manager
+        self.themes = get_theme_manager()
+        self.themes.set_theme(self._theme)
+
+        with get_startup_profiler().span("WebEngine profile"):
+            self.profiles = get_profile_manager(self._profile_storage_path or None)
+            self.profiles.apply_cache_settings(self._http_cache_type, self._http_cache_max_mb)
+        self.profiles.downloads.set_max_concurrent(self._max_concurrent_downloads)
+        self.profiles.downloads.set_global_limit(self._download_limit_kbps)
+        self.blocker = self.profiles.content_blocker
+        self.blocker.set_enabled(self._content_blocker_enabled)
+        self.blocker.set_allowlist(self._content_blocker_allowlist)
+        self.speculation = self.profiles.speculation
+        self.speculation.set_enabled(self._speculation_enabled)
+        self.downloads_panel: Optional[QWidget] = None
+        self.task_manager: Optional[QWidget] = None
 
         outer = QVBoxLayout(self)
         outer.setContentsMargins(12, 12, 12, 12)
         outer.setSpacing(8)
 
+        self.registry = TabRegistry(get_tab_registry())
+        self._typed_urls: dict[int, str] = {}
+
         self.titlebar = TitleBar(self)
         outer.addWidget(self.titlebar)
 
-        self.tab_panel = TabPanel(self)
+        if self._tab_strip_mode == "Virtualized":
+            from app.tab_strip import TabStrip
+            self.tab_panel = TabStrip(self.registry, self)
+        else:
+            self.tab_panel = TabPanel(self.registry, self)
         outer.addWidget(self.tab_panel)
 
         frame = QFrame()
         frame.setObjectName("web_frame")
-        frame.setStyleSheet("QFrame#web_frame { background:white; border-radius:12px; }")
         frame_layout = QVBoxLayout(frame)
         frame_layout.setContentsMargins(0, 0, 0, 0)
 
-        self.tabs = TabManager(self)
+        self.tabs = TabManager(self, self.registry)
+        self.tabs.lifecycle.set_policy(self._lifecycle_policy)
         try:
             self.tabs.tabBar().hide()
         except Exception:
@@ -62,8 +151,20 @@ class AcrylicBackgroundBrowser(QWidget):
         self.titlebar.fwd.clicked.connect(lambda: self._safe_call("forward"))
         self.titlebar.reload.clicked.connect(lambda: self._safe_call("reload"))
         self.titlebar.url.returnPressed.connect(self.navigate_to_url)
+        self.titlebar.shield.clicked.connect(self._show_blocker_menu)
+        self.blocker.blocked_changed.connect(self._update_blocked_count)
         self.titlebar.new_tab.clicked.connect(self.add_new_tab)
         self.titlebar.settings.clicked.connect(self.open_settings)
+        self.titlebar.history.clicked.connect(self.open_history)
+        QShortcut(QKeySequence("Ctrl+H"), self, activated=self.open_history)
+        self.titlebar.downloads.clicked.connect(self.open_downloads)
+        QShortcut(QKeySequence("Ctrl+J"), self, activated=self.open_downloads)
+        QShortcut(QKeySequence("Shift+Esc"), self, activated=self.open_task_manager)
+        QShortcut(QKeySequence("Ctrl+Shift+A"), self, activated=self.open_tab_overview)
+        QShortcut(QKeySequence("Ctrl+Shift+F"), self, activated=self.open_tab_search)
+        QShortcut(QKeySequence("Ctrl+S"), self, activated=self.save_page_offline)
+        QShortcut(QKeySequence("Ctrl+Shift+O"), self, activated=self.open_offline_pages)
+        self.profiles.downloads.download_added.connect(self._on_download_added)
 
         self.titlebar.min.clicked.connect(self.showMinimized)
         self.titlebar.max.clicked.connect(self.toggle_max_restore)
@@ -72,12 +173,79 @@ class AcrylicBackgroundBrowser(QWidget):
         self.tabs.currentChanged.connect(self._on_current_changed)
         self.tabs.tab_url_changed.connect(self._on_tab_url_changed)
         self.tabs.tab_title_changed.connect(self._on_tab_title_changed)
+        self.tabs.tab_icon_changed.connect(self._on_tab_icon_changed)
+        self.tabs.tab_load_finished.connect(self._on_tab_load_finished)
+        self.tabs.tab_deactivating.connect(self._capture_thumbnail)
+        self.tabs.tab_navigated.connect(self._record_visit)
+        self.tabs.tab_title_changed.connect(self._record_title)
+        self.tabs.tab_inserted.connect(self._on_tab_inserted)
+        self.tabs.tab_removed.connect(self._on_tab_removed)
+        self.tabs.tab_moved.connect(self.tab_panel.move_tab)
 
         self.tab_panel.tab_selected.connect(self._on_tab_panel_selected)
         self.tab_panel.tab_close_requested.connect(self._on_tab_panel_close_requested)
         self.tab_panel.new_tab_requested.connect(lambda: self.add_new_tab())
+        self.tab_panel.tab_detach_requested.connect(self.move_tab_to_new_window)
+        self.tab_panel.tab_dropped.connect(self._on_tab_dropped)
+
+        self.session = get_session_store(_session_state)
+        self.session.set_enabled(self._restore_session)
+        # History, the omnibox, thumbnails, favicons and the tab search index are started and tabs are
+        # opened once the window has painted, so neither delays first paint.
+        self._services_started = False
+        self._tabs_loaded = False
+        self._tabs_load_scheduled = False
+        _windows.append(self)
+
+    def _start_services(self) -> None:
+        if self._services_started:
+            return
+        self._services_started = True
+        profiler = get_startup_profiler()
+        with profiler.span("services"):
+            from app.favicons import get_favicon_cache
+            from app.history import get_history_store
+            from app.omnibox import OmniboxPopup, get_omnibox_engine
+            from app.tab_search import TabSearchIndex
+            from app.thumbnails import get_thumbnail_cache
+
+            self.history = get_history_store()
+            self.thumbnails = get_thumbnail_cache()
+            self.favicons = get_favicon_cache()
+            self.favicons.icon_ready.connect(self._on_favicon_ready)
+            self.tab_search = TabSearchIndex(self.tabs, parent=self)
+
+            self.omnibox = get_omnibox_engine(self.history, _open_tabs)
+            self.omnibox_popup = OmniboxPopup(self.titlebar.url, self.omnibox)
+            self.omnibox_popup.suggestion_activated.connect(self._on_suggestion_activated)
+            self.omnibox.suggestions_ready.connect(self._on_suggestions_for_speculation)
+            for service in (self.history, self.omnibox, self.thumbnails):
+                if service not in _services:
+                    _services.append(service)
+
+    def _load_initial_tabs(self) -> None:
+        if self._tabs_loaded:
+            return
+        self._tabs_loaded = True
+        self._start_services()
+        if self._moved_tab is not None:
+            tab, self._moved_tab = self._moved_tab, None
+            self._adopt_tab(tab)
+        else:
+            state = self.session.load() if self._restore_session else None
+            if not (state and self.tabs.restore_session(state)):
+                self.add_new_tab(self._home_page, "Google")
+
+        for signal in (self.tabs.currentChanged, self.tabs.tab_url_changed, self.tabs.tab_title_changed,
+                       self.tabs.tab_inserted, self.tabs.tab_removed, self.tabs.tab_moved):
+            signal.connect(self.session.schedule_save)
+        for signal in (self.tabs.tab_url_changed, self.tabs.tab_title_changed,
+                       self.tabs.tab_inserted, self.tabs.tab_removed):
+            signal.connect(self.omnibox.schedule_tabs_update)
 
-        self.add_new_tab(self._home_page, "Google")
+        profiler = get_startup_profiler()
+        profiler.mark("initial tabs")
+        profiler.finish()
 
     def _safe_call(self, method_name: str) -> None:
         try:
@@ -87,11 +255,98 @@ class AcrylicBackgroundBrowser(QWidget):
         except Exception:
             logger.exception("Error while performing %s on the current view", method_name)
 
+    def closeEvent(self, event) -> None:
+        try:
+            # Closing before the first paint must not replace the stored session with an empty one.
+            if self._tabs_loaded:
+                self.session.save_now()
+        except Exception:
+            logger.exception("Failed to save the session")
+        if self in _windows:
+            _windows.remove(self)
+        for tab_id in list(self.registry.ids()):
+            if self._services_started:
+                self.thumbnails.forget(tab_id)
+            self.registry.unregister(tab_id)
+        if self._services_started:
+            self.tab_search.close()
+        # The OS recycles window handles; the cached accent must not outlive this one.
+        from app.effects import forget_widget
+        forget_widget(self)
+        if _windows:
+            # The shared omnibox must stop offering this window's tabs.
+            if self._services_started:
+                self.omnibox.schedule_tabs_update()
+        else:
+            while _services:
+                _services.pop().close()
+        super().closeEvent(event)
+
     def showEvent(self, event) -> None:
         super().showEvent(event)
         self._apply_acrylic()
 
+    def paintEvent(self, event) -> None:
+        super().paintEvent(event)
+        # A nearly transparent band keeps the resize margin hit-testable on translucent windows.
+        painter = QPainter(self)
+        m = self.RESIZE_MARGIN
+        band = QColor(0, 0, 0, 1)
+        painter.fillRect(0, 0, self.width(), m, band)
+        painter.fillRect(0, self.height() - m, self.width(), m, band)
+        painter.fillRect(0, m, m, self.height() - 2 * m, band)
+        painter.fillRect(self.width() - m, m, m, self.height() - 2 * m, band)
+        painter.end()
+        if not self._tabs_load_scheduled:
+            self._tabs_load_scheduled = True
+            get_startup_profiler().mark("first paint")
+            QTimer.singleShot(0, self._load_initial_tabs)
+
+    def _resize_edges(self, pos) -> Qt.Edge:
+        edges = Qt.Edge(0)
+        if self.isMaximized() or self.isFullScreen():
+            return edges
+        m = self.RESIZE_MARGIN
+        if pos.x() < m:
+            edges |= Qt.LeftEdge
+        elif pos.x() >= self.width() - m:
+            edges |= Qt.RightEdge
+        if pos.y() < m:
+            edges |= Qt.TopEdge
+        elif pos.y() >= self.height() - m:
+            edges |= Qt.BottomEdge
+        return edges
+
+    def _set_resize_cursor(self, edges: Qt.Edge) -> None:
+        if edges == self._cursor_edges:
+            return
+        self._cursor_edges = edges
+        if edges:
+            self.setCursor(self._RESIZE_CURSORS[edges])
+        else:
+            self.unsetCursor()
+
+    def mousePressEvent(self, event) -> None:
+        if event.button() == Qt.LeftButton:
+            edges = self._resize_edges(event.position().toPoint())
+            handle = self.windowHandle()
+            # The window manager resizes natively; no Python runs per pointer event until release.
+            if edges and handle is not None and handle.startSystemResize(edges):
+                event.accept()
+                return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event) -> None:
+        if not event.buttons():
+            self._set_resize_cursor(self._resize_edges(event.position().toPoint()))
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event) -> None:
+        self._set_resize_cursor(Qt.Edge(0))
+        super().leaveEvent(event)
+
     def _apply_acrylic(self):
+        from app.effects import apply_acrylic_to_widget, remove_acrylic
         if self._system_transparency:
             try:
                 apply_acrylic_to_widget(self, self._acrylic_color)
@@ -115,60 +370,360 @@ class AcrylicBackgroundBrowser(QWidget):
             text = "https://" + text
         url = QUrl(text)
         if url.isValid():
-            self.tabs.open_url_in_current(url)
+            self._typed_urls[self.tabs.current_tab_id()] = url.toString()
+            self._open_in_current(url)
+
+    def _open_in_current(self, url: QUrl) -> None:
+        page = self.speculation.take(url)
+        if page is not None:
+            try:
+                self.tabs.current_view().adopt_page(page)
+                return
+            except Exception:
+                logger.exception("Failed to swap in the preloaded page")
+                page.deleteLater()
+        self.tabs.open_url_in_current(url)
+
+    def _on_suggestions_for_speculation(self, seq: int, suggestions: list) -> None:
+        if seq != self.omnibox.latest_seq() or not suggestions or not self.titlebar.url.hasFocus():
+            return
+        from app.speculation import is_confident
+        top = suggestions[0]
+        if is_confident(self.titlebar.url.text(), suggestions):
+            self.speculation.prerender(QUrl(top.url))
+        elif not top.tab_id:
+            self.speculation.preconnect(QUrl(top.url))
 
     def add_new_tab(self, url: Optional[str] = None, label: str = "New Tab") -> None:
         if url is None:
             url = self._home_page
-        index = self.tabs.add_tab(url, label)
-        self.tab_panel.sync_with_tab_manager(self.tabs)
-        try:
-            current_url = self.tabs.current_view().url().toString()
-            self.titlebar.url.setText(current_url)
-        except Exception:
-            pass
+        self.tabs.add_tab(url, label)
+        self.titlebar.url.setText(self.tabs.current_url().toString())
 
     def _on_current_changed(self, index: int) -> None:
-        try:
-            current_url = self.tabs.current_view().url().toString()
-            self.titlebar.url.setText(current_url)
-        except Exception:
-            self.titlebar.url.setText("")
-        self.tab_panel.set_current_index(index)
+        self.tabs.lifecycle.activate(self.tabs.widget(index))
+        self.titlebar.url.setText(self.tabs.current_url().toString())
+        self._update_blocked_count()
+        self.tab_panel.set_current_tab(self.tabs.tab_id_at(index))
+        self._show_tab_icon(self.tabs.tab_id_at(index))
+
+    def _on_tab_url_changed(self, tab_id: int, qurl) -> None:
+        if tab_id == self.tabs.current_tab_id():
+            text = qurl.toString()
+            if self.titlebar.url.text() != text:
+                self.titlebar.url.setText(text)
+            self._update_blocked_count()
+        self._show_tab_icon(tab_id)
+
+    def _on_tab_inserted(self, tab_id: int) -> None:
+        index = self.registry.position(tab_id)
+        self.tab_panel.insert_tab(tab_id, self.tabs.tabText(index))
+        self.tab_panel.set_current_tab(self.tabs.current_tab_id())
+        self._show_tab_icon(tab_id)
+
+    def _on_tab_removed(self, tab_id: int) -> None:
+        # A tab moving to another window keeps its thumbnail; the cache is shared.
+        if not self.tabs.is_detaching(tab_id):
+            self.thumbnails.forget(tab_id)
+        self.tab_search.forget(tab_id)
+        self.tab_panel.remove_tab(tab_id)
+        self.tab_panel.set_current_tab(self.tabs.current_tab_id())
+
+    def _on_tab_title_changed(self, tab_id: int, title: str) -> None:
+        self.tab_panel.update_tab_title(tab_id, title)
+
+    def _on_tab_icon_changed(self, tab_id: int, icon) -> None:
+        from app.favicons import favicon_host
+        tab = self.tabs.tab(tab_id)
+        if tab is not None and not icon.isNull():
+            self.favicons.store(favicon_host(tab.url()), icon)
+        self._show_tab_icon(tab_id)
+
+    def _show_tab_icon(self, tab_id: int) -> None:
+        from app.favicons import favicon_host
+        tab = self.tabs.tab(tab_id)
+        if tab is None:
+            return
+        # Looked up by host, so restored placeholders get their icon from disk without loading the page.
+        pixmap = self.favicons.pixmap(favicon_host(tab.url()))
+        self.tab_panel.update_tab_icon(tab_id, pixmap)
+        if tab_id == self.tabs.current_tab_id():
+            self.titlebar.set_icon_pixmap(pixmap)
+
+    def _on_favicon_ready(self, host: str) -> None:
+        from app.favicons import favicon_host
+        for tab in self.tabs.browser_tabs():
+            if favicon_host(tab.url()) == host:
+                self._show_tab_icon(tab.tab_id)
+
+    def _on_tab_load_finished(self, tab_id: int, ok: bool) -> None:
+        if ok:
+            self.tab_search.schedule(tab_id)
+        # Background tabs are grabbed when they are left instead; a hidden view has nothing painted.
+        if ok and tab_id == self.tabs.current_tab_id():
+            QTimer.singleShot(self.THUMBNAIL_DELAY_MS, lambda: self._capture_thumbnail(tab_id))
+
+    def _capture_thumbnail(self, tab_id: int) -> None:
+        tab = self.tabs.tab(tab_id)
+        if tab is not None and tab.view is not None and tab_id == self.tabs.current_tab_id():
+            self.thumbnails.capture(tab_id, tab.view)
+
+    def _record_visit(self, tab_id: int, qurl) -> None:
+        tab = self.tabs.tab(tab_id)
+        url = qurl.toString()
+        typed = self._typed_urls.pop(tab_id, None) == url
+        title = tab.title() if tab is not None else ""
+        self.history.record_visit(url, title, typed=typed)
+        self.omnibox.note_visit(url, title, typed=typed)
+
+    def _record_title(self, tab_id: int, title: str) -> None:
+        tab = self.tabs.tab(tab_id)
+        if tab is not None:
+            self.history.update_title(tab.url().toString(), title)
+            self.omnibox.note_title(tab.url().toString(), title)
+
+    def _on_suggestion_activated(self, suggestion) -> None:
+        owner = next((w for w in _windows if suggestion.tab_id and suggestion.tab_id in w.registry), None)
+        if owner is not None:
+            owner.tabs.select_tab(suggestion.tab_id)
+            if owner is not self:
+                owner.raise_()
+                owner.activateWindow()
+            return
+        url = QUrl(suggestion.url)
+        self.titlebar.url.setText(url.toString())
+        self._typed_urls[self.tabs.current_tab_id()] = url.toString()
+        self._open_in_current(url)
 
-    def _on_tab_url_changed(self, index: int, qurl) -> None:
-        if index == self.tabs.currentIndex():
-            self.titlebar.url.setText(qurl.toString())
+    def _on_tab_panel_selected(self, tab_id: int) -> None:
+        self.tabs.select_tab(tab_id)
 
-    def _on_tab_title_changed(self, index: int, title: str) -> None:
-        self.tab_panel.update_tab_title(index, title)
+    def _on_tab_panel_close_requested(self, tab_id: int) -> None:
+        self.tabs.close_tab(tab_id)
 
-    def _on_tab_panel_selected(self, index: int) -> None:
-        if 0 <= index < self.tabs.count():
-            self.tabs.setCurrentIndex(index)
+    def _adopt_tab(self, tab: BrowserTab) -> None:
+        self.tabs.adopt_tab(tab)
+        # The search index is per window; read the page again here.
+        self.tab_search.schedule(tab.tab_id)
 
-    def _on_tab_panel_close_requested(self, index: int) -> None:
-        self.tabs._on_tab_close_requested(index)
-        self.tab_panel.sync_with_tab_manager(self.tabs)
+    def move_tab_to_new_window(self, tab_id: int) -> None:
+        # A window's only tab has nowhere to be split off from.
+        if self.tabs.count() < 2:
+            return
+        tab = self.tabs.detach_tab(tab_id)
+        if tab is None:
+            return
+        window = AcrylicBackgroundBrowser(tab)
+        window.resize(self.size())
+        window.move(QCursor.pos() - QPoint(window.width() // 2, 24))
+        window.show()
+
+    def _on_tab_dropped(self, tab_id: int) -> None:
+        if tab_id in self.registry:
+            return
+        source = next((w for w in _windows if tab_id in w.registry), None)
+        tab = source.tabs.detach_tab(tab_id) if source is not None else None
+        if tab is None:
+            return
+        self._adopt_tab(tab)
+        self.raise_()
+        self.activateWindow()
+        if source.tabs.count() == 0:
+            source.close()
+
+    def _on_download_added(self, _download) -> None:
+        # Every window hears about every download; the one the user is in shows the panel.
+        if self.isActiveWindow() or len(_windows) == 1:
+            self.open_downloads()
+
+    def _update_blocked_count(self) -> None:
+        self.titlebar.set_blocked_count(self.blocker.blocked_count(self.tabs.current_url().toString()))
+
+    def _show_blocker_menu(self) -> None:
+        url = self.tabs.current_url()
+        host = url.host().lower()
+        menu = QMenu(self)
+        count = self.blocker.blocked_count(url.toString())
+        info = menu.addAction(f"{count} requests blocked on this page")
+        info.setEnabled(False)
+        menu.addSeparator()
+        site_act = menu.addAction(f"Block ads on {host}" if host else "Block ads on this site")
+        site_act.setCheckable(True)
+        site_act.setChecked(bool(host) and not self.blocker.is_allowlisted(host))
+        site_act.setEnabled(bool(host) and self.blocker.enabled)
+        action = menu.exec(self.titlebar.shield.mapToGlobal(self.titlebar.shield.rect().bottomLeft()))
+        if action is site_act:
+            self.blocker.set_site_allowed(host, not site_act.isChecked())
+            self._content_blocker_allowlist = self.blocker.allowlist()
+            self.settings.setValue("content_blocker_allowlist", self._content_blocker_allowlist)
+            self._safe_call("reload")
+
+    def open_history(self) -> None:
+        from app.history_dialog import HistoryDialog
+        self._start_services()
+        dialog = HistoryDialog(self.history, self)
+        dialog.open_url_requested.connect(lambda url: self.add_new_tab(url.toString(), "New Tab"))
+        dialog.exec()
+        dialog.deleteLater()
+
+    def open_downloads(self) -> None:
+        if self.downloads_panel is None:
+            from app.downloads_panel import DownloadsPanel
+            self.downloads_panel = DownloadsPanel(self.profiles.downloads, self)
+        self.downloads_panel.show()
+        self.downloads_panel.raise_()
+
+    def open_tab_overview(self) -> None:
+        from app.tab_overview import TabOverview
+        self._start_services()
+        self._capture_thumbnail(self.tabs.current_tab_id())
+        dialog = TabOverview(self.tabs, self.thumbnails, self.favicons, self)
+        dialog.tab_selected.connect(self.tabs.select_tab)
+        dialog.exec()
+        dialog.deleteLater()
+
+    def open_tab_search(self) -> None:
+        from app.tab_search_dialog import TabSearchDialog
+        self._start_services()
+        dialog = TabSearchDialog(self.tab_search, self)
+        dialog.match_activated.connect(self._jump_to_match)
+        dialog.exec()
+        dialog.deleteLater()
+
+    def _jump_to_match(self, tab_id: int, query: str) -> None:
+        tab = self.tabs.tab(tab_id)
+        if tab is None:
+            return
+        # A discarded tab reloads when selected; highlight the match once the text is back.
+        loaded = tab.is_materialized() and tab.lifecycle_state() != LifecycleState.Discarded
+        self.tabs.select_tab(tab_id)
+        view = tab.materialize()
+        if loaded:
+            view.findText(query)
+            return
+
+        def _on_loaded(ok: bool) -> None:
+            view.loadFinished.disconnect(_on_loaded)
+            if ok:
+                view.findText(query)
+
+        view.loadFinished.connect(_on_loaded)
+
+    def save_page_offline(self) -> None:
+        tab = self.tabs.tab(self.tabs.current_tab_id())
+        if tab is not None:
+            self.profiles.archive.save_page(tab.page())
+
+    def open_offline_pages(self) -> None:
+        from app.archive_dialog import ArchiveDialog
+        dialog = ArchiveDialog(self.profiles.archive, self)
+        dialog.open_url_requested.connect(lambda url: self.add_new_tab(url.toString(), "Offline page"))
+        dialog.exec()
+        dialog.deleteLater()
+
+    def open_task_manager(self) -> None:
+        if self.task_manager is None:
+            from app.task_manager import TaskManagerDialog
+            self.task_manager = TaskManagerDialog(self.tabs, self._task_manager_interval_ms, self)
+            self.task_manager.interval_changed.connect(self._on_task_manager_interval_changed)
+        self.task_manager.show()
+        self.task_manager.raise_()
+
+    def _on_task_manager_interval_changed(self, interval_ms: int) -> None:
+        self._task_manager_interval_ms = interval_ms
+        self.settings.setValue("task_manager_interval_ms", interval_ms)
 
     def open_settings(self) -> None:
+        from app.settings import SettingsDialog
         dialog = SettingsDialog(self, self._acrylic_color)
         dialog.theme_combo.setCurrentText(self._theme)
         dialog.home_edit.setText(self._home_page)
         dialog.sys_transparency.setChecked(self._system_transparency)
+        dialog.tab_strip_combo.setCurrentText(self._tab_strip_mode)
+        dialog.restore_session.setChecked(self._restore_session)
+        dialog.content_blocker_enabled.setChecked(self._content_blocker_enabled)
+        dialog.speculation_enabled.setChecked(self._speculation_enabled)
+        dialog.set_speculation_stats(self.speculation.stats())
+        dialog.lifecycle_enabled.setChecked(self._lifecycle_policy.enabled)
+        dialog.freeze_spin.setValue(self._lifecycle_policy.freeze_after_min)
+        dialog.discard_spin.setValue(self._lifecycle_policy.discard_after_min)
+        dialog.memory_budget_spin.setValue(self._lifecycle_policy.memory_budget_mb)
+        dialog.cache_type_combo.setCurrentText(self._http_cache_type)
+        dialog.cache_size_spin.setValue(self._http_cache_max_mb)
+        dialog.storage_edit.setText(self._profile_storage_path or default_storage_path())
+        dialog.max_downloads_spin.setValue(self._max_concurrent_downloads)
+        dialog.download_limit_spin.setValue(self._download_limit_kbps)
+        dialog.clear_cache_btn.clicked.connect(self.profiles.clear_cache)
+        self.profiles.cache_stats_ready.connect(dialog.set_cache_stats)
+        self.profiles.request_cache_stats()
         dialog.settings_saved.connect(self.apply_settings)
         dialog.exec()
+        self.profiles.cache_stats_ready.disconnect(dialog.set_cache_stats)
+        dialog.deleteLater()
 
     def apply_settings(self, settings: dict) -> None:
-        self._acrylic_color = settings["acrylic_color"]
-        self._theme = settings["theme"]
-        self._home_page = settings["home_page"]
-        self._system_transparency = settings["system_transparency"]
+        # Settings are app-wide: every open window picks them up, not only the one that opened the dialog.
+        for window in _windows:
+            window._apply_window_settings(settings)
 
         self.settings.setValue("acrylic_color", self._acrylic_color)
         self.settings.setValue("theme", self._theme)
         self.settings.setValue("home_page", self._home_page)
         self.settings.setValue("system_transparency", self._system_transparency)
+        self.settings.setValue("tab_strip_mode", self._tab_strip_mode)
+        self.themes.set_theme(self._theme)
+
+        self.settings.setValue("tab_lifecycle_enabled", self._lifecycle_policy.enabled)
+        self.settings.setValue("freeze_after_min", self._lifecycle_policy.freeze_after_min)
+        self.settings.setValue("discard_after_min", self._lifecycle_policy.discard_after_min)
+        self.settings.setValue("memory_budget_mb", self._lifecycle_policy.memory_budget_mb)
+
+        self.settings.setValue("restore_session", self._restore_session)
+
+        self.settings.setValue("content_blocker_enabled", self._content_blocker_enabled)
+        self.blocker.set_enabled(self._content_blocker_enabled)
+
+        self.settings.setValue("speculation_enabled", self._speculation_enabled)
+        self.speculation.set_enabled(self._speculation_enabled)
+
+        self.settings.setValue("http_cache_type", self._http_cache_type)
+        self.settings.setValue("http_cache_max_mb", self._http_cache_max_mb)
+        self.settings.setValue("profile_storage_path", self._profile_storage_path)
+        self.profiles.apply_cache_settings(self._http_cache_type, self._http_cache_max_mb)
+
+        self.settings.setValue("max_concurrent_downloads", self._max_concurrent_downloads)
+        self.settings.setValue("download_limit_kbps", self._download_limit_kbps)
+        self.profiles.downloads.set_max_concurrent(self._max_concurrent_downloads)
+        self.profiles.downloads.set_global_limit(self._download_limit_kbps)
+
+    def _apply_window_settings(self, settings: dict) -> None:
+        self._acrylic_color = settings["acrylic_color"]
+        self._theme = settings["theme"]
+        self._home_page = settings["home_page"]
+        self._system_transparency = settings["system_transparency"]
+        self._tab_strip_mode = settings["tab_strip_mode"]
+
+        self._lifecycle_policy = LifecyclePolicy(
+            enabled=settings["tab_lifecycle_enabled"],
+            freeze_after_min=settings["freeze_after_min"],
+            discard_after_min=settings["discard_after_min"],
+            memory_budget_mb=settings["memory_budget_mb"],
+        )
+        self.tabs.lifecycle.set_policy(self._lifecycle_policy)
+
+        self._restore_session = settings["restore_session"]
+        self.session.set_enabled(self._restore_session)
+
+        self._content_blocker_enabled = settings["content_blocker_enabled"]
+        self._speculation_enabled = settings["speculation_enabled"]
+
+        self._http_cache_type = settings["http_cache_type"]
+        self._http_cache_max_mb = settings["http_cache_max_mb"]
+        storage = settings["profile_storage_path"]
+        self._profile_storage_path = "" if storage == default_storage_path() else storage
+
+        self._max_concurrent_downloads = settings["max_concurrent_downloads"]
+        self._download_limit_kbps = settings["download_limit_kbps"]
 
         self._apply_acrylic()
 
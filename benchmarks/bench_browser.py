@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Settings, history, session and profile data go to a scratch directory so runs never touch the user's browser.
+_SCRATCH = tempfile.mkdtemp(prefix="gbrowser-bench-")
+os.environ["XDG_CONFIG_HOME"] = os.path.join(_SCRATCH, "config")
+os.environ["XDG_DATA_HOME"] = os.path.join(_SCRATCH, "data")
+os.environ["XDG_CACHE_HOME"] = os.path.join(_SCRATCH, "cache")
+
+from PySide6.QtCore import Qt, QCoreApplication, QEvent, QEventLoop, QSettings, QStandardPaths, QTimer, qVersion
+from PySide6.QtWidgets import QApplication
+
+PARAGRAPH = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt ut labore "
+    "et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud exercitation ullamco laboris."
+)
+
+
+def write_fixture_site(root: Path, pages: int = 20) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    style = "body{font-family:sans-serif;margin:24px} td{padding:2px 6px;border-bottom:1px solid #ddd}"
+    for i in range(pages):
+        links = "".join(f'<li><a href="page{j}.html">Page {j}</a></li>' for j in range(pages) if j != i)
+        rows = "".join(f"<tr><td>{i}.{r}</td><td>{PARAGRAPH[:60]}</td></tr>" for r in range(200))
+        body = "".join(f"<p>{PARAGRAPH}</p>" for _ in range(40))
+        html = (f"<!doctype html><html><head><meta charset='utf-8'><title>Fixture page {i}</title>"
+                f"<style>{style}</style></head><body><h1>Fixture page {i}</h1><ul>{links}</ul>"
+                f"{body}<table>{rows}</table></body></html>")
+        (root / f"page{i}.html").write_text(html, encoding="utf-8")
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def serve_fixture(root: Path) -> tuple[ThreadingHTTPServer, str]:
+    handler = functools.partial(_QuietHandler, directory=str(root))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, name="bench-http", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def process_tree_rss_kb(pid: int) -> int:
+    # Sums VmRSS over the process and its descendants, which is where the renderer processes live.
+    if not os.path.isdir("/proc"):
+        return 0
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read().decode("utf-8", "replace")
+            ppid = int(stat[stat.rindex(")") + 2:].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, ()))
+        try:
+            with open(f"/proc/{current}/status", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+        except (OSError, ValueError):
+            continue
+    return total
+
+
+def flush() -> None:
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    QApplication.processEvents()
+
+
+def wait_for(signal, timeout_ms: int) -> bool:
+    loop = QEventLoop()
+    fired: list[bool] = []
+
+    def _done(*_args) -> None:
+        fired.append(True)
+        loop.quit()
+
+    signal.connect(_done)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec()
+    signal.disconnect(_done)
+    return bool(fired)
+
+
+def wait_until(predicate, timeout_ms: int) -> bool:
+    deadline = time.perf_counter() + timeout_ms / 1000
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+        QApplication.processEvents(QEventLoop.AllEvents, 10)
+    return True
+
+
+class BrowserBench:
+
+    LOAD_TIMEOUT_MS = 30000
+
+    def __init__(self, base_url: str, rounds: int) -> None:
+        self.base_url = base_url
+        self.rounds = rounds
+        self.metrics: dict[str, dict] = {}
+
+        settings = QSettings("GBrowser", "Main")
+        settings.setValue("home_page", self.page(0))
+        settings.setValue("restore_session", False)
+        settings.setValue("system_transparency", False)
+        settings.setValue("tab_lifecycle_enabled", False)
+        settings.sync()
+
+        from app.window import AcrylicBackgroundBrowser
+        self.window = AcrylicBackgroundBrowser()
+        self.window.show()
+        wait_until(lambda: self.window.tabs.count() > 0, 10000)
+        self.wait_loaded(self.window.tabs.current_view())
+
+    def page(self, i: int) -> str:
+        return f"{self.base_url}/page{i % 20}.html"
+
+    def record(self, name: str, samples: list[float], unit: str = "ms") -> None:
+        value = statistics.median(samples) if samples else 0.0
+        self.metrics[name] = {"value": round(value, 4), "unit": unit, "samples": len(samples)}
+        print(f"  {name:<34} {value:10.3f} {unit}")
+
+    def wait_loaded(self, view) -> bool:
+        return wait_for(view.loadFinished, self.LOAD_TIMEOUT_MS)
+
+    def fill_to(self, n: int) -> None:
+        # Background tabs are placeholders, the same as a restored session, so 500 tabs stay affordable.
+        tabs = self.window.tabs
+        while tabs.count() < n:
+            tabs.add_tab(self.page(tabs.count()), f"Tab {tabs.count()}", activate=False, lazy=True)
+        flush()
+
+    def bench_add_new_tab(self, n: int) -> None:
+        tabs = self.window.tabs
+        self.fill_to(n - 1)
+        add, load, close = [], [], []
+        for i in range(self.rounds):
+            start = time.perf_counter()
+            self.window.add_new_tab(self.page(i), "New Tab")
+            add.append((time.perf_counter() - start) * 1000)
+            view = tabs.current_view()
+            if self.wait_loaded(view):
+                load.append((time.perf_counter() - start) * 1000)
+            tab_id = tabs.current_tab_id()
+            start = time.perf_counter()
+            tabs.close_tab(tab_id)
+            flush()
+            close.append((time.perf_counter() - start) * 1000)
+        self.record(f"add_new_tab@{n}", add)
+        self.record(f"time_to_load_finished@{n}", load)
+        self.record(f"close_tab@{n}", close)
+
+    def bench_switch(self, n: int) -> None:
+        tabs = self.window.tabs
+        self.fill_to(n)
+        ids = [tabs.tab_id_at(i) for i in range(tabs.count())]
+        samples = []
+        for i in range(self.rounds):
+            tab_id = ids[(i * 7919) % len(ids)]
+            start = time.perf_counter()
+            tabs.select_tab(tab_id)
+            flush()
+            samples.append((time.perf_counter() - start) * 1000)
+        self.record(f"switch_tab@{n}", samples)
+
+    def bench_sync(self, n: int) -> None:
+        self.fill_to(n)
+        panel = self.window.tab_panel
+        samples = []
+        for _ in range(self.rounds):
+            start = time.perf_counter()
+            panel.sync_with_tab_manager(self.window.tabs)
+            flush()
+            samples.append((time.perf_counter() - start) * 1000)
+        panel.set_current_tab(self.window.tabs.current_tab_id())
+        self.record(f"tab_panel_sync@{n}", samples)
+
+    def bench_title_storm(self, n: int, updates: int = 500) -> None:
+        # An SPA title ticker in every tab: many titleChanged per frame, delivered as one flush.
+        tabs = self.window.tabs
+        self.fill_to(n)
+        targets = list(tabs.browser_tabs())
+        coalescer = tabs.updates
+        samples = []
+        dropped = coalescer.dropped
+        for r in range(self.rounds):
+            start = time.perf_counter()
+            for i in range(updates):
+                targets[i % len(targets)].title_changed.emit(f"({r}.{i}) ticker")
+            coalescer.flush()
+            flush()
+            samples.append((time.perf_counter() - start) * 1000)
+        self.record(f"title_storm_{updates}@{n}", samples)
+        print(f"  {'':<34} {coalescer.dropped - dropped:10d} updates coalesced")
+
+    def bench_rss(self, count: int) -> None:
+        self.reset()
+        pid = os.getpid()
+        flush()
+        before = process_tree_rss_kb(pid)
+        for i in range(count):
+            self.window.add_new_tab(self.page(i), "New Tab")
+            self.wait_loaded(self.window.tabs.current_view())
+        # Give the renderers a moment to settle after their last load.
+        wait_until(lambda: False, 1000)
+        after = process_tree_rss_kb(pid)
+        growth = (after - before) / 1024 / max(1, count)
+        self.metrics["rss_per_tab"] = {"value": round(growth, 3), "unit": "MB", "samples": count}
+        print(f"  {'rss_per_tab':<34} {growth:10.3f} MB")
+
+    def reset(self) -> None:
+        tabs = self.window.tabs
+        while tabs.count() > 1:
+            tabs.close_tab(tabs.tab_id_at(tabs.count() - 1))
+        flush()
+
+    def close(self) -> None:
+        self.window.close()
+        flush()
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta: float) -> list[str]:
+    regressions = []
+    for name, base in sorted(baseline.get("metrics", {}).items()):
+        cur = current["metrics"].get(name)
+        if cur is None:
+            continue
+        b, c = base["value"], cur["value"]
+        change = (c - b) / b if b else 0.0
+        flag = c > b * (1 + threshold) and c - b > min_delta
+        print(f"  {name:<34} {b:10.3f} -> {c:10.3f} {cur['unit']:<3} {change * 100:+7.1f}%"
+              f"{'   REGRESSION' if flag else ''}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Headless browser benchmarks against a local fixture site")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 50, 500])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--rss-tabs", type=int, default=10)
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative slowdown that counts as a regression")
+    parser.add_argument("--min-delta", type=float, default=1.0,
+                        help="ignore absolute changes below this, in the metric's unit")
+    args = parser.parse_args()
+
+    QStandardPaths.setTestModeEnabled(True)
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    app.setApplicationName("GBrowser-bench")
+    app.setOrganizationName("gbrowser")
+
+    site = Path(_SCRATCH) / "site"
+    write_fixture_site(site)
+    server, base_url = serve_fixture(site)
+
+    bench = BrowserBench(base_url, args.rounds)
+    try:
+        for n in sorted(args.sizes):
+            print(f"{n} tabs")
+            bench.bench_add_new_tab(n)
+            bench.bench_switch(n)
+            bench.bench_sync(n)
+            bench.bench_title_storm(n)
+        print("memory")
+        bench.bench_rss(args.rss_tabs)
+    finally:
+        bench.close()
+        server.shutdown()
+
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "qt": qVersion(),
+            "rounds": args.rounds,
+        },
+        "metrics": bench.metrics,
+    }
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"results written to {args.output}")
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        print(f"compared with {args.baseline}")
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from app.effects import RecordingBackend, WindowEffects, acrylic_accent
+
+
+def _wait(ms: int) -> None:
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def check_skip_unchanged() -> list[str]:
+    backend = RecordingBackend()
+    effects = WindowEffects(backend)
+    accent = acrylic_accent(0x661F2937)
+    for _ in range(10):
+        effects.apply(1, accent)
+    failures = []
+    if len(backend.calls) != 1 or effects.skipped != 9:
+        failures.append(f"unchanged accent reached the backend {len(backend.calls)} times, skipped {effects.skipped}")
+    effects.forget(1)
+    effects.apply(1, accent)
+    if len(backend.calls) != 2:
+        failures.append("a forgotten window was not re-applied")
+    # A failed call is not cached, so the next attempt goes through again.
+    backend.result = False
+    effects.apply(2, accent)
+    effects.apply(2, accent)
+    if len(backend.calls) != 4:
+        failures.append("a failed accent was cached")
+    return failures
+
+
+def check_coalescing() -> list[str]:
+    backend = RecordingBackend()
+    effects = WindowEffects(backend)
+    for alpha in range(0x10, 0x100, 0x10):
+        effects.schedule(1, acrylic_accent(alpha << 24 | 0x1F2937))
+        effects.schedule(2, acrylic_accent(alpha << 24 | 0x000000))
+    failures = []
+    if backend.calls:
+        failures.append("scheduled accents reached the backend before the frame ended")
+    _wait(WindowEffects.FRAME_MS * 4)
+    expected = [(1, acrylic_accent(0xF01F2937)), (2, acrylic_accent(0xF0000000))]
+    if sorted(backend.calls) != expected:
+        failures.append(f"one frame of slider updates made {len(backend.calls)} backend calls, "
+                        "expected one per window with its last accent")
+    if effects.coalesced != 2 * 14:
+        failures.append(f"coalesced {effects.coalesced} updates, expected {2 * 14}")
+    return failures
+
+
+def bench_apply(rounds: int) -> tuple[float, float]:
+    backend = RecordingBackend()
+    effects = WindowEffects(backend)
+    accent = acrylic_accent()
+    start = time.perf_counter()
+    for i in range(rounds):
+        effects.apply(1, accent)
+    unchanged = (time.perf_counter() - start) / rounds * 1e6
+    start = time.perf_counter()
+    for i in range(rounds):
+        effects.schedule(1, acrylic_accent(i))
+    schedule = (time.perf_counter() - start) / rounds * 1e6
+    effects.flush()
+    return unchanged, schedule
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Window effect caching and coalescing checks")
+    parser.add_argument("--rounds", type=int, default=100_000)
+    args = parser.parse_args()
+
+    _ = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    failures = check_skip_unchanged() + check_coalescing()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    unchanged, schedule = bench_apply(args.rounds)
+    print(f"unchanged apply {unchanged:6.2f} us/op   schedule {schedule:6.2f} us/op")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import argparse
+import pickle
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.filters import FilterIndex, TYPE_IMAGE, TYPE_SCRIPT, TYPE_XMLHTTPREQUEST, is_third_party
+
+WORDS = (
+    "ad ads advert banner track pixel analytics metrics beacon counter stats promo sponsor affiliate "
+    "media cdn static img assets js css api widget embed player video news sport shop cart login"
+).split()
+TLDS = ("com", "net", "org", "io", "de", "co")
+
+
+def _name(rnd: random.Random) -> str:
+    return f"{rnd.choice(WORDS)}{rnd.choice(WORDS)}{rnd.randint(0, 99999)}"
+
+
+def synthetic_rules(n: int, seed: int = 1) -> list[str]:
+    # Roughly the mix of EasyList + EasyPrivacy: mostly host rules, then path patterns, some exceptions.
+    rnd = random.Random(seed)
+    rules = []
+    for i in range(n):
+        r = rnd.random()
+        if r < 0.55:
+            opts = rnd.choice(("", "", "$third-party", "$script,third-party", "$image"))
+            rules.append(f"||{_name(rnd)}.{rnd.choice(TLDS)}^{opts}")
+        elif r < 0.85:
+            rules.append(f"/{rnd.choice(WORDS)}/{_name(rnd)}.{rnd.choice(('js', 'gif', 'png'))}")
+        elif r < 0.92:
+            rules.append(f"-{_name(rnd)}-{rnd.choice(WORDS)}.")
+        elif r < 0.97:
+            rules.append(f"||{_name(rnd)}.{rnd.choice(TLDS)}/{rnd.choice(WORDS)}/*.js$domain={_name(rnd)}.com")
+        else:
+            rules.append(f"@@||{_name(rnd)}.{rnd.choice(TLDS)}/{rnd.choice(WORDS)}^")
+    return rules
+
+
+def synthetic_requests(n: int, rules: list[str], seed: int = 2) -> list[tuple[str, str, str, int, bool]]:
+    rnd = random.Random(seed)
+    blocked_hosts = [r[2:].split("^")[0] for r in rules if r.startswith("||") and "/" not in r]
+    out = []
+    for _ in range(n):
+        site = f"{_name(rnd)}.com"
+        if rnd.random() < 0.15 and blocked_hosts:
+            host = rnd.choice(blocked_hosts)
+        else:
+            host = f"{rnd.choice(('www', 'cdn', 'static', 'api'))}.{_name(rnd)}.{rnd.choice(TLDS)}"
+        path = "/".join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 4)))
+        url = f"https://{host}/{path}/{_name(rnd)}.{rnd.choice(('js', 'png', 'css', 'json'))}?v={rnd.randint(0, 999)}"
+        kind = rnd.choice((TYPE_SCRIPT, TYPE_IMAGE, TYPE_XMLHTTPREQUEST))
+        out.append((url, host, site, kind, is_third_party(host, site)))
+    return out
+
+
+def check_document_exceptions() -> list[str]:
+    # A $document exception must only lift blocking on the pages it names.
+    index = FilterIndex.compile(["@@||good.org^$document", "@@||evil.com/landing^$document", "||ads.example.com^"])
+    cases = (
+        ("https://good.org/page", "good.org", True),
+        ("https://www.good.org/page", "www.good.org", True),
+        ("https://evil.com/page", "evil.com", False),
+        ("https://notgood.org/page", "notgood.org", False),
+        ("https://evil.com/landing/x", "evil.com", True),
+        ("https://evil.com/other", "evil.com", False),
+    )
+    failures = []
+    for page, site, expected in cases:
+        if index.page_allowed(page, site) != expected:
+            failures.append(f"page_allowed({page!r}, {site!r}) != {expected}")
+    return failures
+
+
+def check_third_party() -> list[str]:
+    # Sites under a multi-label public suffix are separate parties; subdomains of one site are not.
+    cases = (
+        ("cdn.example.com", "www.example.com", False),
+        ("ads.tracker.net", "www.example.com", True),
+        ("a.co.uk", "b.co.uk", True),
+        ("static.a.co.uk", "www.a.co.uk", False),
+        ("foo.github.io", "bar.github.io", True),
+        ("assets.foo.github.io", "foo.github.io", False),
+        ("10.0.0.2", "10.0.0.1", True),
+    )
+    return [f"is_third_party({host!r}, {site!r}) != {expected}"
+            for host, site, expected in cases if is_third_party(host, site) != expected]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Content blocker filter index benchmark")
+    parser.add_argument("--rules", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--budget-us", type=float, default=50.0, help="fail when the p99 decision exceeds this")
+    args = parser.parse_args()
+
+    failures = check_document_exceptions() + check_third_party()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        return 1
+
+    rules = synthetic_rules(args.rules)
+    start = time.perf_counter()
+    index = FilterIndex.compile(rules)
+    compile_s = time.perf_counter() - start
+
+    blob = pickle.dumps(index.state(), protocol=pickle.HIGHEST_PROTOCOL)
+    start = time.perf_counter()
+    FilterIndex.from_state(pickle.loads(blob))
+    load_s = time.perf_counter() - start
+
+    requests = synthetic_requests(args.requests, rules)
+    samples = []
+    blocked = 0
+    for url, host, site, kind, third_party in requests:
+        t0 = time.perf_counter()
+        blocked += index.should_block(url, host, site, kind, third_party)
+        samples.append((time.perf_counter() - t0) * 1e6)
+    samples.sort()
+    p50 = samples[len(samples) // 2]
+    p99 = samples[int(len(samples) * 0.99)]
+
+    print(f"{index.rule_count} rules  compile {compile_s:.2f} s  cached load {load_s * 1000:.0f} ms "
+          f"({len(blob) / 1e6:.1f} MB)")
+    print(f"{len(requests)} requests  blocked {blocked}  p50 {p50:.1f} us  p99 {p99:.1f} us")
+    return 1 if p99 > args.budget_us else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.omnibox import SuggestionIndex
+
+WORDS = (
+    "news python qt browser github docs release notes linux kernel mail search video music "
+    "weather maps store cloud forum wiki blog shop travel recipe sport finance market code "
+    "review design guide tutorial reference api issue project stream chat photo game learn"
+).split()
+HOSTS = ("github.com", "google.com", "wikipedia.org", "youtube.com", "reddit.com", "python.org",
+         "qt.io", "stackoverflow.com", "news.ycombinator.com", "mozilla.org")
+
+
+def synthetic_rows(n: int, seed: int = 1) -> list[tuple[str, str, int, int, float]]:
+    rnd = random.Random(seed)
+    now = time.time()
+    rows = []
+    for i in range(n):
+        if rnd.random() < 0.3:
+            host = rnd.choice(HOSTS)
+        else:
+            host = f"{rnd.choice(WORDS)}{rnd.choice(WORDS)}{i % 5000}.{rnd.choice(('com', 'org', 'net', 'io'))}"
+        path = "/".join(rnd.choice(WORDS) for _ in range(rnd.randint(0, 3)))
+        url = f"https://{host}/{path}?id={i}"
+        title = " ".join(rnd.choice(WORDS).capitalize() for _ in range(rnd.randint(2, 6)))
+        visits = int(rnd.paretovariate(1.2))
+        typed = visits if rnd.random() < 0.05 else 0
+        rows.append((url, title, visits, typed, now - rnd.random() * 180 * 86400))
+    return rows
+
+
+def keystrokes(rnd: random.Random, count: int) -> list[str]:
+    # Every prefix of a typed phrase is one keystroke.
+    out: list[str] = []
+    while len(out) < count:
+        phrase = rnd.choice((
+            rnd.choice(HOSTS),
+            rnd.choice(WORDS),
+            f"{rnd.choice(WORDS)} {rnd.choice(WORDS)}",
+            f"{rnd.choice(HOSTS)}/{rnd.choice(WORDS)}",
+            f"https://www.{rnd.choice(HOSTS)}",
+            "".join(rnd.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(6)),
+        ))
+        out.extend(phrase[:i] for i in range(1, len(phrase) + 1))
+    return out[:count]
+
+
+def percentile(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Omnibox per-keystroke latency budget")
+    parser.add_argument("--entries", type=int, default=500_000)
+    parser.add_argument("--keystrokes", type=int, default=5000)
+    parser.add_argument("--budget-ms", type=float, default=5.0, help="maximum allowed p99 per keystroke")
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.entries)
+    index = SuggestionIndex()
+    start = time.perf_counter()
+    index.build(rows)
+    build = time.perf_counter() - start
+    del rows
+
+    rnd = random.Random(2)
+    now = time.time()
+    for i in range(200):
+        index.add_visit(f"https://{rnd.choice(HOSTS)}/{rnd.choice(WORDS)}/{i}", rnd.choice(WORDS), i % 3 == 0, now)
+    index.set_tabs([(i + 1, f"https://{rnd.choice(HOSTS)}/{rnd.choice(WORDS)}", rnd.choice(WORDS)) for i in range(300)])
+
+    samples = []
+    for text in keystrokes(rnd, args.keystrokes):
+        t0 = time.perf_counter()
+        index.query(text)
+        samples.append((time.perf_counter() - t0) * 1000)
+
+    p50, p99, worst = percentile(samples, 50), percentile(samples, 99), max(samples)
+    print(f"{args.entries} entries  build {build:6.2f} s   "
+          f"p50 {p50:6.3f} ms   p99 {p99:6.3f} ms   max {worst:6.3f} ms   budget {args.budget_ms:.1f} ms")
+    return 0 if p99 <= args.budget_ms else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
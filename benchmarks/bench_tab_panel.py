@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PySide6.QtCore import QCoreApplication, QEvent, Signal
+from PySide6.QtWidgets import QApplication, QTabWidget, QWidget
+
+from app.tab_panel import TabPanel
+from app.tab_registry import TabRegistry
+from app.tab_strip import TabStrip
+
+
+class _Tabs(QTabWidget):
+    # Mirrors TabManager's registry bookkeeping without creating web views.
+
+    tab_inserted = Signal(int)
+    tab_removed = Signal(int)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.registry = TabRegistry()
+
+    def add(self, title: str) -> int:
+        w = QWidget()
+        w.tab_id = self.registry.register(w)
+        self.addTab(w, title)
+        return w.tab_id
+
+    def tabInserted(self, index: int) -> None:
+        super().tabInserted(index)
+        tab_id = self.tab_id_at(index)
+        self.registry.insert(tab_id, index)
+        self.tab_inserted.emit(tab_id)
+
+    def tabRemoved(self, index: int) -> None:
+        super().tabRemoved(index)
+        tab_id = self.registry.id_at(index)
+        self.registry.remove(tab_id)
+        self.tab_removed.emit(tab_id)
+        self.registry.unregister(tab_id)
+
+    def tab_id_at(self, index: int) -> int:
+        return getattr(self.widget(index), "tab_id", 0)
+
+    def current_tab_id(self) -> int:
+        return self.tab_id_at(self.currentIndex())
+
+
+def _flush() -> None:
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    QApplication.processEvents()
+
+
+def _populate(tabs: _Tabs, panel, n: int) -> None:
+    for i in range(n):
+        tabs.add(f"Tab {i}")
+    panel.sync_with_tab_manager(tabs)
+    _flush()
+
+
+def _open_close(tabs: _Tabs, panel, rounds: int, incremental: bool) -> float:
+    if incremental:
+        tabs.tab_inserted.connect(lambda tab_id: panel.insert_tab(tab_id, "New Tab"))
+        tabs.tab_removed.connect(panel.remove_tab)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        tab_id = tabs.add("New Tab")
+        if incremental:
+            panel.set_current_tab(tab_id)
+        else:
+            panel.sync_with_tab_manager(tabs)
+        _flush()
+        tabs.removeTab(tabs.registry.position(tab_id))
+        if incremental:
+            panel.set_current_tab(tabs.current_tab_id())
+        else:
+            panel.sync_with_tab_manager(tabs)
+        _flush()
+    return (time.perf_counter() - start) / (rounds * 2) * 1000
+
+
+def bench_full_rebuild(n: int, rounds: int) -> float:
+    tabs = _Tabs()
+    panel = TabPanel(tabs.registry)
+    _populate(tabs, panel, n)
+    return _open_close(tabs, panel, rounds, incremental=False)
+
+
+def bench_incremental(n: int, rounds: int) -> float:
+    tabs = _Tabs()
+    panel = TabPanel(tabs.registry)
+    _populate(tabs, panel, n)
+    return _open_close(tabs, panel, rounds, incremental=True)
+
+
+def bench_virtualized(n: int, rounds: int) -> tuple[float, float]:
+    tabs = _Tabs()
+    strip = TabStrip(tabs.registry)
+    strip.resize(1000, 40)
+    strip.show()
+    _populate(tabs, strip, n)
+    op = _open_close(tabs, strip, rounds, incremental=True)
+
+    viewport = strip.view.viewport()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        viewport.repaint()
+    paint = (time.perf_counter() - start) / rounds * 1000
+    return op, paint
+
+
+def main() -> int:
+    _ = QApplication.instance() or QApplication(sys.argv)
+    rounds = 20
+    for n in (1, 50, 300):
+        full = bench_full_rebuild(n, rounds)
+        incr = bench_incremental(n, rounds)
+        virt, paint = bench_virtualized(n, rounds)
+        print(f"{n:>4} tabs  full rebuild {full:8.3f} ms/op   incremental {incr:8.3f} ms/op   "
+              f"virtualized {virt:8.3f} ms/op, {paint:6.3f} ms/paint")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
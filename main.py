@@ -4,6 +4,10 @@ import sys
 import logging
 from pathlib import Path
 
+from app.startup import PROFILE_FLAG, get_startup_profiler
+
+profiler = get_startup_profiler()
+
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QFont
@@ -11,45 +15,56 @@ from PySide6.QtGui import QFont
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
 
-try:
-    from app.window import AcrylicBackgroundBrowser
-except Exception as e:
-    logger.exception("Failed to import AcrylicBackgroundBrowser from app.window: %s", e)
-    raise
+profiler.mark("import Qt")
 
 
 def load_styles(qss_path: Path) -> None:
-    if not qss_path.exists():
-        logger.info("Stylesheet file not found: %s", qss_path)
-        return
-
+    # The theme engine compiles the template per theme and reloads it when the file changes.
     try:
-        qss = qss_path.read_text(encoding="utf-8")
-        QApplication.instance().setStyleSheet(qss)
-        logger.info("Stylesheet Loaded: %s", qss_path)
+        from app.theme import get_theme_manager
+        get_theme_manager(qss_path).apply()
     except Exception:
         logger.exception("Error loading QSS: %s", qss_path)
 
 
 def main() -> int:
+    profiler.enabled = PROFILE_FLAG in sys.argv
+    argv = [arg for arg in sys.argv if arg != PROFILE_FLAG]
+
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
+    # The browser modules are imported after the application exists, which WebEngine only allows with shared contexts.
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
 
-    app = QApplication(sys.argv)
+    # WebEngine only accepts custom URL schemes registered before the application is created.
+    from app.archive import register_archive_scheme
+    register_archive_scheme()
+
+    app = QApplication(argv)
     app.setApplicationName("GBrowser")
     app.setOrganizationName("gbrowser")
 
     app.setFont(QFont("Segoe UI", 10))
+    profiler.mark("QApplication")
 
     project_root = Path(__file__).resolve().parent
     styles_path = project_root / "ui" / "styles.qss"
     load_styles(styles_path)
+    profiler.mark("stylesheet")
+
+    try:
+        from app.window import AcrylicBackgroundBrowser
+    except Exception as e:
+        logger.exception("Failed to import AcrylicBackgroundBrowser from app.window: %s", e)
+        raise
+    profiler.mark("import app.window")
 
     try:
         w = AcrylicBackgroundBrowser()
     except Exception:
         logger.exception("Error creating the main window")
         raise
+    profiler.mark("window construction")
 
     w.show()
 